@@ -0,0 +1,125 @@
+"""User activity events, written in batches off the request path.
+
+``log_event`` only timestamps the event and puts it on an in-process queue.
+A background thread appends queued events to the user_activity table in one
+write per batch (every ``BATCH_SIZE`` events or ``FLUSH_INTERVAL`` seconds),
+and a final flush runs at interpreter exit.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import storage
+
+LOGIN = "login"
+SIGNUP = "signup"
+RESUME_ANALYZED = "resume_analyzed"
+ANSWER_SUBMITTED = "answer_submitted"
+PROFILE_SAVED = "profile_saved"
+
+BATCH_SIZE = int(os.environ.get("PREPVAULT_ACTIVITY_BATCH", "100"))
+FLUSH_INTERVAL = float(os.environ.get("PREPVAULT_ACTIVITY_INTERVAL", "2.0"))
+# Events kept for retry while the store is failing; the oldest are dropped past this.
+MAX_PENDING = BATCH_SIZE * 50
+
+logger = logging.getLogger(__name__)
+
+_queue = queue.SimpleQueue()
+_thread = None
+_lock = threading.Lock()
+_STOP = object()
+_stats = {"logged": 0, "written": 0, "batches": 0, "dropped": 0}
+
+
+def log_event(username, action):
+    """Record that ``username`` did ``action``; never blocks on I/O."""
+    if not username:
+        return
+    _queue.put({"username": username, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "action": action})
+    _stats["logged"] += 1
+    if _thread is None:
+        _start()
+
+
+def flush(timeout=10):
+    """Write everything queued so far; returns False if the writer didn't finish in time."""
+    if _thread is None:
+        return True
+    done = threading.Event()
+    _queue.put(done)
+    return done.wait(timeout)
+
+
+def shutdown(timeout=10):
+    """Stop the writer after a final flush."""
+    global _thread
+    with _lock:
+        thread, _thread = _thread, None
+    if thread is not None:
+        _queue.put(_STOP)
+        thread.join(timeout)
+
+
+def get_stats():
+    return dict(_stats, queued=_queue.qsize())
+
+
+# --- Writer thread ---
+def _start():
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, name="activity-writer", daemon=True)
+            _thread.start()
+
+
+def _write(pending):
+    try:
+        storage.append_many("user_activity", pending)
+    except Exception:
+        logger.exception("Failed to write %d activity event(s); will retry", len(pending))
+        if len(pending) > MAX_PENDING:
+            _stats["dropped"] += len(pending) - MAX_PENDING
+            del pending[:len(pending) - MAX_PENDING]
+        return pending
+    _stats["written"] += len(pending)
+    _stats["batches"] += 1
+    return []
+
+
+def _run():
+    pending = []
+    deadline = None
+    while True:
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            item = _queue.get(timeout=timeout)
+        except queue.Empty:
+            item = None
+
+        if item is _STOP:
+            _write(pending)
+            return
+        if isinstance(item, threading.Event):
+            pending = _write(pending)
+            item.set()
+        elif item is not None:
+            pending.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + FLUSH_INTERVAL
+
+        if pending and (len(pending) >= BATCH_SIZE or time.monotonic() >= deadline):
+            pending = _write(pending)
+        if not pending:
+            deadline = None
+        elif time.monotonic() >= deadline:
+            # Retry a failed batch after another interval rather than spinning.
+            deadline = time.monotonic() + FLUSH_INTERVAL
+
+
+atexit.register(shutdown)
@@ -0,0 +1,465 @@
+"""Per-user summary numbers, maintained when results are recorded.
+
+Dashboard widgets read attempt counts, mean ratings and latest/best resume
+scores with one keyed lookup instead of recomputing them from the raw logs.
+Per-question and per-tag interview history feeds question sampling, and
+daily/weekly/monthly rollups per role feed the progress charts.
+
+    python aggregates.py rebuild            # recompute from the raw logs
+    python aggregates.py rebuild --check    # report drift, change nothing
+
+Writers hold ``recording()`` while appending a result to its raw log and
+recording it here:
+
+    with aggregates.recording():
+        storage.append("interview_scores", row)
+        aggregates.record_interview(username, role, rating, timestamp)
+"""
+import argparse
+import math
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import storage
+from question_bank import get_bank as get_question_bank
+from history_archive import read_history
+
+_local = threading.local()
+_ready = False
+# Held while seeding the store from the logs and around each append + record,
+# so a seed never reads a row whose record is still to come.
+_write_lock = threading.RLock()
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS user_aggregates (
+        username TEXT PRIMARY KEY,
+        interview_attempts INTEGER NOT NULL DEFAULT 0,
+        rating_sum REAL NOT NULL DEFAULT 0,
+        resume_count INTEGER NOT NULL DEFAULT 0,
+        latest_resume_score REAL,
+        latest_resume_role TEXT,
+        best_resume_score REAL,
+        best_resume_role TEXT,
+        last_activity TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS role_aggregates (
+        username TEXT NOT NULL,
+        role TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        rating_sum REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (username, role)
+    )""",
+    """CREATE TABLE IF NOT EXISTS question_history (
+        username TEXT NOT NULL,
+        question_id TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        rating_sum REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (username, question_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS tag_aggregates (
+        username TEXT NOT NULL,
+        tag TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        rating_sum REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (username, tag)
+    )""",
+    # metric is "resume" or "interview"; bucket is the day, the week's Monday or the month.
+    """CREATE TABLE IF NOT EXISTS score_rollups (
+        username TEXT NOT NULL,
+        metric TEXT NOT NULL,
+        role TEXT NOT NULL,
+        grain TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        total REAL NOT NULL DEFAULT 0,
+        min_value REAL,
+        max_value REAL,
+        PRIMARY KEY (username, metric, grain, bucket, role)
+    )""",
+    "CREATE TABLE IF NOT EXISTS aggregates_meta (key TEXT PRIMARY KEY, value TEXT)",
+]
+# Bumped when tables are added, so existing stores are rebuilt from the logs.
+SCHEMA_VERSION = "3"
+
+GRAINS = ("day", "week", "month")
+ROLLUP_COLUMNS = ["role", "bucket", "count", "total", "min_value", "max_value"]
+
+USER_COLUMNS = ["interview_attempts", "rating_sum", "resume_count", "latest_resume_score",
+                "latest_resume_role", "best_resume_score", "best_resume_role", "last_activity"]
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def bucket_of(timestamp, grain):
+    """Rollup bucket of a "YYYY-MM-DD[ HH:MM:SS]" timestamp, or None if it isn't one."""
+    try:
+        day = datetime.strptime(str(timestamp)[:10], "%Y-%m-%d")
+    except ValueError:
+        return None
+    if grain == "month":
+        return day.strftime("%Y-%m")
+    if grain == "week":
+        day -= timedelta(days=day.weekday())
+    return day.strftime("%Y-%m-%d")
+
+
+def _connect(return_seeded=False):
+    global _ready
+    seeded = False
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(storage.DB_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+    if not _ready:
+        with _write_lock:
+            if not _ready:
+                with conn:
+                    for statement in SCHEMA:
+                        conn.execute(statement)
+                built = conn.execute("SELECT value FROM aggregates_meta WHERE key = 'schema'").fetchone()
+                if built is None or built[0] != SCHEMA_VERSION:
+                    # First run against existing logs (or new tables): seed the store from them.
+                    rebuild(conn)
+                    seeded = True
+                # Set only once seeded, so other threads wait for the seed instead of writing into it.
+                _ready = True
+    return (conn, seeded) if return_seeded else conn
+
+
+@contextmanager
+def recording():
+    """Hold while appending a result to its raw log and recording it here."""
+    with _write_lock:
+        # Seed before the caller appends, so the seed can't count their row.
+        _connect()
+        yield
+
+
+def _connect_for_write():
+    # A row appended outside ``recording()`` is already in the logs when
+    # this call is what seeded the store, so it mustn't be counted again.
+    conn, seeded = _connect(return_seeded=True)
+    return None if seeded else conn
+
+
+# --- Write-time updates ---
+def _record_rollups(conn, username, metric, role, value, timestamp):
+    rows = [(username, metric, role or "", grain, bucket_of(timestamp, grain), float(value))
+            for grain in GRAINS]
+    conn.executemany(
+        """INSERT INTO score_rollups (username, metric, role, grain, bucket, count, total, min_value, max_value)
+           VALUES (?, ?, ?, ?, ?, 1, ?6, ?6, ?6)
+           ON CONFLICT(username, metric, grain, bucket, role) DO UPDATE SET
+               count = count + 1, total = total + excluded.total,
+               min_value = min(min_value, excluded.min_value), max_value = max(max_value, excluded.max_value)""",
+        [row for row in rows if row[4] is not None])
+
+
+def record_interview(username, role, rating, timestamp=None, question=None):
+    timestamp = timestamp or _now()
+    record = get_question_bank().find(question) if question else None
+    with _write_lock:
+        conn = _connect_for_write()
+        if conn is not None:
+            _record_interview(conn, username, role, rating, timestamp, record)
+
+
+def _record_interview(conn, username, role, rating, timestamp, record):
+    with conn:
+        conn.execute(
+            """INSERT INTO user_aggregates (username, interview_attempts, rating_sum, last_activity)
+               VALUES (?, 1, ?, ?)
+               ON CONFLICT(username) DO UPDATE SET
+                   interview_attempts = interview_attempts + 1,
+                   rating_sum = rating_sum + excluded.rating_sum,
+                   last_activity = max(coalesce(last_activity, ''), excluded.last_activity)""",
+            (username, float(rating), timestamp))
+        conn.execute(
+            """INSERT INTO role_aggregates (username, role, attempts, rating_sum) VALUES (?, ?, 1, ?)
+               ON CONFLICT(username, role) DO UPDATE SET
+                   attempts = attempts + 1, rating_sum = rating_sum + excluded.rating_sum""",
+            (username, role or "", float(rating)))
+        _record_rollups(conn, username, "interview", role, rating, timestamp)
+        if record is not None:
+            conn.execute(
+                """INSERT INTO question_history (username, question_id, attempts, rating_sum) VALUES (?, ?, 1, ?)
+                   ON CONFLICT(username, question_id) DO UPDATE SET
+                       attempts = attempts + 1, rating_sum = rating_sum + excluded.rating_sum""",
+                (username, record["id"], float(rating)))
+            conn.executemany(
+                """INSERT INTO tag_aggregates (username, tag, attempts, rating_sum) VALUES (?, ?, 1, ?)
+                   ON CONFLICT(username, tag) DO UPDATE SET
+                       attempts = attempts + 1, rating_sum = rating_sum + excluded.rating_sum""",
+                [(username, tag, float(rating)) for tag in record["tags"]])
+
+
+def record_resume(username, role, score, timestamp=None):
+    timestamp = timestamp or _now()
+    with _write_lock:
+        conn = _connect_for_write()
+        if conn is not None:
+            _record_resume(conn, username, role, score, timestamp)
+
+
+def _record_resume(conn, username, role, score, timestamp):
+    with conn:
+        conn.execute(
+            """INSERT INTO user_aggregates (username, resume_count, latest_resume_score, latest_resume_role,
+                                           best_resume_score, best_resume_role, last_activity)
+               VALUES (?, 1, ?, ?, ?, ?, ?)
+               ON CONFLICT(username) DO UPDATE SET
+                   resume_count = resume_count + 1,
+                   latest_resume_score = excluded.latest_resume_score,
+                   latest_resume_role = excluded.latest_resume_role,
+                   best_resume_role = CASE WHEN best_resume_score IS NULL
+                       OR excluded.best_resume_score > best_resume_score
+                       THEN excluded.best_resume_role ELSE best_resume_role END,
+                   best_resume_score = max(coalesce(best_resume_score, excluded.best_resume_score),
+                                           excluded.best_resume_score),
+                   last_activity = max(coalesce(last_activity, ''), excluded.last_activity)""",
+            (username, float(score), role, float(score), role, timestamp))
+        _record_rollups(conn, username, "resume", role, score, timestamp)
+
+
+# --- Reads ---
+def get_user_aggregates(username):
+    """Summary for one user, or None if nothing has been recorded for them."""
+    conn = _connect()
+    row = conn.execute(f"SELECT {', '.join(USER_COLUMNS)} FROM user_aggregates WHERE username = ?",
+                       (username,)).fetchone()
+    if row is None:
+        return None
+    summary = dict(zip(USER_COLUMNS, row))
+    attempts = summary["interview_attempts"]
+    summary["mean_rating"] = summary["rating_sum"] / attempts if attempts else None
+    summary["roles"] = {
+        role: {"attempts": n, "rating_sum": total, "mean_rating": total / n if n else None}
+        for role, n, total in conn.execute(
+            "SELECT role, attempts, rating_sum FROM role_aggregates WHERE username = ?", (username,))
+    }
+    return summary
+
+
+def answered_questions(username, question_ids):
+    """The subset of ``question_ids`` that ``username`` has answered before."""
+    question_ids = list(question_ids)
+    if not question_ids:
+        return set()
+    marks = ", ".join("?" for _ in question_ids)
+    rows = _connect().execute(
+        f"SELECT question_id FROM question_history WHERE username = ? AND question_id IN ({marks})",
+        [username] + question_ids)
+    return {row[0] for row in rows}
+
+
+def weak_tags(username, max_rating=5.0):
+    """Tag -> weight for ``username``'s interview tags; lower mean ratings weigh more."""
+    return {
+        tag: (max_rating - total / n) / max_rating
+        for tag, n, total in _connect().execute(
+            "SELECT tag, attempts, rating_sum FROM tag_aggregates WHERE username = ? AND attempts > 0", (username,))
+    }
+
+
+def get_rollups(username, metric, grain, start=None, end=None):
+    """Rollup rows (dicts with ROLLUP_COLUMNS) for one user and metric, by bucket.
+
+    ``start``/``end`` are inclusive buckets of the same grain.
+    """
+    where = "username = ? AND metric = ? AND grain = ?"
+    params = [username, metric, grain]
+    if start:
+        where += " AND bucket >= ?"
+        params.append(start)
+    if end:
+        where += " AND bucket <= ?"
+        params.append(end)
+    rows = _connect().execute(
+        f"SELECT {', '.join(ROLLUP_COLUMNS)} FROM score_rollups WHERE {where} ORDER BY bucket, role", params)
+    return [dict(zip(ROLLUP_COLUMNS, row)) for row in rows]
+
+
+def first_bucket(username, metric):
+    """Earliest month with a rollup for ``username`` and ``metric``, or None."""
+    row = _connect().execute(
+        "SELECT min(bucket) FROM score_rollups WHERE username = ? AND metric = ? AND grain = 'month'",
+        (username, metric)).fetchone()
+    return row[0]
+
+
+# --- Rebuild ---
+def _is_missing(value):
+    return value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value)) or value == ""
+
+
+def compute_from_logs():
+    """Aggregates recomputed from the raw interview and resume logs."""
+    users = {}
+    roles = {}
+    questions = {}
+    tags = {}
+    rollups = {}
+    bank = get_question_bank()
+
+    def roll(name, metric, role, value, timestamp):
+        for grain in GRAINS:
+            bucket = None if _is_missing(timestamp) else bucket_of(timestamp, grain)
+            if bucket is None:
+                continue
+            entry = rollups.setdefault((name, metric, grain, bucket, role or ""),
+                                       {"count": 0, "total": 0.0, "min_value": value, "max_value": value})
+            entry["count"] += 1
+            entry["total"] += value
+            entry["min_value"] = min(entry["min_value"], value)
+            entry["max_value"] = max(entry["max_value"], value)
+
+    def user(name):
+        return users.setdefault(name, {
+            "interview_attempts": 0, "rating_sum": 0.0, "resume_count": 0,
+            "latest_resume_score": None, "latest_resume_role": None,
+            "best_resume_score": None, "best_resume_role": None, "last_activity": None,
+        })
+
+    def touch(agg, timestamp):
+        if not _is_missing(timestamp) and (agg["last_activity"] is None or str(timestamp) > agg["last_activity"]):
+            agg["last_activity"] = str(timestamp)
+
+    interviews = read_history("interview_scores", columns=["Username", "Role", "Question", "Rating", "Timestamp"])
+    for name, role, question, rating, timestamp in zip(interviews["Username"], interviews["Role"],
+                                                       interviews["Question"], interviews["Rating"],
+                                                       interviews["Timestamp"]):
+        if _is_missing(name) or _is_missing(rating):
+            continue
+        role = "" if _is_missing(role) else role
+        agg = user(name)
+        agg["interview_attempts"] += 1
+        agg["rating_sum"] += float(rating)
+        touch(agg, timestamp)
+        role_agg = roles.setdefault((name, role), {"attempts": 0, "rating_sum": 0.0})
+        role_agg["attempts"] += 1
+        role_agg["rating_sum"] += float(rating)
+        roll(name, "interview", role, float(rating), timestamp)
+        record = None if _is_missing(question) else bank.find(question)
+        if record is not None:
+            for key, table in [((name, record["id"]), questions)] + [((name, tag), tags) for tag in record["tags"]]:
+                entry = table.setdefault(key, {"attempts": 0, "rating_sum": 0.0})
+                entry["attempts"] += 1
+                entry["rating_sum"] += float(rating)
+
+    # Resume rows are appended in time order, so the last row per user is the latest.
+    resumes = read_history("resume_scores", columns=["username", "role", "match_score", "timestamp"])
+    for name, role, score, timestamp in zip(resumes["username"], resumes["role"],
+                                            resumes["match_score"], resumes["timestamp"]):
+        if _is_missing(name) or _is_missing(score):
+            continue
+        role = None if _is_missing(role) else role
+        agg = user(name)
+        agg["resume_count"] += 1
+        agg["latest_resume_score"] = float(score)
+        agg["latest_resume_role"] = role
+        if agg["best_resume_score"] is None or float(score) > agg["best_resume_score"]:
+            agg["best_resume_score"] = float(score)
+            agg["best_resume_role"] = role
+        touch(agg, timestamp)
+        roll(name, "resume", role, float(score), timestamp)
+
+    return users, roles, questions, tags, rollups
+
+
+def _stored(conn):
+    users = {row[0]: dict(zip(USER_COLUMNS, row[1:])) for row in
+             conn.execute(f"SELECT username, {', '.join(USER_COLUMNS)} FROM user_aggregates")}
+    roles = {(u, r): {"attempts": n, "rating_sum": s} for u, r, n, s in
+             conn.execute("SELECT username, role, attempts, rating_sum FROM role_aggregates")}
+    questions = {(u, q): {"attempts": n, "rating_sum": s} for u, q, n, s in
+                 conn.execute("SELECT username, question_id, attempts, rating_sum FROM question_history")}
+    tags = {(u, t): {"attempts": n, "rating_sum": s} for u, t, n, s in
+            conn.execute("SELECT username, tag, attempts, rating_sum FROM tag_aggregates")}
+    rollups = {tuple(row[:5]): dict(zip(["count", "total", "min_value", "max_value"], row[5:])) for row in
+               conn.execute("SELECT username, metric, grain, bucket, role, count, total, min_value, max_value "
+                            "FROM score_rollups")}
+    return users, roles, questions, tags, rollups
+
+
+def _differences(expected, actual):
+    problems = []
+    for key in sorted(set(expected) | set(actual), key=str):
+        want, have = expected.get(key), actual.get(key)
+        if want is None or have is None:
+            problems.append(f"{key}: expected {want}, stored {have}")
+            continue
+        for field, value in want.items():
+            stored = have.get(field)
+            if isinstance(value, float) and stored is not None:
+                if not math.isclose(value, stored, rel_tol=1e-9, abs_tol=1e-6):
+                    problems.append(f"{key}.{field}: expected {value}, stored {stored}")
+            elif value != stored:
+                problems.append(f"{key}.{field}: expected {value}, stored {stored}")
+    return problems
+
+
+def check(conn=None):
+    """List differences between the stored aggregates and the raw logs."""
+    conn = conn or _connect()
+    problems = []
+    for expected, stored in zip(compute_from_logs(), _stored(conn)):
+        problems += _differences(expected, stored)
+    return problems
+
+
+def rebuild(conn=None):
+    conn = conn or _connect()
+    users, roles, questions, tags, rollups = compute_from_logs()
+    with conn:
+        for table in ("user_aggregates", "role_aggregates", "question_history", "tag_aggregates", "score_rollups"):
+            conn.execute(f"DELETE FROM {table}")
+        conn.executemany(
+            f"INSERT INTO user_aggregates (username, {', '.join(USER_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in range(len(USER_COLUMNS) + 1))})",
+            [[name] + [agg[c] for c in USER_COLUMNS] for name, agg in users.items()])
+        conn.executemany(
+            "INSERT INTO role_aggregates (username, role, attempts, rating_sum) VALUES (?, ?, ?, ?)",
+            [[name, role, agg["attempts"], agg["rating_sum"]] for (name, role), agg in roles.items()])
+        conn.executemany(
+            "INSERT INTO question_history (username, question_id, attempts, rating_sum) VALUES (?, ?, ?, ?)",
+            [[name, qid, agg["attempts"], agg["rating_sum"]] for (name, qid), agg in questions.items()])
+        conn.executemany(
+            "INSERT INTO tag_aggregates (username, tag, attempts, rating_sum) VALUES (?, ?, ?, ?)",
+            [[name, tag, agg["attempts"], agg["rating_sum"]] for (name, tag), agg in tags.items()])
+        conn.executemany(
+            "INSERT INTO score_rollups (username, metric, grain, bucket, role, count, total, min_value, max_value) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [list(key) + [agg["count"], agg["total"], agg["min_value"], agg["max_value"]]
+             for key, agg in rollups.items()])
+        conn.execute("INSERT OR REPLACE INTO aggregates_meta (key, value) VALUES ('built_at', ?)", (_now(),))
+        conn.execute("INSERT OR REPLACE INTO aggregates_meta (key, value) VALUES ('schema', ?)", (SCHEMA_VERSION,))
+    return len(users)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain PrepVault per-user aggregates")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("rebuild", help="Recompute aggregates from the raw logs")
+    cmd.add_argument("--check", action="store_true", help="Only report differences; don't rewrite")
+    args = parser.parse_args(argv)
+
+    conn = _connect()
+    problems = check(conn)
+    for problem in problems:
+        print(problem)
+    print(f"{len(problems)} difference(s) between stored aggregates and raw logs")
+    if not args.check:
+        print(f"Rebuilt aggregates for {rebuild(conn)} user(s)")
+    return 1 if args.check and problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+import model_provider
+from keyword_matcher import KeywordMatcher, tokenize
+
+# --- Settings ---
+BANK_FILE = os.environ.get("PREPVAULT_ANSWER_BANK", os.path.join("data", "reference_answers.json"))
+INDEX_DIR = os.environ.get("PREPVAULT_ANSWER_INDEX_DIR", os.path.join("data", "answer_index"))
+ENCODE_BATCH_SIZE = 64
+# Cosine similarity to the closest reference mapped onto 0..1 between these bounds.
+SIMILARITY_FLOOR = 0.25
+SIMILARITY_CEILING = 0.75
+SIMILARITY_WEIGHT = 0.7
+MIN_WORDS = 8
+
+
+def _text_key(text):
+    return hashlib.sha256(f"{model_provider.MODEL_NAME}\x1f{text}".encode("utf-8")).hexdigest()[:20]
+
+
+class ReferenceBank:
+    """Reference answers per interview question with persisted, memory-mapped embeddings.
+
+    The bank file lists ``question``, ``answers`` and ``keywords`` per entry.
+    Embeddings are stored row-per-answer in one .npy file next to the text
+    key of each row; a rebuild after editing the bank only encodes answers
+    whose text is new. Questions must be unique; entries without answers are
+    skipped, so those questions fall back to the word-count rating.
+    """
+
+    def __init__(self, records, index_dir=INDEX_DIR):
+        self.index_dir = index_dir
+        self.answers = []
+        self.keywords = {}
+        self._spans = {}
+        for record in records:
+            if record["question"] in self._spans:
+                raise ValueError(f"Duplicate question in answer bank: {record['question']}")
+            if not record["answers"]:
+                continue
+            start = len(self.answers)
+            self.answers.extend(record["answers"])
+            self._spans[record["question"]] = (start, len(self.answers))
+            self.keywords[record["question"]] = list(record.get("keywords", []))
+        self.matcher = KeywordMatcher(self.keywords)
+        self._keys = [_text_key(a) for a in self.answers]
+        self._lock = threading.Lock()
+        self._embeddings = None
+
+    @classmethod
+    def load(cls, path=BANK_FILE, index_dir=INDEX_DIR):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), index_dir=index_dir)
+
+    def __contains__(self, question):
+        return question in self._spans
+
+    def _path(self, name):
+        return os.path.join(self.index_dir, name)
+
+    def _stored_keys(self):
+        try:
+            with open(self._path("keys.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def build_index(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        stored_keys = self._stored_keys() or []
+        try:
+            stored = np.load(self._path("embeddings.npy"), mmap_mode="r") if stored_keys else None
+        except OSError:
+            stored_keys, stored = [], None
+        rows = {key: i for i, key in enumerate(stored_keys)}
+
+        new = [i for i, key in enumerate(self._keys) if key not in rows]
+        encoded = {}
+        if new:
+            vectors = model_provider.encode([self.answers[i] for i in new], batch_size=ENCODE_BATCH_SIZE,
+                                            normalize_embeddings=True)
+            encoded = dict(zip(new, np.asarray(vectors, dtype=np.float32)))
+        if encoded:
+            dim = next(iter(encoded.values())).shape[0]
+        else:
+            # An empty bank has nothing stored either; save a 0 x 0 matrix.
+            dim = stored.shape[1] if stored is not None else 0
+        embeddings = np.empty((len(self._keys), dim), dtype=np.float32)
+        for i, key in enumerate(self._keys):
+            embeddings[i] = encoded[i] if i in encoded else stored[rows[key]]
+        del stored
+
+        # Replace rather than overwrite: other processes may have the old file mapped.
+        tmp_path = self._path(f".embeddings-{os.getpid()}.npy")
+        np.save(tmp_path, embeddings)
+        os.replace(tmp_path, self._path("embeddings.npy"))
+        # Written last, so a half-built index is rebuilt on the next load.
+        with open(self._path("keys.json"), "w", encoding="utf-8") as f:
+            json.dump(self._keys, f)
+        return len(new)
+
+    def embeddings(self):
+        if self._embeddings is None:
+            with self._lock:
+                if self._embeddings is None:
+                    if self._stored_keys() != self._keys:
+                        self.build_index()
+                    self._embeddings = np.load(self._path("embeddings.npy"), mmap_mode="r")
+        return self._embeddings
+
+    def references(self, question):
+        start, end = self._spans[question]
+        return self.answers[start:end]
+
+    def similarity(self, question, answer_embedding):
+        """Best cosine similarity to the question's references, and that reference's index."""
+        start, end = self._spans[question]
+        block = self.embeddings()[start:end]
+        scores = block @ np.asarray(answer_embedding, dtype=block.dtype)
+        best = int(np.argmax(scores))
+        return float(scores[best]), best
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_bank():
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = ReferenceBank.load()
+    return _bank
+
+
+# --- Scoring ---
+def word_count_rating(response):
+    wc = len(response.strip().split())
+    if wc < 10:
+        return 2
+    elif wc < 25:
+        return 3
+    elif wc < 50:
+        return 4
+    else:
+        return 5
+
+
+def score_answer(question, response):
+    """Rate ``response`` 1-5 against the reference answers for ``question``.
+
+    Combines the closest reference's embedding similarity with the share of
+    the question's keywords the answer covers. Questions without references
+    fall back to the word-count rating.
+    """
+    start = time.perf_counter()
+    bank = get_bank()
+    if question not in bank or not response.strip():
+        return {"rating": word_count_rating(response), "similarity": None, "coverage": None,
+                "hits": [], "missing": [], "reference": None, "seconds": time.perf_counter() - start}
+
+    embedding = model_provider.encode([response], normalize_embeddings=True)[0]
+    similarity, best = bank.similarity(question, embedding)
+
+    keywords = bank.keywords[question]
+    found = bank.matcher.find(response)
+    hits = [kw for kw in keywords if kw in found]
+    coverage = len(hits) / len(keywords) if keywords else 0.0
+
+    closeness = np.clip((similarity - SIMILARITY_FLOOR) / (SIMILARITY_CEILING - SIMILARITY_FLOOR), 0.0, 1.0)
+    combined = SIMILARITY_WEIGHT * closeness + (1 - SIMILARITY_WEIGHT) * coverage
+    rating = 1 + int(round(4 * combined))
+    if len(tokenize(response)) < MIN_WORDS:
+        rating = min(rating, 2)
+
+    return {
+        "rating": rating,
+        "similarity": round(similarity, 3),
+        "coverage": round(coverage, 3),
+        "hits": hits,
+        "missing": [kw for kw in keywords if kw not in found],
+        "reference": bank.references(question)[best],
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def ideal_answer(question):
+    bank = get_bank()
+    if question not in bank:
+        return None
+    return bank.references(question)[0]
+
+
+if __name__ == "__main__":
+    # Precompute the persisted embeddings: python answer_scoring.py [bank file]
+    import sys
+
+    began = time.perf_counter()
+    bank = ReferenceBank.load(sys.argv[1] if len(sys.argv) > 1 else BANK_FILE)
+    encoded = bank.build_index()
+    print(f"Encoded {encoded} of {len(bank.answers)} reference answers in "
+          f"{time.perf_counter() - began:.1f}s -> {bank.index_dir}")
@@ -1,13 +1,11 @@
 import streamlit as st
 import os
 
-# Import screens/modules
-from dashboard import show_dashboard
-from login_screen import show_login
-from resume_analyzer import show_resume_review
-from my_profile import show_profile
-
-
+import auth
+import model_provider
+import notifier
+import screens
+import tracing
 
 # --- App Config ---
 st.set_page_config(page_title="PrepVault", layout="centered")
@@ -29,13 +27,14 @@ if st.session_state.show_tip:
         if st.button("Got it!"):
             st.session_state.show_tip = False
 
-# --- Navigation ---
-menu = st.sidebar.radio("Navigate", ["Login", "Dashboard", "Resume Analyzer", "Mock Interview", "My Profile"],
-                        help="Use this menu to explore PrepVault features.")
-
 if "username" not in st.session_state:
     st.session_state.username = ""
 
+# --- Navigation ---
+is_admin = auth.is_admin(st.session_state.username)
+menu = st.sidebar.radio("Navigate", screens.names(is_admin),
+                        help="Use this menu to explore PrepVault features.")
+
 # --- Logout Button ---
 if st.session_state.username:
     if st.sidebar.button("🚪 Logout"):
@@ -44,30 +43,23 @@ if st.session_state.username:
         st.experimental_rerun()
 
 # --- Routing ---
-if menu == "Login":
-    show_login()
-
-elif menu == "Dashboard":
-    if st.session_state.username:
-        show_dashboard(st.session_state.username)
+# Screen modules are imported on first visit, so the login page doesn't wait on them.
+screen = screens.SCREENS[menu]
+with tracing.span(f"screen.{screen.module}"):
+    if not screen.needs_login:
+        screens.load(menu)()
+    elif st.session_state.username and (is_admin or not screen.admin_only):
+        screens.load(menu)(st.session_state.username)
     else:
-        st.warning("Please log in to view your dashboard.")
+        st.warning(screen.login_warning)
 
-elif menu == "Resume Analyzer":
-    if st.session_state.username:
-        show_resume_review(st.session_state.username)
-    else:
-        st.warning("Please log in to analyze your resume.")
+# --- Background work ---
+# Started after the page has rendered so it doesn't compete with the first render.
+# Load the embedding model in the background so the first analysis is warm.
+model_provider.start_warmup()
 
-elif menu == "Mock Interview":
-    if st.session_state.username:
-        from mock_interview import show_mock_interview
-        show_mock_interview(st.session_state.username)
-    else:
-        st.warning("Please log in to access mock interviews.")
+# Inactivity notifications are generated by a background tick, not per page load.
+notifier.start_scheduler()
 
-elif menu == "My Profile":
-    if st.session_state.username:
-        show_profile(st.session_state.username)
-    else:
-        st.warning("Please log in to access your profile.")
+# With tracing on, histograms can be exported to a Prometheus text file periodically.
+tracing.start_exporter()
@@ -1,49 +1,70 @@
 import pandas as pd
 import os
+from concurrent.futures import TimeoutError as VerifyTimeout
 from datetime import datetime
 
+import storage
+from user_directory import directory, hash_on_pool, verify
+
 DATA_PATH = "users.csv"
+USER_COLUMNS = ["username", "password", "email", "role", "created_at"]
+# Comma-separated usernames treated as admins in addition to role == "admin".
+ADMIN_USERS = {u.strip() for u in os.environ.get("PREPVAULT_ADMINS", "").split(",") if u.strip()}
 
 # --- File Setup ---
 def ensure_user_file():
     if not os.path.exists(DATA_PATH) or os.stat(DATA_PATH).st_size == 0:
-        df = pd.DataFrame(columns=["username", "password", "email", "role", "created_at"])
+        df = pd.DataFrame(columns=USER_COLUMNS)
         df.to_csv(DATA_PATH, index=False)
 
 # --- Load Users ---
 def load_users():
-    ensure_user_file()
-    return pd.read_csv(DATA_PATH)
+    if storage.BACKEND == "csv":
+        ensure_user_file()
+    return storage.all_rows("users")
 
 # --- Login Logic ---
 def login(username, password):
-    df = load_users()
-    user = df[(df["username"] == username) & (df["password"] == password)]
-    if not user.empty:
+    # Hash verification runs on the user_directory worker pool.
+    try:
+        verified = verify(username, password)
+    except VerifyTimeout:
+        return False, "Login is busy right now, please try again in a moment."
+    if verified:
         return True, "Login successful!"
     else:
         return False, "Invalid username or password"
 
 # --- Signup Logic ---
 def signup(username, password, email="", role="user"):
-    df = load_users()
-    if username in df["username"].values:
+    if directory.exists(username):
         return False, "Username already exists"
-    
-    new_user = pd.DataFrame([{
+    # Hashing shares the login worker pool so a burst of signups can't pin every request thread.
+    try:
+        hashed = hash_on_pool(password)
+    except VerifyTimeout:
+        return False, "Signup is busy right now, please try again in a moment."
+    # The store re-checks atomically in case of a concurrent signup.
+    created = storage.insert_unique("users", {
         "username": username,
-        "password": password,
+        "password": hashed,
         "email": email,
         "role": role,
         "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }])
-
-    df = pd.concat([df, new_user], ignore_index=True)
-    df.to_csv(DATA_PATH, index=False)
+    })
+    if not created:
+        return False, "Username already exists"
     return True, "Signup successful!"
 
 # --- Optional: Get user info ---
 def get_user_info(username):
-    df = load_users()
-    user = df[df["username"] == username]
-    return user.to_dict(orient="records")[0] if not user.empty else None
+    return directory.get(username)
+
+# --- Roles ---
+def is_admin(username):
+    if not username:
+        return False
+    if username in ADMIN_USERS:
+        return True
+    info = get_user_info(username)
+    return bool(info) and info.get("role") == "admin"
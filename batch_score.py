@@ -0,0 +1,203 @@
+"""Score a folder of resumes against every role without the Streamlit UI.
+
+    python batch_score.py resumes/ --output resumes/batch_scores.csv
+
+Text is extracted in a process pool (OCR runs inside those workers rather
+than in pools of their own), resumes are encoded in batches and the whole
+resume x role score matrix is computed with one product per batch. Files that
+can't be read get one row with the ``error`` instead of scores.
+Progress is checkpointed next to the output file, so an interrupted run picks
+up where it stopped when started again with the same arguments. Results go to
+their own file by default, apart from the app's resume history.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import ocr
+from role_matching import encode_resumes, role_names, score_matrix
+from text_extraction import extract_text
+
+RESULT_COLUMNS = ["username", "file", "role", "match_score", "suggested_role", "suggested_score", "error"]
+RESUME_EXTENSIONS = (".pdf", ".docx")
+DEFAULT_OUTPUT = os.path.join("resumes", "batch_scores.csv")
+# Checkpoint line recording the output size once a batch's rows are written.
+SIZE_MARKER = "#size "
+
+logger = logging.getLogger("prepvault.batch")
+
+
+def find_resumes(input_dir):
+    paths = []
+    for root, _, files in os.walk(input_dir):
+        for name in sorted(files):
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def username_for(path, default_username=None):
+    if default_username:
+        return default_username
+    # Uploads are saved as "<username>_<original name>".
+    return os.path.splitext(os.path.basename(path))[0].split("_", 1)[0]
+
+
+def _init_worker():
+    # Already one process per CPU; a nested OCR pool in each would oversubscribe it.
+    ocr.WORKERS = 0
+
+
+def _safe_extract(path):
+    """``(text, error)`` for one resume; runs in a worker process."""
+    try:
+        text = extract_text(path)
+    except Exception as e:
+        logger.exception("Could not extract %s", path)
+        return "", f"{type(e).__name__}: {e}"
+    if not text:
+        return "", "no readable text"
+    return text, None
+
+
+# --- Checkpointing ---
+def _checkpoint_path(output):
+    return output + ".done"
+
+
+def _checkpoint_key(path):
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}|{stat.st_size}|{int(stat.st_mtime)}"
+
+
+def load_checkpoint(output):
+    """Keys of resumes in finished batches.
+
+    Rows written by a batch that never reached the checkpoint are cut off the
+    output, so a resumed run doesn't write them twice.
+    """
+    path = _checkpoint_path(output)
+    if not os.path.exists(path):
+        return set()
+    done, pending, size = set(), [], None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            line = line.rstrip("\n")
+            if line.startswith(SIZE_MARKER):
+                done.update(pending)
+                pending = []
+                size = int(line[len(SIZE_MARKER):])
+            elif line:
+                pending.append(line)
+    if size is not None and os.path.exists(output) and os.path.getsize(output) > size:
+        with open(output, "r+b") as f:
+            f.truncate(size)
+    return done
+
+
+def mark_done(output, paths):
+    """Record ``paths`` as finished along with the output size, in one write."""
+    size = os.path.getsize(output) if os.path.exists(output) else 0
+    lines = [_checkpoint_key(path) + "\n" for path in paths]
+    with open(_checkpoint_path(output), "a", encoding="utf-8") as f:
+        f.write("".join(lines) + f"{SIZE_MARKER}{size}\n")
+
+
+# --- Output ---
+def write_rows(output, rows, fmt):
+    if fmt == "jsonl":
+        with open(output, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+        return
+
+    columns = RESULT_COLUMNS
+    exists = os.path.exists(output) and os.path.getsize(output) > 0
+    if exists:
+        with open(output, newline="", encoding="utf-8") as f:
+            columns = next(csv.reader(f), RESULT_COLUMNS)
+    with open(output, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        if not exists:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def failed_row(path, error, default_username=None):
+    return {"username": username_for(path, default_username), "file": os.path.basename(path), "error": error}
+
+
+def rows_for_batch(paths, scores, default_username=None, top_k=None):
+    rows = []
+    names = role_names()
+    for path, resume_scores in zip(paths, scores):
+        best = int(resume_scores.argmax())
+        positions = range(len(names)) if top_k is None else resume_scores.argsort()[::-1][:top_k]
+        for position in positions:
+            rows.append({
+                "username": username_for(path, default_username),
+                "file": os.path.basename(path),
+                "role": names[position],
+                "match_score": round(float(resume_scores[position]), 2),
+                "suggested_role": names[best],
+                "suggested_score": round(float(resume_scores[best]), 2),
+            })
+    return rows
+
+
+def score_directory(input_dir, output, fmt="csv", workers=None, batch_size=64, username=None, top_k=None):
+    done = load_checkpoint(output)
+    mark_done(output, [])
+    paths = [p for p in find_resumes(input_dir) if _checkpoint_key(p) not in done]
+    failed = 0
+    scored = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for i in range(0, len(paths), batch_size):
+            batch = paths[i:i + batch_size]
+            extracted = list(pool.map(_safe_extract, batch))
+
+            readable = [(p, text) for p, (text, error) in zip(batch, extracted) if error is None]
+            rows = [failed_row(p, error, username) for p, (_, error) in zip(batch, extracted) if error is not None]
+            failed += len(rows)
+            if readable:
+                batch_paths = [p for p, _ in readable]
+                embeddings = encode_resumes([t for _, t in readable], batch_size=batch_size)
+                rows += rows_for_batch(batch_paths, score_matrix(embeddings), username, top_k)
+                scored += len(readable)
+            write_rows(output, rows, fmt)
+
+            mark_done(output, batch)
+            elapsed = time.perf_counter() - start
+            print(f"{i + len(batch)}/{len(paths)} resumes, {scored / elapsed:.1f} resumes/s", flush=True)
+
+    elapsed = time.perf_counter() - start
+    return {"scored": scored, "failed": failed, "already_done": len(done), "seconds": round(elapsed, 2),
+            "resumes_per_second": round(scored / elapsed, 2) if elapsed else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory of resumes against every role.")
+    parser.add_argument("input_dir", help="Folder to scan for .pdf and .docx resumes")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--username", help="Record every resume under this username")
+    parser.add_argument("--top-k", type=int, default=None, help="Only write each resume's best K roles")
+    args = parser.parse_args(argv)
+
+    summary = score_directory(args.input_dir, args.output, fmt=args.format, workers=args.workers,
+                              batch_size=args.batch_size, username=args.username, top_k=args.top_k)
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Per-answer scoring latency against the reference-answer bank.
+
+Loads the model and the memory-mapped bank once (reported separately), then
+scores a synthetic answer for every question in the bank and reports p50/p95
+per answer. Run from the repository root:
+
+    python benchmarks/bench_answer_scoring.py --rounds 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    import answer_scoring
+    import model_provider
+
+    start = time.perf_counter()
+    model_provider.get_model()
+    model_load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bank = answer_scoring.get_bank()
+    bank.embeddings()
+    bank_load = time.perf_counter() - start
+
+    questions = list(bank.keywords)
+    samples = []
+    for _ in range(args.rounds):
+        for question in questions:
+            answer = f"In my last role I handled this by focusing on {', '.join(bank.keywords[question][:3])}."
+            samples.append(answer_scoring.score_answer(question, answer)["seconds"] * 1000)
+
+    print(f"model load: {model_load:.2f} s   bank load: {bank_load * 1000:.1f} ms   "
+          f"questions: {len(questions)}  answers scored: {len(samples)}")
+    print(f"score_answer p50 {statistics.median(samples):.2f} ms   p95 {percentile(samples, 95):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
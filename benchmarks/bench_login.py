@@ -0,0 +1,67 @@
+"""Login latency against a synthetic users table.
+
+Builds a users.csv with N users in a temporary directory (all sharing one
+precomputed hash, so setup doesn't pay N key derivations), then times the
+directory's index load, duplicate checks and logins, next to the old
+read-the-whole-file lookup.
+
+    python benchmarks/bench_login.py --users 100000 --logins 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import synthetic  # noqa: E402
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--logins", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="prepvault-bench-")
+    os.chdir(workdir)
+    import pandas as pd
+    import user_directory
+
+    stored = user_directory.hash_password("secret")
+    synthetic.write_table(workdir, "users", args.users, stored_password=stored)
+    names = [f"user{i * 7919 % args.users}" for i in range(args.logins)]
+
+    start = time.perf_counter()
+    count = len(user_directory.directory)
+    load = time.perf_counter() - start
+
+    def timed(fn):
+        samples = []
+        for name in names:
+            start = time.perf_counter()
+            fn(name)
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    exists = timed(user_directory.directory.exists)
+    logins = timed(lambda name: user_directory.verify(name, "secret"))
+    misses = timed(lambda name: user_directory.verify(name + "x", "secret"))
+    legacy = timed(lambda name: (lambda df: df[(df["username"] == name)])(pd.read_csv("users.csv")))
+
+    print(f"users: {count}  hash iterations: {user_directory.HASH_ITERATIONS}  workdir: {workdir}")
+    print(f"index load: {load * 1000:.1f} ms")
+    for label, samples in [("duplicate check", exists), ("login (hit)", logins),
+                           ("login (unknown user)", misses), ("legacy full-file lookup", legacy)]:
+        print(f"{label:<25} p50 {statistics.median(samples):8.3f} ms   p95 {percentile(samples, 95):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Cold start of the app: module import times and time-to-first-render.
+
+Every measurement runs in a fresh interpreter, so nothing is warm from a
+previous import. Time-to-first-render runs app.py on the Login route with
+Streamlit's AppTest and includes importing Streamlit itself.
+
+    python benchmarks/bench_startup.py --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["app", "login_screen", "dashboard", "resume_analyzer", "mock_interview", "my_profile"]
+
+IMPORT_SNIPPET = """
+import sys, time
+import streamlit
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+RENDER_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+elapsed = time.perf_counter() - start
+screens = [m for m in ("dashboard", "resume_analyzer", "mock_interview", "my_profile") if m in sys.modules]
+print(json.dumps({"seconds": elapsed, "errors": len(at.exception), "screen_modules_loaded": screens}))
+"""
+
+
+def run(snippet):
+    env = dict(os.environ, PREPVAULT_MODEL_WARMUP="0", PREPVAULT_NOTIFY_SCHEDULER="0")
+    result = subprocess.run([sys.executable, "-c", snippet], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    # app is imported (not run) for completeness; its import renders in bare mode.
+    print("cold import (s, median; streamlit already imported):")
+    for module in MODULES:
+        samples = [float(run(IMPORT_SNIPPET.format(module=module))) for _ in range(args.repeat)]
+        print(f"  {module:<16} {statistics.median(samples):.3f}")
+
+    renders = [json.loads(run(RENDER_SNIPPET)) for _ in range(args.repeat)]
+    seconds = [r["seconds"] for r in renders]
+    print(f"time to first render, Login route: median {statistics.median(seconds):.3f} s, "
+          f"max {max(seconds):.3f} s")
+    print(f"  screen modules imported by the login render: {renders[-1]['screen_modules_loaded'] or 'none'}")
+    if any(r["errors"] for r in renders):
+        print("  warning: the app raised during the render")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Per-call cost of the tracing API, with tracing off and on.
+
+Times a trivial function called directly, through a ``traced`` wrapper and
+inside a ``span`` block, so the numbers are the instrumentation overhead
+alone. Run from the repository root:
+
+    python benchmarks/bench_tracing.py --calls 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def per_call_ns(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    import tracing
+
+    def work():
+        return None
+
+    wrapped = tracing.traced("bench.work")(work)
+
+    def in_span():
+        with tracing.span("bench.work"):
+            work()
+
+    results = {}
+    for state in (False, True):
+        tracing.enable(state)
+        label = "on" if state else "off"
+        results[f"direct ({label})"] = per_call_ns(work, args.calls)
+        results[f"traced ({label})"] = per_call_ns(wrapped, args.calls)
+        results[f"span ({label})"] = per_call_ns(in_span, args.calls)
+    tracing.enable(False)
+
+    baseline = results["direct (off)"]
+    for name, ns in results.items():
+        print(f"{name:<14} {ns:8.1f} ns/call  (+{ns - baseline:.1f} ns)")
+    hist = next(row for row in tracing.snapshot() if row["span"] == "bench.work")
+    print(f"recorded {hist['count']} spans, p50 {hist['p50'] * 1e9:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
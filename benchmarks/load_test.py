@@ -0,0 +1,330 @@
+"""Concurrent-session load test: scripted users driving app.py through AppTest.
+
+Every virtual user gets its own AppTest session, the way each browser tab
+gets its own script runner in the Streamlit server. AppTest swaps in a
+process-wide runtime for each run, so two sessions can't run in one process
+at once; sessions run in a pool of ``--concurrency`` worker processes
+instead, all against the same data directory. They contend for the same
+files, locks and SQLite database as sessions on replicated servers would.
+Each worker renders the app once before it takes a session, so timings are
+for a warm server. Each session:
+
+    open the app -> log in -> open the dashboard -> upload and analyze a
+    resume -> start a mock interview and answer three questions
+
+Every rerun is timed as one request and grouped by route. The report gives
+per-route latency percentiles, sessions and requests per second, errors
+(script exceptions, failed logins, missing results) and lost writes:
+answers, resume scores and login events a session saw succeed but that are
+not in the store afterwards.
+
+The data is synthetic (see synthetic.py) and nothing touches the network:
+Hugging Face libraries are forced offline, so the embedding model must
+already be in the local cache.
+
+    python benchmarks/load_test.py --sessions 200 --concurrency 50
+    python benchmarks/load_test.py --sessions 20 --concurrency 5 --think-time 0.5 --trace
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import synthetic  # noqa: E402
+import tracing  # noqa: E402
+from run_suite import RESULTS_DIR, STATIC_ENV, git_commit, percentile, prepare_workdir  # noqa: E402
+
+APP = os.path.join(ROOT, "app.py")
+OFFLINE_ENV = {"HF_HUB_OFFLINE": "1", "TRANSFORMERS_OFFLINE": "1"}
+LOAD_USER_PREFIX = "load"
+ANSWERS = [
+    "I would start by clarifying the requirements, then break the problem into steps and test each one.",
+    "In my last project I used SQL and Python to clean the data, then built a dashboard for stakeholders.",
+    "I prioritise by impact and urgency, communicate early with the team and document what I changed.",
+]
+MIME = {"pdf": "application/pdf", "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+
+
+class SessionError(Exception):
+    pass
+
+
+class Recorder:
+    """Request timings (ms) and errors, grouped by route."""
+
+    def __init__(self):
+        self.timings = {}
+        self.errors = {}
+        self.error_samples = []
+
+    def add(self, route, seconds):
+        self.timings.setdefault(route, []).append(seconds * 1000)
+
+    def error(self, route, message):
+        self.errors[route] = self.errors.get(route, 0) + 1
+        if len(self.error_samples) < 20:
+            self.error_samples.append(f"{route}: {message}")
+
+    def merge(self, other):
+        for route, samples in other.timings.items():
+            self.timings.setdefault(route, []).extend(samples)
+        for route, n in other.errors.items():
+            self.errors[route] = self.errors.get(route, 0) + n
+        self.error_samples += other.error_samples[:20 - len(self.error_samples)]
+
+
+class Session:
+    """One scripted user; each step is one or more timed reruns of the app."""
+
+    def __init__(self, number, username, resume, recorder, think_time, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.username = username
+        self.resume = resume
+        self.recorder = recorder
+        self.think_time = think_time
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.rng = random.Random(number)
+        self.writes = {"logins": 0, "resume_scores": 0, "answers": 0}
+
+    def request(self, route, action=None):
+        if self.think_time:
+            time.sleep(self.rng.uniform(0, 2 * self.think_time))
+        start = time.perf_counter()
+        try:
+            (action or self.at.run)()
+        finally:
+            self.recorder.add(route, time.perf_counter() - start)
+        if self.at.exception:
+            raise SessionError(self.at.exception[0].message)
+
+    def button(self, label):
+        for button in self.at.button:
+            if button.label == label:
+                return button
+        raise SessionError(f"no {label!r} button")
+
+    def navigate(self, route, screen):
+        self.request(route, self.at.sidebar.radio[0].set_value(screen).run)
+
+    # --- Steps ---
+    def open_app(self):
+        self.request("open app")
+
+    def login(self):
+        self.at.text_input(key="login_user").set_value(self.username)
+        self.at.text_input(key="login_pass").set_value(synthetic.PASSWORD)
+        self.request("login", self.button("Login").click().run)
+        if self.at.session_state["username"] != self.username:
+            raise SessionError("login rejected")
+        self.writes["logins"] += 1
+
+    def dashboard(self):
+        self.navigate("dashboard", "Dashboard")
+
+    def analyze_resume(self):
+        self.navigate("resume analyzer", "Resume Analyzer")
+        with open(self.resume["path"], "rb") as f:
+            data = f.read()
+        name = os.path.basename(self.resume["path"])
+        uploader = self.at.file_uploader[0].set_value((name, data, MIME[name.rsplit(".", 1)[1]]))
+        self.request("analyze resume", uploader.run)
+        if self.at.error:
+            raise SessionError(self.at.error[0].value)
+        if not any("Match Score" in m.value for m in self.at.markdown):
+            raise SessionError("no match score shown")
+        self.writes["resume_scores"] += 1
+
+    def interview(self, questions=3):
+        self.navigate("mock interview", "Mock Interview")
+        self.request("start interview", self.button("🚀 Start Interview").click().run)
+        for n in range(questions):
+            self.at.text_area(key=f"response_{n}").set_value(ANSWERS[n % len(ANSWERS)])
+            self.request("submit answer", self.button("✅ Submit Answer").click().run)
+            if not any("Response saved" in s.value for s in self.at.success):
+                raise SessionError("answer not saved")
+            self.writes["answers"] += 1
+            self.request("next question", self.button("➡️ Next Question").click().run)
+
+    def run(self):
+        for route, step in [("open app", self.open_app), ("login", self.login), ("dashboard", self.dashboard),
+                            ("analyze resume", self.analyze_resume), ("mock interview", self.interview)]:
+            try:
+                step()
+            except Exception as e:
+                self.recorder.error(route, f"{type(e).__name__}: {e}")
+                if route in ("open app", "login"):
+                    break  # nothing else works without a session
+        return self.writes
+
+
+# --- Workers ---
+def init_worker(workdir, env):
+    os.environ.update(env)
+    os.chdir(workdir)
+    from streamlit.testing.v1 import AppTest
+
+    AppTest.from_file(APP, default_timeout=120).run()
+    tracing.reset()
+
+
+def run_session(number, username, resume, think_time, timeout):
+    """Run one scripted session; returns its Recorder, the writes it saw succeed
+    and the spans it recorded (when tracing is on)."""
+    import activity
+
+    recorder = Recorder()
+    writes = Session(number, username, resume, recorder, think_time, timeout).run()
+    # Queued activity events leave with the session, not at worker exit.
+    activity.flush()
+    spans = tracing.histograms()
+    tracing.reset()
+    return recorder, writes, spans
+
+
+# --- Setup and checks ---
+def create_load_users(count):
+    """Add users load0..load{count-1} with no history, so their writes can be counted exactly."""
+    import storage
+    import user_directory
+
+    stored = user_directory.hash_password(synthetic.PASSWORD)
+    names = [f"{LOAD_USER_PREFIX}{i}" for i in range(count)]
+    existing = storage.all_rows("users")["username"].astype(str)
+    missing = [n for n in names if n not in set(existing)]
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    storage.append_many("users", [{"username": n, "password": stored, "email": f"{n}@example.com",
+                                   "role": "user", "created_at": now} for n in missing])
+    return names
+
+
+def stored_counts(usernames):
+    import activity
+    import storage
+
+    activity.flush()
+    counts = {"logins": 0, "resume_scores": 0, "answers": 0}
+    for username in usernames:
+        events = storage.user_rows("user_activity", username)
+        counts["logins"] += int((events["action"] == activity.LOGIN).sum())
+        counts["resume_scores"] += len(storage.user_rows("resume_scores", username))
+        counts["answers"] += len(storage.user_rows("interview_scores", username))
+    return counts
+
+
+def summarize(recorder, elapsed):
+    routes = {}
+    for route, samples in sorted(recorder.timings.items()):
+        routes[route] = {
+            "requests": len(samples),
+            "errors": recorder.errors.get(route, 0),
+            "p50_ms": round(statistics.median(samples), 2),
+            "p95_ms": round(percentile(samples, 95), 2),
+            "p99_ms": round(percentile(samples, 99), 2),
+            "max_ms": round(max(samples), 2),
+            "per_second": round(len(samples) / elapsed, 2),
+        }
+    for route, errors in recorder.errors.items():
+        routes.setdefault(route, {"requests": 0, "errors": errors})
+    return routes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50, help="Sessions in flight at once")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause before each request (s)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request script timeout (s)")
+    parser.add_argument("--scale", default="1k", help="Synthetic rows per table already in the store")
+    parser.add_argument("--resumes", type=int, default=12)
+    parser.add_argument("--workdir", help="Reuse (or create) this data directory instead of a temporary one")
+    parser.add_argument("--trace", action="store_true", help="Also record server-side spans (tracing.py)")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/load-<time>.json)")
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output or os.path.join(RESULTS_DIR, f"load-{datetime.now():%Y%m%d-%H%M%S}.json"))
+    rows = synthetic.parse_scale(args.scale)
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="prepvault-load-"))
+    info = prepare_workdir(workdir, rows, rows, args.resumes, seed=0)
+    # Scanned PDFs depend on a local Tesseract install; keep the load about the app itself.
+    corpus = [r for r in info["corpus"] if r["kind"] != "scanned pdf"]
+
+    env = dict(STATIC_ENV, **OFFLINE_ENV)
+    if args.trace:
+        env["PREPVAULT_TRACING"] = "1"
+    os.environ.update(env)
+    os.chdir(workdir)
+
+    usernames = create_load_users(args.sessions)
+    before = stored_counts(usernames)
+
+    print(f"{args.sessions} sessions, {args.concurrency} at a time, {rows} rows in {workdir}")
+    recorder = Recorder()
+    claimed = {"logins": 0, "resume_scores": 0, "answers": 0}
+    with ProcessPoolExecutor(max_workers=args.concurrency, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=init_worker, initargs=(workdir, env)) as pool:
+        # Start the clock once every worker is up and warm.
+        list(pool.map(time.sleep, [0.5] * args.concurrency))
+        start = time.perf_counter()
+        futures = [pool.submit(run_session, n, usernames[n], corpus[n % len(corpus)], args.think_time, args.timeout)
+                   for n in range(args.sessions)]
+        for future in futures:
+            session_recorder, writes, session_spans = future.result()
+            recorder.merge(session_recorder)
+            for key, n in writes.items():
+                claimed[key] += n
+            if session_spans:
+                tracing.merge(session_spans)
+        elapsed = time.perf_counter() - start
+
+    after = stored_counts(usernames)
+    lost = {key: claimed[key] - (after[key] - before[key]) for key in claimed}
+    routes = summarize(recorder, elapsed)
+    requests = sum(r["requests"] for r in routes.values())
+
+    print(f"{'route':<18} {'requests':>8} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for route, r in routes.items():
+        if r["requests"]:
+            print(f"{route:<18} {r['requests']:>8} {r['errors']:>6} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+                  f"{r['p99_ms']:>9.1f} {r['max_ms']:>9.1f}")
+        else:
+            print(f"{route:<18} {0:>8} {r['errors']:>6}")
+    print(f"wall time {elapsed:.1f}s: {args.sessions / elapsed:.2f} sessions/s, {requests / elapsed:.1f} requests/s")
+    print(f"writes confirmed by sessions: {claimed}; lost: {lost}")
+    for sample in recorder.error_samples[:5]:
+        print(f"  error {sample}")
+
+    report = {
+        "meta": {"sessions": args.sessions, "concurrency": args.concurrency, "think_time": args.think_time,
+                 "rows": rows, "commit": git_commit(), "created_at": datetime.now().isoformat(timespec="seconds")},
+        "wall_seconds": round(elapsed, 3),
+        "sessions_per_second": round(args.sessions / elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 3),
+        "routes": routes,
+        "writes": {"claimed": claimed, "lost": lost},
+        "error_samples": recorder.error_samples,
+    }
+    if args.trace:
+        report["spans"] = tracing.snapshot()
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"results -> {output}")
+    return 1 if any(lost.values()) else 0
+
+
+if __name__ == "__main__":
+    # Workers look session functions up by module name, and AppTest rebinds
+    # __main__ to the app script, so run them from the imported module.
+    import load_test
+    sys.exit(load_test.main())
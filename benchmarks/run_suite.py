@@ -0,0 +1,287 @@
+"""Benchmark suite over synthetic data, with JSON results and baseline checks.
+
+Generates a dataset at the requested scale (see synthetic.py) in a work
+directory, runs every benchmark there and writes the timings as JSON. Each
+benchmark reports its setup time, the first (cold) call and p50/p95/mean/min
+over the repeated calls. With ``--baseline``, p50s are compared against an
+earlier results file and the run exits non-zero on a regression.
+
+    python benchmarks/run_suite.py --scale 100k --output baseline.json
+    python benchmarks/run_suite.py --scale 100k --baseline baseline.json
+    python benchmarks/run_suite.py --scale 1k --only auth --only dashboard
+
+A benchmark whose dependencies are missing (e.g. no embedding model) is
+recorded with its error and the rest still run.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import synthetic  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+# Static inputs stay in the repository; the work directory only holds user data.
+STATIC_ENV = {
+    "PREPVAULT_ROLE_CATALOG": os.path.join(ROOT, "data", "roles.json"),
+    "PREPVAULT_ROLE_INDEX_DIR": os.path.join(ROOT, "data", "role_index"),
+    "PREPVAULT_QUESTION_BANK": os.path.join(ROOT, "data", "questions.json"),
+    "PREPVAULT_ANSWER_BANK": os.path.join(ROOT, "data", "reference_answers.json"),
+    "PREPVAULT_ANSWER_INDEX_DIR": os.path.join(ROOT, "data", "answer_index"),
+    "PREPVAULT_MODEL_WARMUP": "0",
+    "PREPVAULT_NOTIFY_SCHEDULER": "0",
+}
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Register ``setup(ctx)``, which returns the ``run(i)`` callable to time."""
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+# --- Benchmarks ---
+@benchmark("auth.login")
+def _login(ctx):
+    import auth
+    return lambda i: auth.login(synthetic.HEAVY_USER, synthetic.PASSWORD)
+
+
+@benchmark("auth.login (unknown user)")
+def _login_unknown(ctx):
+    import auth
+    return lambda i: auth.login(f"nobody{i}", synthetic.PASSWORD)
+
+
+@benchmark("auth.signup")
+def _signup(ctx):
+    import auth
+    return lambda i: auth.signup(f"signup_{ctx['run_id']}_{i}", synthetic.PASSWORD)
+
+
+@benchmark("dashboard_utils.get_latest_resume_score")
+def _latest_resume(ctx):
+    import dashboard_utils
+    return lambda i: dashboard_utils.get_latest_resume_score(synthetic.HEAVY_USER)
+
+
+@benchmark("dashboard_utils.get_average_interview_rating")
+def _average_rating(ctx):
+    import dashboard_utils
+    return lambda i: dashboard_utils.get_average_interview_rating(synthetic.HEAVY_USER)
+
+
+@benchmark("dashboard_utils.load_user_resume_scores")
+def _resume_history(ctx):
+    import dashboard_utils
+    return lambda i: dashboard_utils.load_user_resume_scores(synthetic.HEAVY_USER)
+
+
+@benchmark("dashboard_utils.load_user_interview_scores")
+def _interview_history(ctx):
+    import dashboard_utils
+    return lambda i: dashboard_utils.load_user_interview_scores(synthetic.HEAVY_USER)
+
+
+@benchmark("role_matching.identify_missing_keywords")
+def _missing_keywords(ctx):
+    from role_matching import identify_missing_keywords
+    corpus = ctx["corpus"]
+    return lambda i: identify_missing_keywords(corpus[i % len(corpus)]["text"], corpus[i % len(corpus)]["role"])
+
+
+@benchmark("role_matching.ai_match_resume_to_roles")
+def _match_roles(ctx):
+    from role_matching import ai_match_resume_to_roles
+    corpus = ctx["corpus"]
+    return lambda i: ai_match_resume_to_roles(corpus[i % len(corpus)]["text"], k=3)
+
+
+@benchmark("text_extraction.extract_text")
+def _extract(ctx):
+    from text_extraction import extract_text
+    corpus = ctx["corpus"]
+    return lambda i: extract_text(corpus[i % len(corpus)]["path"])
+
+
+@benchmark("notifier.check_and_generate_notifications")
+def _notifications(ctx):
+    import notifier
+    return lambda i: notifier.check_and_generate_notifications()
+
+
+# Writes run last so they don't change the data the reads above see.
+@benchmark("mock_interview.save_interview_score")
+def _save_score(ctx):
+    from mock_interview import save_interview_score
+    return lambda i: save_interview_score(synthetic.HEAVY_USER, "Data Analyst",
+                                          "What is the difference between INNER JOIN and LEFT JOIN in SQL?",
+                                          "An inner join keeps matching rows only.", "Good response.", 4)
+
+
+# --- Running ---
+def run_benchmark(setup, ctx, repeat):
+    start = time.perf_counter()
+    run = setup(ctx)
+    setup_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    run(-1)
+    first_ms = (time.perf_counter() - start) * 1000
+
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        run(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "runs": repeat,
+        "setup_ms": round(setup_ms, 3),
+        "first_ms": round(first_ms, 3),
+        "p50_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(percentile(samples, 95), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "min_ms": round(min(samples), 4),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_workdir(workdir, rows, users, resumes, seed):
+    """Generate the dataset and corpus unless ``workdir`` already holds them."""
+    corpus_dir = os.path.join(workdir, "corpus")
+    marker = os.path.join(workdir, "synthetic.json")
+    if os.path.exists(marker):
+        with open(marker, encoding="utf-8") as f:
+            info = json.load(f)
+        if info["rows"] == rows and info["users"] == users and info["seed"] == seed and len(info["corpus"]) >= resumes:
+            return info
+    os.makedirs(workdir, exist_ok=True)
+    start = time.perf_counter()
+    synthetic.generate_dataset(workdir, rows, users=users, seed=seed)
+    corpus = synthetic.write_resume_corpus(corpus_dir, resumes, seed=seed)
+    info = {"rows": rows, "users": users, "seed": seed, "corpus": corpus,
+            "generate_seconds": round(time.perf_counter() - start, 1)}
+    with open(marker, "w", encoding="utf-8") as f:
+        json.dump(info, f)
+    return info
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Rows of (name, baseline p50, new p50, ratio, status) for benchmarks in both runs."""
+    rows = []
+    for name, new in results.items():
+        old = baseline.get(name)
+        if not old or "p50_ms" not in old or "p50_ms" not in new:
+            continue
+        delta = new["p50_ms"] - old["p50_ms"]
+        ratio = new["p50_ms"] / old["p50_ms"] if old["p50_ms"] else float("inf")
+        status = "ok"
+        if delta > min_delta_ms and ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif -delta > min_delta_ms and ratio < 1 - threshold:
+            status = "faster"
+        rows.append((name, old["p50_ms"], new["p50_ms"], ratio, status))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", default="1k", help="Rows per table: 1k, 100k, 1m or a number")
+    parser.add_argument("--users", type=int, help="Distinct users (default: same as rows)")
+    parser.add_argument("--resumes", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="Reuse (or create) this data directory instead of a temporary one")
+    parser.add_argument("--only", action="append", default=[], help="Run benchmarks whose name contains this")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<scale>-<time>.json)")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative p50 slowdown that counts")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="Ignore p50 changes smaller than this")
+    args = parser.parse_args(argv)
+
+    # Paths given on the command line are relative to where the suite was started.
+    output = os.path.abspath(args.output or os.path.join(
+        RESULTS_DIR, f"{args.scale}-{datetime.now():%Y%m%d-%H%M%S}.json"))
+    baseline_path = args.baseline and os.path.abspath(args.baseline)
+
+    rows = synthetic.parse_scale(args.scale)
+    users = args.users or rows
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="prepvault-suite-"))
+    info = prepare_workdir(workdir, rows, users, args.resumes, args.seed)
+    print(f"data: {rows} rows, {users} users, {len(info['corpus'])} resumes in {workdir}")
+
+    os.environ.update(STATIC_ENV)
+    os.chdir(workdir)
+    import storage
+    if storage.BACKEND == "sqlite" and not os.path.exists(storage.DB_PATH):
+        storage.import_csvs()
+
+    ctx = {"corpus": info["corpus"], "rows": rows, "users": users, "run_id": int(time.time())}
+    results = {}
+    for name, setup in BENCHMARKS:
+        if args.only and not any(part in name for part in args.only):
+            continue
+        try:
+            results[name] = run_benchmark(setup, ctx, args.repeat)
+            r = results[name]
+            print(f"{name:<48} p50 {r['p50_ms']:10.3f} ms  p95 {r['p95_ms']:10.3f} ms  first {r['first_ms']:10.1f} ms")
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"{name:<48} failed: {results[name]['error']}")
+            traceback.print_exc(limit=1, file=sys.stderr)
+
+    report = {
+        "meta": {
+            "scale": args.scale, "rows": rows, "users": users, "resumes": len(info["corpus"]),
+            "repeat": args.repeat, "seed": args.seed, "backend": storage.BACKEND,
+            "commit": git_commit(), "python": platform.python_version(), "platform": platform.platform(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"results -> {output}")
+
+    if not baseline_path:
+        return 0
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("rows") != rows:
+        print(f"note: baseline was measured at {baseline['meta'].get('rows')} rows, this run at {rows}")
+    regressions = 0
+    for name, old, new, ratio, status in compare(results, baseline["results"], args.threshold, args.min_delta_ms):
+        print(f"{name:<48} {old:10.3f} -> {new:10.3f} ms  x{ratio:5.2f}  {status}")
+        regressions += status == "REGRESSION"
+    print(f"{regressions} regression(s) over {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
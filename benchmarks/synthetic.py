@@ -0,0 +1,228 @@
+"""Synthetic PrepVault data for benchmarks.
+
+Writes users.csv, user_info.csv, resumes/resume_scores.csv,
+data/interview_scores.csv and user_activity.csv under a directory, laid out
+the way ``storage`` expects, plus an optional corpus of PDF and DOCX
+resumes. History rows are skewed toward low-numbered users, so ``user0`` is
+always the heaviest user. Everything is seeded and reproducible.
+
+    python benchmarks/synthetic.py --scale 100k --out /tmp/prepvault-100k --resumes 20
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import activity  # noqa: E402
+import storage  # noqa: E402
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+PASSWORD = "secret"
+HEAVY_USER = "user0"
+# History spans this many days, ending at generation time.
+HISTORY_DAYS = 365
+# Users draw history rows with probability ~ rank ** -(1 - 1 / SKEW).
+SKEW = 3
+
+LOCATIONS = ["Lagos", "Nairobi", "London", "Berlin", "Toronto", "Bangalore", "Austin", "Remote"]
+ACTIONS = [activity.LOGIN, activity.RESUME_ANALYZED, activity.ANSWER_SUBMITTED, activity.PROFILE_SAVED]
+FILLER = ("delivered results working with cross functional teams while improving process quality "
+          "and documenting outcomes for stakeholders across several projects").split()
+
+
+def parse_scale(value):
+    value = str(value).lower()
+    return SCALES[value] if value in SCALES else int(value.replace("_", ""))
+
+
+def load_catalog():
+    with open(os.path.join(ROOT, "data", "roles.json"), encoding="utf-8") as f:
+        roles = json.load(f)
+    with open(os.path.join(ROOT, "data", "questions.json"), encoding="utf-8") as f:
+        questions = json.load(f)
+    by_role = {}
+    for record in questions:
+        by_role.setdefault(record["role"], []).append(record["question"])
+    return roles, by_role
+
+
+def sentence(rng, words=12):
+    return " ".join(rng.choice(FILLER) for _ in range(words)).capitalize() + "."
+
+
+# --- Tables ---
+def _pick_user(rng, users):
+    return f"user{int(users * rng.random() ** SKEW)}"
+
+
+def _rows(table, count, users, rng, stored_password, roles, questions):
+    start = datetime.now() - timedelta(days=HISTORY_DAYS)
+    step = HISTORY_DAYS * 86400 / max(count, 1)
+    role_names = [r["role"] for r in roles]
+
+    for i in range(count):
+        # Append-only logs are in time order.
+        stamp = (start + timedelta(seconds=i * step)).strftime("%Y-%m-%d %H:%M:%S")
+        if table == "users":
+            yield [f"user{i}", stored_password, f"user{i}@example.com", "user", stamp]
+        elif table == "user_info":
+            yield [f"user{i}", f"user{i}@example.com", rng.choice(LOCATIONS), sentence(rng, 8)]
+        elif table == "resume_scores":
+            username = _pick_user(rng, users)
+            role, suggested = rng.choice(role_names), rng.choice(role_names)
+            yield [username, f"{username}_resume.pdf", role, round(rng.uniform(20, 95), 2),
+                   suggested, round(rng.uniform(20, 95), 2), stamp]
+        elif table == "interview_scores":
+            role = rng.choice(role_names)
+            question = rng.choice(questions.get(role) or ["Tell me about yourself."])
+            yield [_pick_user(rng, users), role, question, sentence(rng, 30), sentence(rng, 10),
+                   rng.randint(1, 5), stamp]
+        elif table == "user_activity":
+            yield [_pick_user(rng, users), stamp, rng.choice(ACTIONS)]
+        else:
+            raise ValueError(f"No generator for table {table!r}")
+
+
+def write_table(root, table, count, users=None, seed=0, stored_password=None, catalog=None):
+    """Write ``count`` synthetic rows of ``table`` under ``root``; returns the file path.
+
+    History rows belong to ``users`` users (default ``count``).
+    """
+    rng = random.Random(f"{seed}:{table}")
+    roles, questions = catalog or load_catalog()
+    path = os.path.join(root, storage.TABLES[table]["csv"])
+    os.makedirs(os.path.dirname(path) or root, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(storage.columns(table))
+        writer.writerows(_rows(table, count, users or count, rng, stored_password or PASSWORD,
+                               roles, questions))
+    return path
+
+
+def generate_dataset(root, rows, users=None, seed=0, tables=None):
+    """Write every table with ``rows`` rows; returns {table: seconds spent}.
+
+    All users share one precomputed password hash of PASSWORD, so setup
+    doesn't pay a key derivation per user.
+    """
+    import user_directory
+
+    users = users or rows
+    stored = user_directory.hash_password(PASSWORD)
+    catalog = load_catalog()
+    timings = {}
+    for table in tables or storage.TABLES:
+        start = time.perf_counter()
+        count = users if storage.TABLES[table]["unique"] else rows
+        write_table(root, table, count, users=users, seed=seed, stored_password=stored, catalog=catalog)
+        timings[table] = time.perf_counter() - start
+    return timings
+
+
+# --- Resume corpus ---
+def resume_text(rng, role, name):
+    """Lines of a plausible one- or two-page resume for ``role`` (a roles.json record)."""
+    keywords = rng.sample(role["keywords"], k=max(1, len(role["keywords"]) * 2 // 3))
+    lines = [name, f"{role['role']} | {name.lower().replace(' ', '.')}@example.com", "",
+             "SUMMARY", role["description"], "", "SKILLS", ", ".join(keywords), "", "EXPERIENCE"]
+    for job in range(rng.randint(2, 6)):
+        lines.append(f"{role['role']} - Company {rng.randint(1, 999)} ({2015 + job} - {2016 + job})")
+        for _ in range(rng.randint(2, 5)):
+            lines.append(f"- {sentence(rng, 8)[:-1]} using {rng.choice(keywords)}.")
+        lines.append("")
+    lines += ["EDUCATION", f"B.Sc. Example University, {rng.randint(2008, 2018)}"]
+    return lines
+
+
+def _write_pdf(path, lines, as_image=False):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    width, height = letter
+    pdf = canvas.Canvas(path, pagesize=letter)
+    if as_image:
+        # A scanned resume: one bitmap page with no text layer.
+        from PIL import Image, ImageDraw, ImageFont
+        from reportlab.lib.utils import ImageReader
+
+        image = Image.new("L", (1275, 1650), 255)
+        draw = ImageDraw.Draw(image)
+        font = ImageFont.load_default(size=22)
+        for n, line in enumerate(lines[:55]):
+            draw.text((90, 90 + n * 28), line[:90], fill=0, font=font)
+        pdf.drawImage(ImageReader(image), 0, 0, width=width, height=height)
+    else:
+        y = height - 72
+        for line in lines:
+            if y < 72:
+                pdf.showPage()
+                y = height - 72
+            pdf.drawString(72, y, line[:100])
+            y -= 14
+    pdf.save()
+
+
+def _write_docx(path, lines):
+    from docx import Document
+
+    doc = Document()
+    doc.add_heading(lines[0], level=1)
+    for line in lines[1:]:
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def write_resume_corpus(directory, count, seed=0, scanned_share=0.1):
+    """Write ``count`` resumes (alternating PDF and DOCX) under ``directory``.
+
+    About ``scanned_share`` of the PDFs are image-only, to exercise OCR.
+    Returns a list of dicts with ``path``, ``role``, ``kind`` and ``text``.
+    """
+    rng = random.Random(f"{seed}:resumes")
+    roles, _ = load_catalog()
+    os.makedirs(directory, exist_ok=True)
+    corpus = []
+    for i in range(count):
+        role = rng.choice(roles)
+        lines = resume_text(rng, role, f"Candidate {i}")
+        if i % 2:
+            kind = "docx"
+            path = os.path.join(directory, f"resume_{i:04d}.docx")
+            _write_docx(path, lines)
+        else:
+            kind = "scanned pdf" if rng.random() < scanned_share else "pdf"
+            path = os.path.join(directory, f"resume_{i:04d}.pdf")
+            _write_pdf(path, lines, as_image=kind == "scanned pdf")
+        corpus.append({"path": path, "role": role["role"], "kind": kind,
+                       "text": " ".join(lines).lower()})
+    return corpus
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", default="1k", help="Rows per table: 1k, 100k, 1m or a number")
+    parser.add_argument("--users", type=int, help="Distinct users (default: same as rows)")
+    parser.add_argument("--out", required=True, help="Directory to write into")
+    parser.add_argument("--resumes", type=int, default=0, help="Synthetic resumes to write")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rows = parse_scale(args.scale)
+    os.makedirs(args.out, exist_ok=True)
+    for table, seconds in generate_dataset(args.out, rows, users=args.users, seed=args.seed).items():
+        print(f"{storage.TABLES[table]['csv']:<30} {seconds:6.1f}s")
+    if args.resumes:
+        corpus = write_resume_corpus(os.path.join(args.out, "corpus"), args.resumes, seed=args.seed)
+        print(f"{len(corpus)} resumes -> {os.path.join(args.out, 'corpus')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import atexit
+import csv
+import io
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import tracing
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Held locks per thread, so nested file_lock() calls on one path don't deadlock.
+_held = threading.local()
+
+
+def _lock_path(path):
+    return path + ".lock"
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive inter-process lock for ``path`` (via a sidecar .lock file)."""
+    held = getattr(_held, "paths", None)
+    if held is None:
+        held = _held.paths = {}
+    key = os.path.abspath(path)
+    if held.get(key):
+        held[key] += 1
+        try:
+            yield
+        finally:
+            held[key] -= 1
+        return
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(_lock_path(path), "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.01)
+        held[key] = 1
+        try:
+            yield
+        finally:
+            held[key] = 0
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def read_header(path):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), None)
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) in (b"\n", b"\r")
+
+
+def _format_rows(rows, columns):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore", lineterminator=os.linesep)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+@tracing.traced("csv.append")
+def append_rows(path, rows, columns=None):
+    """Append ``rows`` (dicts) to a CSV in O(len(rows)), under the file lock.
+
+    New files get a header from ``columns`` (or the first row's keys). Rows
+    are written in the existing header's column order; a row carrying a
+    column the file doesn't have yet triggers a one-off atomic rewrite with
+    the widened header.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    with file_lock(path):
+        header = read_header(path)
+        if header is None:
+            header = list(columns or rows[0].keys())
+            for row in rows:
+                header.extend(k for k in row if k not in header)
+            rewrite_rows(path, rows, header)
+            return
+
+        new_columns = [k for row in rows for k in row if k not in header]
+        if new_columns:
+            widened = header + list(dict.fromkeys(new_columns))
+            rewrite_rows(path, read_rows(path) + rows, widened)
+            return
+
+        prefix = "" if _ends_with_newline(path) else os.linesep
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            f.write(prefix + _format_rows(rows, header))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def append_row(path, row, columns=None):
+    append_rows(path, [row], columns)
+
+
+@tracing.traced("csv.read")
+def read_rows(path):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return []
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+@tracing.traced("csv.rewrite")
+def rewrite_rows(path, rows, columns):
+    """Replace ``path`` atomically: write a temp file, fsync, then rename over it."""
+    directory = os.path.dirname(path) or "."
+    with file_lock(path):
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".csv")
+        try:
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore", lineterminator=os.linesep)
+                writer.writeheader()
+                writer.writerows(rows)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, os.stat(path).st_mode if os.path.exists(path) else 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def rewrite_frame(path, df):
+    """Atomic full rewrite of a pandas DataFrame (for rare whole-file updates)."""
+    records = df.astype(object).where(df.notna(), "").to_dict(orient="records")
+    rewrite_rows(path, records, list(df.columns))
+
+
+class BufferedWriter:
+    """Group commit: collects rows and appends them in one locked write.
+
+    Rows are flushed once ``max_rows`` are pending or ``max_delay`` seconds
+    after the first pending row, and at interpreter exit.
+    """
+
+    def __init__(self, path, columns=None, max_rows=100, max_delay=1.0):
+        self.path = path
+        self.columns = columns
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._pending = []
+        self._lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+
+    def append(self, row):
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.max_rows
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            rows, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if rows:
+            append_rows(self.path, rows, self.columns)
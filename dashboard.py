@@ -6,26 +6,18 @@ import streamlit as st
 
 from my_profile import show_profile, get_user_summary, get_profile_image, show_study_plan
 from resume_analyzer import show_resume_review
-from notifier import check_and_generate_notifications, show_notifications
+from notifier import show_notifications
 from dashboard_utils import show_profile_overview, show_progress_summary
+import aggregates
+from export import show_export
+import inbox
+from history_archive import read_history
 
-# Trigger notification generation on dashboard load
-check_and_generate_notifications()
-
-
-INTERVIEW_LOG = "data/interview_scores.csv"
 
 def show_interview_scores(username=None):
     st.subheader("🗂️ Mock Interview Feedback & Scores")
 
-    if not os.path.exists(INTERVIEW_LOG):
-        st.info("No interview scores have been saved yet.")
-        return
-
-    df = pd.read_csv(INTERVIEW_LOG)
-
-    if username:
-        df = df[df["Name"].str.lower() == username.lower()]
+    df = read_history("interview_scores", username or None)
 
     if df.empty:
         st.warning("No results found for this user.")
@@ -33,41 +25,45 @@ def show_interview_scores(username=None):
 
     st.dataframe(df[["Role", "Question", "Response", "Rating", "Feedback"]], use_container_width=True)
 
-    avg_score = df["Rating"].mean().round(2)
+    summary = aggregates.get_user_aggregates(username) if username else None
+    if summary and summary["mean_rating"] is not None:
+        avg_score = round(summary["mean_rating"], 2)
+    else:
+        avg_score = df["Rating"].mean().round(2)
     st.success(f"📊 Average Mock Rating: **{avg_score} / 5**")
 
     st.markdown("---")
-    st.download_button(
-        "📥 Download Your Interview Feedback",
-        data=df.to_csv(index=False),
-        file_name="interview_feedback.csv",
-        mime="text/csv"
-    )
+    st.markdown("📥 **Download Your History**")
+    if username:
+        show_export(username)
 
 def show_interview_summary(name_input):
     st.subheader("📝 Mock Interview Results")
 
-    file_path = "data/interview_scores.csv"
-    if not os.path.exists(file_path):
-        st.info("No interview results found yet.")
-        return
-
-    df = pd.read_csv(file_path)
-
     if name_input:
-        df = df[df["Name"].str.lower() == name_input.lower()]
-
-    if df.empty:
-        st.warning("No records found for this user.")
-        return
-
-    total_attempts = len(df)
-    avg_rating = round(df["Rating"].mean(), 2)
+        # Counts and averages are read from the aggregates kept at write time.
+        summary = aggregates.get_user_aggregates(name_input)
+        if not summary or not summary["interview_attempts"]:
+            st.warning("No records found for this user.")
+            return
+        total_attempts = summary["interview_attempts"]
+        avg_rating = round(summary["mean_rating"], 2)
+    else:
+        all_df = read_history("interview_scores", columns=["Rating"])
+        if all_df.empty:
+            st.warning("No records found for this user.")
+            return
+        total_attempts = len(all_df)
+        avg_rating = round(all_df["Rating"].mean(), 2)
 
     st.markdown(f"✅ **Total Attempts:** `{total_attempts}`")
     st.markdown(f"⭐ **Average Mock Rating:** `{avg_rating} / 5`")
 
-    with st.expander("📋 View Detailed Feedback"):
+    # Expander bodies run even when collapsed, so the free-text history is
+    # only read once the user asks for it.
+    if st.toggle("📋 Show detailed feedback", key="interview_summary_details"):
+        df = read_history("interview_scores", name_input or None,
+                          columns=["Role", "Question", "Response", "Feedback", "Rating"])
         st.dataframe(
             df[["Role", "Question", "Response", "Feedback", "Rating"]]
             .sort_values(by="Rating", ascending=False),
@@ -90,6 +86,10 @@ def show_dashboard(name_input):
         st.sidebar.markdown(f"👤 **{username.title()}**")
         st.sidebar.title(f"👋 Welcome, {username}")
 
+    unread = inbox.unread_count(username)
+    if unread:
+        st.sidebar.markdown(f"🔔 **{unread}** unread notification{'s' if unread != 1 else ''}")
+
     with st.expander("📈 Mock Interview Summary"):
         show_interview_summary(username)
 
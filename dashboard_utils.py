@@ -1,11 +1,9 @@
 import streamlit as st
 import pandas as pd
-import os
-import plotly.express as px
 
-DATA_DIR = "data"
-RESUME_FILE = os.path.join(DATA_DIR, "resume_scores.csv")
-INTERVIEW_FILE = os.path.join(DATA_DIR, "interview_scores.csv")
+import aggregates
+import progress_charts
+from history_archive import read_history
 
 def show_profile_overview(username):
     st.subheader("👤 Profile Overview")
@@ -20,20 +18,20 @@ def show_profile_overview(username):
 def show_progress_summary(username):
     st.subheader("📊 Progress Summary")
 
-    resume_df = load_user_resume_scores(username)
-    interview_df = load_user_interview_scores(username)
+    # Charts come from the pre-aggregated rollups, at a grain that fits the range.
+    range_name = st.selectbox("Time range", list(progress_charts.RANGES), index=len(progress_charts.RANGES) - 1,
+                              key="progress_range")
 
-    if not resume_df.empty:
+    fig = progress_charts.progress_figure(username, "resume", range_name, title="Resume Score Trend")
+    if fig is not None:
         st.markdown("### Resume Scores Over Time")
-        fig = px.line(resume_df, x="Date", y="Score", title="Resume Score Trend")
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No resume scores found.")
 
-    if not interview_df.empty:
+    fig = progress_charts.progress_figure(username, "interview", range_name, title="Interview Ratings")
+    if fig is not None:
         st.markdown("### Mock Interview Ratings")
-        fig = px.bar(interview_df, x="Question", y="Rating", color="Role",
-                     title="Interview Ratings", labels={"Rating": "Rating (out of 5)"})
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No interview responses found.")
@@ -41,33 +39,26 @@ def show_progress_summary(username):
 # --- Helpers ---
 
 
+# Summary numbers come from the per-user aggregates kept at write time.
 def get_latest_resume_score(username):
-    if not os.path.exists(RESUME_FILE):
+    summary = aggregates.get_user_aggregates(username)
+    if not summary or summary["latest_resume_score"] is None:
         return "N/A"
-    df = pd.read_csv(RESUME_FILE)
-    user_scores = df[df["Name"] == username]
-    if user_scores.empty:
-        return "N/A"
-    return user_scores.sort_values("Date", ascending=False)["Score"].iloc[0]
+    return summary["latest_resume_score"]
 
 def get_average_interview_rating(username):
-    if not os.path.exists(INTERVIEW_FILE):
-        return "N/A"
-    df = pd.read_csv(INTERVIEW_FILE)
-    user_scores = df[df["Name"] == username]
-    if user_scores.empty:
+    summary = aggregates.get_user_aggregates(username)
+    if not summary or summary["mean_rating"] is None:
         return "N/A"
-    return round(user_scores["Rating"].mean(), 1)
+    return round(summary["mean_rating"], 1)
 
 def load_user_resume_scores(username):
-    if not os.path.exists(RESUME_FILE):
-        return pd.DataFrame()
-    df = pd.read_csv(RESUME_FILE)
-    user_scores = df[df["Name"] == username]
-    return user_scores.sort_values("Date")
+    df = read_history("resume_scores", username)
+    # Older rows carry no timestamp; keep them in recording order ahead of dated ones.
+    df = df.rename(columns={"timestamp": "Date", "match_score": "Score"})
+    if "Date" not in df.columns:
+        df["Date"] = pd.NA
+    return df.sort_values("Date", na_position="first", kind="stable")
 
-def load_user_interview_scores(username):
-    if not os.path.exists(INTERVIEW_FILE):
-        return pd.DataFrame()
-    df = pd.read_csv(INTERVIEW_FILE)
-    return df[df["Name"] == username]
+def load_user_interview_scores(username, columns=None):
+    return read_history("interview_scores", username, columns=columns)
@@ -0,0 +1,89 @@
+import os
+import threading
+
+import pandas as pd
+
+import tracing
+
+# path -> parsed frame plus a per-username row index, kept until the file's
+# mtime or size changes. Shared by every session in the process.
+_cache = {}
+_lock = threading.Lock()
+_path_locks = {}
+_stats = {"parses": 0, "hits": 0}
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _entry(path):
+    signature = file_signature(path)
+    if signature is None or signature[1] == 0:
+        return None
+
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry["signature"] == signature:
+            _stats["hits"] += 1
+            return entry
+        path_lock = _path_locks.setdefault(path, threading.Lock())
+
+    # One parse per file version, even when several sessions miss at once.
+    with path_lock:
+        entry = _cache.get(path)
+        if entry is not None and entry["signature"] == signature:
+            return entry
+        with tracing.span("csv.read"):
+            frame = pd.read_csv(path)
+        entry = {"signature": signature, "frame": frame, "groups": {}}
+        with _lock:
+            _cache[path] = entry
+            _stats["parses"] += 1
+    return entry
+
+
+def load_frame(path):
+    """Whole file as a DataFrame (None when missing or empty).
+
+    The frame is shared between callers; copy it before modifying it.
+    """
+    entry = _entry(path)
+    return None if entry is None else entry["frame"]
+
+
+def user_frame(path, user_col, username):
+    """Rows of ``path`` whose ``user_col`` equals ``username``.
+
+    Returns None when the file is missing or has no such column, and an
+    empty frame when the user has no rows.
+    """
+    entry = _entry(path)
+    if entry is None or user_col not in entry["frame"].columns:
+        return None
+
+    frame = entry["frame"]
+    groups = entry["groups"].get(user_col)
+    if groups is None:
+        groups = frame.groupby(user_col, sort=False).indices
+        entry["groups"][user_col] = groups
+    positions = groups.get(username)
+    if positions is None:
+        return frame.iloc[0:0]
+    return frame.iloc[positions]
+
+
+def invalidate(path=None):
+    with _lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(path, None)
+
+
+def cache_stats():
+    return dict(_stats)
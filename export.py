@@ -0,0 +1,235 @@
+"""Export of one user's history: interview results, resume scores and profile.
+
+Every format is produced by a generator of byte chunks that reads the
+history a batch at a time, so memory use doesn't grow with the history.
+The app writes the stream to a temporary file only when the user asks for
+an export and deletes it once downloaded, replaced or stale; the CLI writes
+it straight to disk:
+
+    python export.py alice --format zip --output alice.zip
+"""
+import argparse
+import atexit
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+
+import pandas as pd
+import streamlit as st
+
+import storage
+from history_archive import iter_history
+
+HISTORY_TABLES = ("interview_scores", "resume_scores")
+PROFILE_TABLES = ("users", "user_info")
+# Never leave the store.
+PRIVATE_COLUMNS = {"users": {"password"}}
+
+# Prepared exports live here until downloaded; files older than EXPORT_TTL seconds
+# (e.g. from sessions that ended without a download) are swept on the next export.
+EXPORT_DIR = os.environ.get("PREPVAULT_EXPORT_DIR", os.path.join(tempfile.gettempdir(), "prepvault-exports"))
+EXPORT_TTL = int(os.environ.get("PREPVAULT_EXPORT_TTL", "3600"))
+
+_created = set()
+_created_lock = threading.Lock()
+
+FORMATS = {
+    "CSV (interview results)": {"ext": "csv", "mime": "text/csv"},
+    "JSON Lines (everything)": {"ext": "jsonl", "mime": "application/x-ndjson"},
+    "Zip bundle (everything)": {"ext": "zip", "mime": "application/zip"},
+}
+
+
+def _export_columns(table):
+    return [c for c in storage.columns(table) if c not in PRIVATE_COLUMNS.get(table, ())]
+
+
+def iter_chunks(username, table):
+    """DataFrame chunks of ``table`` for ``username`` (archive included), oldest first."""
+    columns = _export_columns(table)
+    if table in HISTORY_TABLES:
+        yield from iter_history(table, username, columns=columns)
+    else:
+        for chunk in storage.iter_user_rows(table, username):
+            yield chunk.reindex(columns=columns)
+
+
+def _clean(value):
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+# --- Formats ---
+def iter_csv(username, table):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(_export_columns(table))
+    for chunk in iter_chunks(username, table):
+        writer.writerows(chunk.astype(object).where(chunk.notna(), "").itertuples(index=False, name=None))
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def iter_jsonl(username, tables=HISTORY_TABLES + PROFILE_TABLES):
+    for table in tables:
+        columns = _export_columns(table)
+        for chunk in iter_chunks(username, table):
+            lines = []
+            for row in chunk.itertuples(index=False, name=None):
+                record = {"table": table}
+                record.update((c, _clean(v)) for c, v in zip(columns, row))
+                lines.append(json.dumps(record, ensure_ascii=False))
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable stream whose bytes are collected and handed out
+    by ``drain``; lets ``zipfile`` produce an archive incrementally."""
+
+    def __init__(self):
+        self._parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def iter_zip(username):
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for table in HISTORY_TABLES + PROFILE_TABLES:
+            with archive.open(f"{table}.csv", "w") as member:
+                for data in iter_csv(username, table):
+                    member.write(data)
+                    yield sink.drain()
+    yield sink.drain()
+
+
+def iter_export(username, fmt):
+    ext = FORMATS[fmt]["ext"]
+    if ext == "csv":
+        return iter_csv(username, "interview_scores")
+    if ext == "jsonl":
+        return iter_jsonl(username)
+    return iter_zip(username)
+
+
+def write_export(username, fmt, fileobj):
+    for data in iter_export(username, fmt):
+        if data:
+            fileobj.write(data)
+
+
+# --- Temporary files ---
+def remove_export(path):
+    with _created_lock:
+        _created.discard(path)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def sweep_exports(max_age=EXPORT_TTL):
+    """Delete prepared exports older than ``max_age`` seconds; returns how many."""
+    if not os.path.isdir(EXPORT_DIR):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                remove_export(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+@atexit.register
+def _remove_created():
+    with _created_lock:
+        paths = list(_created)
+    for path in paths:
+        remove_export(path)
+
+
+def export_to_file(username, fmt):
+    """Write the export to a temporary file and return its path."""
+    sweep_exports()
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    prefix = re.sub(r"[^\w.-]", "_", username)
+    fd, path = tempfile.mkstemp(dir=EXPORT_DIR, prefix=f"prepvault-{prefix}-", suffix="." + FORMATS[fmt]["ext"])
+    with _created_lock:
+        _created.add(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write_export(username, fmt, f)
+    except BaseException:
+        remove_export(path)
+        raise
+    return path
+
+
+# --- UI ---
+def _discard_prepared(state_key):
+    prepared = st.session_state.pop(state_key, None)
+    if prepared:
+        remove_export(prepared[1])
+
+
+def show_export(username, key="export"):
+    """Format picker plus a download that is only built when asked for."""
+    fmt = st.selectbox("Export format", list(FORMATS), key=f"{key}_format")
+    state_key = f"{key}_file"
+    if st.button("📦 Prepare export", key=f"{key}_prepare"):
+        _discard_prepared(state_key)
+        st.session_state[state_key] = (fmt, export_to_file(username, fmt))
+
+    prepared = st.session_state.get(state_key)
+    if prepared and prepared[0] == fmt and os.path.exists(prepared[1]):
+        with open(prepared[1], "rb") as f:
+            st.download_button(
+                "📥 Download export",
+                data=f,
+                file_name=f"{username}_prepvault.{FORMATS[fmt]['ext']}",
+                mime=FORMATS[fmt]["mime"],
+                key=f"{key}_download",
+                on_click=_discard_prepared,
+                args=(state_key,),
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export one PrepVault user's history")
+    parser.add_argument("username")
+    parser.add_argument("--format", choices=["csv", "jsonl", "zip"], default="zip")
+    parser.add_argument("--output", help="Output file (default: <username>.<format>)")
+    args = parser.parse_args(argv)
+
+    fmt = next(name for name, spec in FORMATS.items() if spec["ext"] == args.format)
+    output = args.output or f"{args.username}.{args.format}"
+    with open(output, "wb") as f:
+        write_export(args.username, fmt, f)
+    print(f"Wrote {output} ({os.path.getsize(output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
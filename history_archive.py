@@ -0,0 +1,251 @@
+"""Monthly Parquet archive for the interview and resume logs.
+
+Compaction moves rows older than the hot window out of the append-only CSV
+into ``data/archive/<table>/month=YYYY-MM/`` Parquet files, sorted by user so
+row-group statistics can skip other users. Each run stages its files under
+``.staging/`` (ignored by dataset discovery) and only moves them into the
+archive after the CSV rewrite has succeeded, so a crash or a re-run never
+archives the same rows twice. ``read_history`` reads the archive
+and the hot log as one frame, pushing the column list and the username and
+date filters down to the Parquet scan.
+
+    python history_archive.py compact --keep-days 31
+"""
+import argparse
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import storage
+import tracing
+from csv_store import file_lock, rewrite_frame
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # archive disabled; reads fall back to the hot log only
+    pa = None
+    ds = None
+
+ARCHIVE_ROOT = os.environ.get("PREPVAULT_ARCHIVE_DIR", os.path.join("data", "archive"))
+ARCHIVED_TABLES = ("interview_scores", "resume_scores")
+ROWS_PER_GROUP = 8192
+PARTITION_COLUMN = "month"
+
+
+def archive_dir(table):
+    return os.path.join(ARCHIVE_ROOT, table)
+
+
+def _schema(table):
+    types = {"TEXT": pa.string(), "REAL": pa.float64(), "INTEGER": pa.int64()}
+    fields = [(c, types[t]) for c, t in storage.TABLES[table]["columns"].items()]
+    return pa.schema(fields + [(PARTITION_COLUMN, pa.string())])
+
+
+def _partitioning():
+    return ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive")
+
+
+def has_archive(table):
+    path = archive_dir(table)
+    return ds is not None and os.path.isdir(path) and any(not e.name.startswith(".") for e in os.scandir(path))
+
+
+# --- Reads ---
+def read_archive(table, username=None, columns=None, start=None, end=None):
+    """Archived rows as a DataFrame, or None when nothing is archived.
+
+    ``start``/``end`` are inclusive "YYYY-MM-DD[ HH:MM:SS]" strings.
+    """
+    if not has_archive(table):
+        return None
+    spec = storage.TABLES[table]
+    user_col, time_col = spec["user_col"], spec["time_col"]
+
+    conditions = []
+    if username is not None:
+        conditions.append(ds.field(user_col) == username)
+    if start:
+        conditions += [ds.field(PARTITION_COLUMN) >= start[:7], ds.field(time_col) >= start]
+    if end:
+        conditions += [ds.field(PARTITION_COLUMN) <= end[:7], ds.field(time_col) <= end]
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    dataset = ds.dataset(archive_dir(table), format="parquet", partitioning=_partitioning())
+    wanted = columns or storage.columns(table)
+    present = [c for c in wanted if c in dataset.schema.names]
+    return dataset.to_table(columns=present, filter=expression).to_pandas().reindex(columns=wanted)
+
+
+def _filter_hot(df, table, columns, start, end):
+    time_col = storage.TABLES[table]["time_col"]
+    if (start or end) and time_col in df.columns:
+        stamps = df[time_col].astype("string")
+        mask = pd.Series(True, index=df.index)
+        if start:
+            mask &= stamps >= start
+        if end:
+            mask &= stamps <= end
+        df = df[mask.fillna(False)]
+    if columns:
+        df = df.reindex(columns=columns)
+    return df
+
+
+def read_history(table, username=None, columns=None, start=None, end=None):
+    """Archived and hot rows of ``table`` as one frame, oldest first."""
+    hot = storage.user_rows(table, username) if username is not None else storage.all_rows(table)
+    hot = _filter_hot(hot, table, columns, start, end)
+
+    archived = read_archive(table, username, columns, start, end)
+    if archived is None or archived.empty:
+        return hot.reset_index(drop=True)
+    if hot.empty:
+        return archived
+    return pd.concat([archived, hot], ignore_index=True)
+
+
+def iter_history(table, username, columns=None, batch_size=ROWS_PER_GROUP):
+    """``read_history`` for one user as DataFrame chunks, oldest first, so a
+    long history can be processed without holding all of it."""
+    wanted = columns or storage.columns(table)
+    if has_archive(table):
+        dataset = ds.dataset(archive_dir(table), format="parquet", partitioning=_partitioning())
+        present = [c for c in wanted if c in dataset.schema.names]
+        # Month directories sort chronologically, and within a month each
+        # compaction's file holds later rows than the ones written before it.
+        fragments = sorted(dataset.get_fragments(), key=lambda f: (os.path.dirname(f.path), os.path.getmtime(f.path)))
+        for fragment in fragments:
+            for batch in fragment.to_batches(columns=present, batch_size=batch_size,
+                                             filter=ds.field(storage.TABLES[table]["user_col"]) == username):
+                if batch.num_rows:
+                    yield batch.to_pandas().reindex(columns=wanted)
+    for chunk in storage.iter_user_rows(table, username, batch_size):
+        yield chunk.reindex(columns=wanted)
+
+
+# --- Compaction ---
+def _staging_dir(table):
+    return os.path.join(archive_dir(table), ".staging")
+
+
+def _manifest_path(table):
+    return os.path.join(_staging_dir(table), "manifest.json")
+
+
+def _has_rows_before(df, time_col, cutoff):
+    return time_col in df.columns and bool((df[time_col].astype("string") < cutoff).fillna(False).any())
+
+
+def _publish(table, run_dir):
+    """Move staged partition files into the archive (safe to repeat)."""
+    for root, _, files in os.walk(run_dir):
+        target = os.path.join(archive_dir(table), os.path.relpath(root, run_dir))
+        os.makedirs(target, exist_ok=True)
+        for name in files:
+            os.replace(os.path.join(root, name), os.path.join(target, name))
+
+
+def recover(table):
+    """Finish or discard a compaction that stopped part-way; call under the CSV lock.
+
+    Staged files without a manifest never finished writing. With a manifest,
+    the run's CSV rewrite happened exactly when the hot log no longer holds
+    rows older than the run's cutoff: then the files are published,
+    otherwise they are dropped and the rows stay hot.
+    """
+    staging = _staging_dir(table)
+    if not os.path.isdir(staging):
+        return
+    if os.path.exists(_manifest_path(table)):
+        with open(_manifest_path(table), encoding="utf-8") as f:
+            manifest = json.load(f)
+        spec = storage.TABLES[table]
+        hot = pd.read_csv(spec["csv"]) if os.path.exists(spec["csv"]) and os.path.getsize(spec["csv"]) else None
+        if hot is None or not _has_rows_before(hot, spec["time_col"], manifest["cutoff"]):
+            _publish(table, os.path.join(staging, manifest["run_id"]))
+    shutil.rmtree(staging)
+
+
+def compact(table, keep_days=31, now=None):
+    """Move rows older than ``keep_days`` from the CSV log into the archive.
+
+    Returns the number of rows archived. Rows without a timestamp stay hot.
+    """
+    if ds is None:
+        raise RuntimeError("pyarrow is required to compact history: pip install pyarrow")
+    if storage.BACKEND != "csv":
+        raise RuntimeError("Compaction applies to the CSV backend; SQLite reads are already indexed.")
+
+    spec = storage.TABLES[table]
+    time_col = spec["time_col"]
+    cutoff = ((now or datetime.now()) - timedelta(days=keep_days)).strftime("%Y-%m-%d %H:%M:%S")
+
+    with file_lock(spec["csv"]):
+        recover(table)
+        if not os.path.exists(spec["csv"]) or os.path.getsize(spec["csv"]) == 0:
+            return 0
+        with tracing.span("csv.read"):
+            df = pd.read_csv(spec["csv"])
+        if time_col not in df.columns:
+            return 0
+        stamps = df[time_col].astype("string")
+        old = (stamps < cutoff).fillna(False)
+        cold = df[old]
+        if cold.empty:
+            return 0
+
+        cold = cold.reindex(columns=storage.columns(table))
+        for column, sql_type in spec["columns"].items():
+            if sql_type == "TEXT":
+                cold[column] = cold[column].astype("string")
+            else:
+                cold[column] = pd.to_numeric(cold[column], errors="coerce")
+        cold[PARTITION_COLUMN] = cold[time_col].str[:7]
+        cold = cold.sort_values([spec["user_col"], time_col], kind="stable")
+
+        # Stage the files, record the run, drop the rows from the hot log, then
+        # publish. recover() resolves a crash at any point in between.
+        run_id = uuid.uuid4().hex
+        run_dir = os.path.join(_staging_dir(table), run_id)
+        ds.write_dataset(
+            pa.Table.from_pandas(cold, schema=_schema(table), preserve_index=False),
+            run_dir,
+            format="parquet",
+            partitioning=_partitioning(),
+            basename_template=f"part-{run_id}-{{i}}.parquet",
+            max_rows_per_group=ROWS_PER_GROUP,
+        )
+        manifest_tmp = _manifest_path(table) + ".tmp"
+        with open(manifest_tmp, "w", encoding="utf-8") as f:
+            json.dump({"run_id": run_id, "cutoff": cutoff, "rows": len(cold)}, f)
+        os.replace(manifest_tmp, _manifest_path(table))
+
+        rewrite_frame(spec["csv"], df[~old])
+        _publish(table, run_dir)
+        shutil.rmtree(_staging_dir(table))
+    return len(cold)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive old PrepVault history into Parquet")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("compact", help="Move rows older than the hot window into the archive")
+    cmd.add_argument("--table", choices=ARCHIVED_TABLES, action="append",
+                     help="Table to compact (default: all archived tables)")
+    cmd.add_argument("--keep-days", type=int, default=31, help="Days of history kept in the CSV log")
+    args = parser.parse_args(argv)
+
+    for table in args.table or ARCHIVED_TABLES:
+        print(f"{table}: archived {compact(table, keep_days=args.keep_days)} rows")
+
+
+if __name__ == "__main__":
+    main()
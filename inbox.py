@@ -0,0 +1,170 @@
+"""Per-user notification inbox.
+
+Notifications live in the SQLite database next to the aggregates, indexed by
+(username, id) so a user's page is a short index range scan. Unread counts
+are kept in their own table and updated alongside every insert, read and
+prune, so the sidebar badge is a single keyed lookup.
+
+    python inbox.py prune --days 90
+"""
+import argparse
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+import storage
+
+PAGE_SIZE = 20
+
+_local = threading.local()
+_ready = False
+_ready_lock = threading.Lock()
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS notifications (
+        id INTEGER PRIMARY KEY,
+        username TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        message TEXT NOT NULL,
+        is_read INTEGER NOT NULL DEFAULT 0
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_notifications_user ON notifications (username, id)",
+    "CREATE INDEX IF NOT EXISTS ix_notifications_created ON notifications (created_at)",
+    """CREATE TABLE IF NOT EXISTS notification_unread (
+        username TEXT PRIMARY KEY,
+        unread INTEGER NOT NULL DEFAULT 0
+    )""",
+]
+
+COLUMNS = ["id", "username", "created_at", "message", "is_read"]
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _connect():
+    global _ready
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(storage.DB_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+    if not _ready:
+        with _ready_lock:
+            if not _ready:
+                with conn:
+                    for statement in SCHEMA:
+                        conn.execute(statement)
+                _ready = True
+    return conn
+
+
+def _bump_unread(conn, counts):
+    conn.executemany(
+        """INSERT INTO notification_unread (username, unread) VALUES (?, ?)
+           ON CONFLICT(username) DO UPDATE SET unread = max(0, unread + excluded.unread)""",
+        list(counts.items()))
+
+
+# --- Writes ---
+def add_many(notes, conn=None):
+    """Insert ``(username, message)`` or ``(username, message, created_at)``
+    tuples in one transaction; returns how many were added.
+
+    With ``conn`` (a connection to the same database) the rows join the
+    caller's transaction and are committed with it.
+    """
+    now = _now()
+    rows = [(n[0], n[2] if len(n) > 2 else now, n[1]) for n in notes]
+    if not rows:
+        return 0
+    own = _connect()
+    if conn is None:
+        with own:
+            _insert(own, rows)
+    else:
+        _insert(conn, rows)
+    return len(rows)
+
+
+def _insert(conn, rows):
+    conn.executemany("INSERT INTO notifications (username, created_at, message) VALUES (?, ?, ?)", rows)
+    _bump_unread(conn, Counter(row[0] for row in rows))
+
+
+def add(username, message):
+    add_many([(username, message)])
+
+
+def mark_read(username, ids=None):
+    """Mark ``ids`` (default: everything) read for ``username``; returns how many changed."""
+    conn = _connect()
+    with conn:
+        if ids is None:
+            changed = conn.execute("UPDATE notifications SET is_read = 1 WHERE username = ? AND is_read = 0",
+                                   (username,)).rowcount
+        else:
+            changed = conn.executemany(
+                "UPDATE notifications SET is_read = 1 WHERE username = ? AND id = ? AND is_read = 0",
+                [(username, i) for i in ids]).rowcount
+        if changed:
+            _bump_unread(conn, {username: -changed})
+    return changed
+
+
+def prune(days=90, now=None):
+    """Delete notifications older than ``days``; returns how many were removed."""
+    cutoff = ((now or datetime.now()) - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+    conn = _connect()
+    with conn:
+        unread = conn.execute(
+            "SELECT username, count(*) FROM notifications WHERE created_at < ? AND is_read = 0 GROUP BY username",
+            (cutoff,)).fetchall()
+        removed = conn.execute("DELETE FROM notifications WHERE created_at < ?", (cutoff,)).rowcount
+        _bump_unread(conn, {user: -count for user, count in unread})
+    return removed
+
+
+# --- Reads ---
+def unread_count(username):
+    row = _connect().execute("SELECT unread FROM notification_unread WHERE username = ?", (username,)).fetchone()
+    return row[0] if row else 0
+
+
+def page(username, before=None, limit=PAGE_SIZE, unread_only=False):
+    """Newest-first page of ``username``'s notifications.
+
+    Returns ``(items, cursor)``; pass ``cursor`` as ``before`` for the next
+    page. ``cursor`` is None on the last page.
+    """
+    where = "username = ?"
+    params = [username]
+    if before is not None:
+        where += " AND id < ?"
+        params.append(before)
+    if unread_only:
+        where += " AND is_read = 0"
+    rows = _connect().execute(
+        f"SELECT {', '.join(COLUMNS)} FROM notifications WHERE {where} ORDER BY id DESC LIMIT ?",
+        params + [limit + 1]).fetchall()
+    items = [dict(zip(COLUMNS, row)) for row in rows[:limit]]
+    cursor = items[-1]["id"] if len(rows) > limit else None
+    return items, cursor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the PrepVault notification inbox")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("prune", help="Delete old notifications")
+    cmd.add_argument("--days", type=int, default=90, help="Keep notifications newer than this")
+    args = parser.parse_args(argv)
+
+    if args.command == "prune":
+        print(f"Removed {prune(args.days)} notification(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import re
+
+# Words, keeping trailing symbols that are part of skill names ("c++", "c#").
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[+#]+)?")
+
+
+def _normalize(token):
+    # Light plural folding so "dashboards" matches "dashboard"; applied to
+    # keywords and resume text alike.
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [_normalize(t) for t in TOKEN_PATTERN.findall(text.lower())]
+
+
+class KeywordMatcher:
+    """Whole-word matcher for the keywords of every role at once.
+
+    Keywords are stored as normalized token n-grams in one dict, so a single
+    pass over the resume tokens finds every keyword of every role with one
+    hash lookup per (position, n-gram length). Cost grows with the resume
+    length and the longest keyword, not with the number of keywords.
+    """
+
+    def __init__(self, role_keywords):
+        self.role_keywords = {role: list(keywords) for role, keywords in role_keywords.items()}
+        self._phrases = {}
+        self.max_words = 1
+        for role, keywords in self.role_keywords.items():
+            for keyword in keywords:
+                key = tuple(tokenize(keyword))
+                if not key:
+                    continue
+                self._phrases.setdefault(key, set()).add(keyword)
+                self.max_words = max(self.max_words, len(key))
+
+    def find(self, text):
+        """Return the set of keywords (as written in the catalog) present in ``text``."""
+        tokens = tokenize(text)
+        found = set()
+        for i in range(len(tokens)):
+            for n in range(1, min(self.max_words, len(tokens) - i) + 1):
+                keywords = self._phrases.get(tuple(tokens[i:i + n]))
+                if keywords:
+                    found.update(keywords)
+        return found
+
+    def coverage(self, text, found=None):
+        """Per-role hits, misses and coverage ratio from one pass over ``text``."""
+        if found is None:
+            found = self.find(text)
+        result = {}
+        for role, keywords in self.role_keywords.items():
+            hits = [kw for kw in keywords if kw in found]
+            missing = [kw for kw in keywords if kw not in found]
+            result[role] = {
+                "hits": hits,
+                "missing": missing,
+                "ratio": len(hits) / len(keywords) if keywords else 0.0,
+            }
+        return result
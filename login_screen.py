@@ -1,5 +1,6 @@
 import streamlit as st
 from auth import login, signup
+import activity
 
 def show_login():
     st.subheader("🔐 Login or Sign Up")
@@ -15,6 +16,7 @@ def show_login():
             success, msg = login(username, password)
             if success:
                 st.session_state.username = username
+                activity.log_event(username, activity.LOGIN)
                 st.success(f"✅ {msg} Welcome back, {username}!")
             else:
                 st.error(f"❌ {msg}")
@@ -33,5 +35,6 @@ def show_login():
                 if success:
                     st.success(f"🎉 {msg} You can now log in.")
                     st.session_state.username = new_user
+                    activity.log_event(new_user, activity.SIGNUP)
                 else:
                     st.warning(f"⚠️ {msg}")
@@ -0,0 +1,97 @@
+import logging
+import os
+import threading
+import time
+
+import tracing
+
+# --- Settings ---
+MODEL_NAME = os.environ.get("PREPVAULT_MODEL_NAME", "all-MiniLM-L6-v2")
+# Empty (the default) lets sentence-transformers pick: cuda when available, else cpu.
+MODEL_DEVICE = os.environ.get("PREPVAULT_MODEL_DEVICE", "")
+# torch intra-op threads; 0 keeps torch's default (one per core).
+TORCH_THREADS = int(os.environ.get("PREPVAULT_TORCH_THREADS", "0"))
+WARMUP_ENABLED = os.environ.get("PREPVAULT_MODEL_WARMUP", "1") == "1"
+
+logger = logging.getLogger("prepvault.model")
+
+# One model per process, shared by every Streamlit session.
+_model = None
+_lock = threading.Lock()
+_warmup_thread = None
+# Separate from _lock, which is held for the whole model load.
+_warmup_lock = threading.Lock()
+_stats = {
+    "model": MODEL_NAME,
+    "device": MODEL_DEVICE or "auto",
+    "torch_threads": TORCH_THREADS or "default",
+    "load_seconds": None,
+    "warmup_seconds": None,
+    "first_request_seconds": None,
+}
+
+
+def _load_model():
+    start = time.perf_counter()
+    import torch
+    if TORCH_THREADS > 0:
+        torch.set_num_threads(TORCH_THREADS)
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(MODEL_NAME, device=MODEL_DEVICE or None)
+    _stats["load_seconds"] = round(time.perf_counter() - start, 3)
+    logger.info("Loaded %s on %s in %.2fs", MODEL_NAME, _stats["device"], _stats["load_seconds"])
+    return model
+
+
+def get_model():
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                _model = _load_model()
+    return _model
+
+
+@tracing.traced("model.encode")
+def encode(texts, **kwargs):
+    if _stats["first_request_seconds"] is not None:
+        return get_model().encode(texts, **kwargs)
+
+    # First real request: includes any wait on a load that is still in flight.
+    start = time.perf_counter()
+    embeddings = get_model().encode(texts, **kwargs)
+    if _stats["first_request_seconds"] is None:
+        _stats["first_request_seconds"] = round(time.perf_counter() - start, 3)
+        logger.info("First encode request served in %.2fs", _stats["first_request_seconds"])
+    return embeddings
+
+
+def _warm_up():
+    start = time.perf_counter()
+    try:
+        get_model().encode("warm-up", show_progress_bar=False)
+    except Exception:
+        logger.exception("Model warm-up failed")
+        return
+    _stats["warmup_seconds"] = round(time.perf_counter() - start, 3)
+    logger.info("Model warm-up finished in %.2fs", _stats["warmup_seconds"])
+
+
+def start_warmup():
+    """Load and exercise the model on a background thread (idempotent)."""
+    global _warmup_thread
+    if not WARMUP_ENABLED or _model is not None or _warmup_thread is not None:
+        return
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm_up, name="model-warmup", daemon=True)
+            _warmup_thread.start()
+
+
+def is_loaded():
+    return _model is not None
+
+
+def get_model_stats():
+    return dict(_stats)
@@ -2,23 +2,25 @@ import streamlit as st
 import pandas as pd
 import os
 
+import activity
+import storage
+
 # --- Constants ---
 RESUME_SUMMARY_FILE = "resumes/resume_scores.csv"
 PROFILE_IMG_DIR = "profile_images"
 USER_INFO_FILE = "user_info.csv"
 
 # --- Ensure directories and files exist ---
-os.makedirs(PROFILE_IMG_DIR, exist_ok=True)
-if not os.path.exists(USER_INFO_FILE):
-    pd.DataFrame(columns=["username", "email", "location", "bio"]).to_csv(USER_INFO_FILE, index=False)
+# Run once per process by screens.run_init before the screen first renders.
+def init():
+    os.makedirs(PROFILE_IMG_DIR, exist_ok=True)
+    if storage.BACKEND == "csv" and not os.path.exists(USER_INFO_FILE):
+        pd.DataFrame(columns=storage.columns("user_info")).to_csv(USER_INFO_FILE, index=False)
 
 
 # --- Utility Functions ---
 def load_user_resume_summary(username):
-    if os.path.exists(RESUME_SUMMARY_FILE):
-        df = pd.read_csv(RESUME_SUMMARY_FILE)
-        return df[df["username"] == username]
-    return pd.DataFrame()
+    return storage.user_rows("resume_scores", username)
 
 
 def generate_study_plan(missing_keywords):
@@ -48,21 +50,16 @@ def get_profile_image(username):
 
 
 def get_user_summary(username):
-    if not os.path.exists(USER_INFO_FILE):
-        return ""
-    df = pd.read_csv(USER_INFO_FILE)
-    user = df[df["username"] == username]
-    return user.iloc[0].get("bio", "") if not user.empty else ""
+    user = storage.get_user("user_info", username)
+    return user.get("bio", "") if user else ""
 
 
 # --- Profile View ---
 def show_profile(username):
     st.markdown("### ✏️ Edit Profile")
-    df = pd.read_csv(USER_INFO_FILE)
-    user_row = df[df["username"] == username]
+    user_info = storage.get_user("user_info", username)
 
-    if not user_row.empty:
-        user_info = user_row.iloc[0]
+    if user_info:
         email = st.text_input("Email", user_info.get("email", ""))
         location = st.text_input("Location", user_info.get("location", ""))
         bio = st.text_area("Short Bio", user_info.get("bio", ""))
@@ -72,10 +69,8 @@ def show_profile(username):
         bio = st.text_area("Short Bio")
 
     if st.button("💾 Save Profile"):
-        updated = pd.DataFrame([{"username": username, "email": email, "location": location, "bio": bio}])
-        df = df[df["username"] != username]
-        df = pd.concat([df, updated], ignore_index=True)
-        df.to_csv(USER_INFO_FILE, index=False)
+        storage.upsert("user_info", {"username": username, "email": email, "location": location, "bio": bio})
+        activity.log_event(username, activity.PROFILE_SAVED)
         st.success("✅ Profile updated successfully!")
 
     # --- Profile Image ---
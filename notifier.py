@@ -1,67 +1,200 @@
+"""Inactivity notifications, generated incrementally.
+
+Each tick reads only the activity rows added since the stored watermark,
+folds them into a per-user last-seen/last-notified index, and notifies users
+whose last activity is older than the inactivity window and who haven't been
+notified since. Ticks run on a background scheduler inside the app, or from
+cron:
+
+    python notifier.py tick
+    python notifier.py run --interval 600
+"""
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+import time
 import pandas as pd
 import os
 from datetime import datetime, timedelta
 import streamlit as st
 import random
 
-ACTIVITY_FILE = "user_activity.csv"
-NOTIFICATION_FILE = "notifications.txt"
+import inbox
+import storage
+from csv_store import file_lock
+
+INACTIVE_DAYS = int(os.environ.get("PREPVAULT_INACTIVE_DAYS", "3"))
+TICK_INTERVAL = float(os.environ.get("PREPVAULT_NOTIFY_INTERVAL", "600"))
+SCHEDULER_ENABLED = os.environ.get("PREPVAULT_NOTIFY_SCHEDULER", "1") != "0"
+
+TEMPLATES = [
+    "👀 Hey {user}, we've missed you! Resume your career prep today!",
+    "🕒 {user}, it's been a while. How about a quick study session?",
+    "🚀 Ready to make progress again, {user}? Let's go!",
+    "📚 {user}, your growth journey is waiting. Jump back in!"
+]
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS notifier_users (
+        username TEXT PRIMARY KEY,
+        last_seen TEXT NOT NULL,
+        last_notified TEXT,
+        pending INTEGER NOT NULL DEFAULT 0
+    )""",
+    # pending = active since the last notification; a tick only scans these.
+    "CREATE INDEX IF NOT EXISTS ix_notifier_pending ON notifier_users (pending, last_seen)",
+    "CREATE TABLE IF NOT EXISTS notifier_meta (key TEXT PRIMARY KEY, value TEXT)",
+]
+
+_scheduler_thread = None
+_scheduler_lock = threading.Lock()
+
+
+def _format(moment):
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _connect():
+    conn = sqlite3.connect(storage.DB_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    with conn:
+        for statement in SCHEMA:
+            conn.execute(statement)
+    return conn
+
+
+def _watermark_key():
+    # Cursors are backend-specific, so each backend keeps its own watermark.
+    return f"watermark:{storage.BACKEND}"
+
+
+# --- Incremental ingest ---
+def ingest_activity(conn):
+    """Fold activity rows added since the watermark into notifier_users."""
+    row = conn.execute("SELECT value FROM notifier_meta WHERE key = ?", (_watermark_key(),)).fetchone()
+    df, cursor = storage.read_since("user_activity", json.loads(row[0]) if row else None)
+
+    latest = {}
+    if not df.empty:
+        stamps = pd.to_datetime(df["timestamp"], errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S")
+        seen = pd.DataFrame({"username": df["username"], "timestamp": stamps}).dropna()
+        seen = seen[seen["username"] != ""]
+        latest = seen.groupby("username", sort=False)["timestamp"].max().to_dict()
+
+    with conn:
+        conn.executemany(
+            """INSERT INTO notifier_users (username, last_seen, pending) VALUES (?, ?, 1)
+               ON CONFLICT(username) DO UPDATE SET
+                   last_seen = max(last_seen, excluded.last_seen),
+                   pending = CASE WHEN excluded.last_seen > coalesce(last_notified, '')
+                                  THEN 1 ELSE pending END""",
+            [(str(user), stamp) for user, stamp in latest.items()])
+        conn.execute("INSERT OR REPLACE INTO notifier_meta (key, value) VALUES (?, ?)",
+                     (_watermark_key(), json.dumps(cursor)))
+    return len(df)
+
+
+# --- Notification ---
+def notify_inactive(conn, now=None, inactive_days=INACTIVE_DAYS):
+    """Notify users idle for ``inactive_days`` once per idle spell; returns their names."""
+    now = now or datetime.now()
+    cutoff = _format(now - timedelta(days=inactive_days))
+    users = [r[0] for r in conn.execute(
+        "SELECT username FROM notifier_users WHERE pending = 1 AND last_seen < ?", (cutoff,))]
+    if not users:
+        return []
+
+    # One transaction, so a crash can't leave users notified but still pending.
+    with conn:
+        inbox.add_many([(user, random.choice(TEMPLATES).format(user=user), _format(now)) for user in users],
+                       conn=conn)
+        conn.executemany("UPDATE notifier_users SET pending = 0, last_notified = ? WHERE username = ?",
+                         [(_format(now), user) for user in users])
+    return users
+
+
+def tick(now=None):
+    """One ingest + notify pass; returns (activity rows read, users notified)."""
+    # One tick at a time across processes (app servers plus cron).
+    with file_lock(storage.DB_PATH):
+        conn = _connect()
+        try:
+            rows = ingest_activity(conn)
+            notified = notify_inactive(conn, now)
+        finally:
+            conn.close()
+    return rows, notified
+
 
 def check_and_generate_notifications():
-    # Ensure the activity file exists
-    if not os.path.exists(ACTIVITY_FILE) or os.stat(ACTIVITY_FILE).st_size == 0:
-        df = pd.DataFrame(columns=["username", "timestamp", "action"])
-        df.to_csv(ACTIVITY_FILE, index=False)
-        return  # No activity data yet
-
-    df = pd.read_csv(ACTIVITY_FILE)
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
-    recent_cutoff = datetime.now() - timedelta(days=3)
-
-    # Filter users with no activity in the last 3 days
-    latest_activity = df.sort_values("timestamp").drop_duplicates("username", keep="last")
-    inactive_users = latest_activity[latest_activity["timestamp"] < recent_cutoff]["username"].unique()
-
-    # Load previous notifications to avoid duplicates
-    existing_notes = []
-    if os.path.exists(NOTIFICATION_FILE):
-        with open(NOTIFICATION_FILE, "r") as f:
-            existing_notes = f.readlines()
-
-    # Create notification messages
-    templates = [
-        "👀 Hey {user}, we've missed you! Resume your career prep today!",
-        "🕒 {user}, it's been a while. How about a quick study session?",
-        "🚀 Ready to make progress again, {user}? Let's go!",
-        "📚 {user}, your growth journey is waiting. Jump back in!"
-    ]
-
-    new_notifications = []
-    for user in inactive_users:
-        if not any(user in note for note in existing_notes):
-            message = random.choice(templates).format(user=user)
-            new_notifications.append(message)
-
-    # Append new notifications
-    if new_notifications:
-        with open(NOTIFICATION_FILE, "a") as f:
-            for note in new_notifications:
-                f.write(note + "\n")
+    tick()
 
 
-def show_notifications(username):
-    if not os.path.exists(NOTIFICATION_FILE):
-        st.info("🔕 No new notifications.")
+# --- Scheduler ---
+def _run_forever(interval):
+    while True:
+        try:
+            tick()
+        except Exception:
+            logging.getLogger(__name__).exception("Notification tick failed")
+        time.sleep(interval)
+
+
+def start_scheduler(interval=None):
+    """Tick on a background thread for the life of the process (idempotent)."""
+    global _scheduler_thread
+    if not SCHEDULER_ENABLED:
         return
+    with _scheduler_lock:
+        if _scheduler_thread is None:
+            _scheduler_thread = threading.Thread(target=_run_forever, args=(interval or TICK_INTERVAL,),
+                                                 name="notifier", daemon=True)
+            _scheduler_thread.start()
 
-    with open(NOTIFICATION_FILE, "r") as f:
-        lines = f.readlines()
 
-    # Match only full username mentions
-    user_notifications = [line.strip() for line in lines if f"{username}" in line.split(" ")[-1]]
+def show_notifications(username):
+    cursor_key = f"notification_pages_{username}"
+    cursors = st.session_state.setdefault(cursor_key, [None])
 
-    if user_notifications:
-        for note in user_notifications:
-            st.success(note)
-    else:
+    unread = inbox.unread_count(username)
+    if unread and st.button(f"✔️ Mark all {unread} as read"):
+        inbox.mark_read(username)
+        st.rerun()
+
+    shown = 0
+    for before in cursors:
+        items, next_cursor = inbox.page(username, before=before)
+        for note in items:
+            text = f"{note['message']}  \n_{note['created_at']}_"
+            if note["is_read"]:
+                st.info(text)
+            else:
+                st.success(text)
+        shown += len(items)
+
+    if shown == 0:
         st.info("✅ You're all caught up!")
+    elif next_cursor is not None and st.button("Show older"):
+        cursors.append(next_cursor)
+        st.rerun()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate PrepVault inactivity notifications")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("tick", help="Process new activity and notify inactive users once")
+    run = sub.add_parser("run", help="Tick forever")
+    run.add_argument("--interval", type=float, default=TICK_INTERVAL, help="Seconds between ticks")
+    args = parser.parse_args(argv)
+
+    if args.command == "tick":
+        rows, notified = tick()
+        print(f"Read {rows} new activity row(s), notified {len(notified)} user(s)")
+    else:
+        _run_forever(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import tracing
+
+# --- Settings ---
+# Pages are first recognized at LOW_DPI; only pages whose mean word confidence
+# falls below MIN_CONFIDENCE are rendered again at HIGH_DPI.
+LOW_DPI = int(os.environ.get("PREPVAULT_OCR_LOW_DPI", "150"))
+HIGH_DPI = int(os.environ.get("PREPVAULT_OCR_HIGH_DPI", "300"))
+MIN_CONFIDENCE = float(os.environ.get("PREPVAULT_OCR_MIN_CONFIDENCE", "70"))
+MAX_PAGES = int(os.environ.get("PREPVAULT_OCR_MAX_PAGES", "10"))
+TIME_BUDGET = float(os.environ.get("PREPVAULT_OCR_TIME_BUDGET", "30"))
+# 0 runs OCR in the calling process, e.g. inside processes that are workers themselves.
+WORKERS = int(os.environ.get("PREPVAULT_OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+logger = logging.getLogger("prepvault.ocr")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The process-wide OCR pool, shared by every call; started on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=WORKERS)
+    return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def page_count(pdf_path):
+    from pdf2image import pdfinfo_from_path
+    return int(pdfinfo_from_path(pdf_path)["Pages"])
+
+
+def _render_page(pdf_path, page_number, dpi):
+    from pdf2image import convert_from_path
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number)
+    return images[0] if images else None
+
+
+def _recognize(image, timeout=0):
+    import pytesseract
+    # A non-zero timeout kills tesseract once it is spent (and raises RuntimeError).
+    data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT, timeout=timeout)
+
+    lines = {}
+    confidences = []
+    for i, word in enumerate(data["text"]):
+        conf = float(data["conf"][i])
+        if not word.strip() or conf < 0:
+            continue
+        line_key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(line_key, []).append(word)
+        confidences.append(conf)
+
+    text = "\n".join(" ".join(words) for words in lines.values())
+    confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return text, confidence
+
+
+def ocr_page(pdf_path, page_number, low_dpi=LOW_DPI, high_dpi=HIGH_DPI, min_confidence=MIN_CONFIDENCE,
+             time_limit=None):
+    # Runs inside a worker process: only this page's image is ever held in memory.
+    # ``time_limit`` seconds bound the tesseract runs, so a page can't outlive the caller's budget.
+    start = time.perf_counter()
+
+    def remaining():
+        return 0 if time_limit is None else time_limit - (time.perf_counter() - start)
+
+    dpi = low_dpi
+    image = _render_page(pdf_path, page_number, dpi)
+    if image is None:
+        return {"page": page_number, "text": "", "confidence": 0.0, "dpi": dpi,
+                "seconds": time.perf_counter() - start}
+    if time_limit is not None and remaining() <= 0:
+        raise TimeoutError(f"No time left to recognize page {page_number}")
+    text, confidence = _recognize(image, timeout=remaining())
+    del image
+
+    if confidence < min_confidence and high_dpi > low_dpi and (time_limit is None or remaining() > 0):
+        image = _render_page(pdf_path, page_number, high_dpi)
+        if image is not None:
+            try:
+                hi_text, hi_confidence = _recognize(image, timeout=max(remaining(), 0.001) if time_limit is not None else 0)
+            except RuntimeError:
+                # Out of time at the higher resolution; keep the first pass.
+                hi_text, hi_confidence = text, -1.0
+            del image
+            if hi_confidence >= confidence:
+                text, confidence, dpi = hi_text, hi_confidence, high_dpi
+
+    return {"page": page_number, "text": text, "confidence": round(confidence, 1), "dpi": dpi,
+            "seconds": time.perf_counter() - start}
+
+
+@tracing.traced("ocr.pdf")
+def _failed(pdf_path, page_number, error):
+    logger.warning("OCR failed for %s page %d", pdf_path, page_number, exc_info=error)
+    return {"page": page_number, "text": "", "confidence": 0.0, "dpi": None, "seconds": 0.0,
+            "error": f"{type(error).__name__}: {error}"}
+
+
+def _ocr_in_process(pdf_path, pages, deadline):
+    results = {}
+    for page_number in pages:
+        if time.monotonic() >= deadline:
+            logger.info("OCR time budget spent on %s; skipped pages %s", pdf_path,
+                        [p for p in pages if p not in results])
+            break
+        try:
+            results[page_number] = ocr_page(pdf_path, page_number, time_limit=deadline - time.monotonic())
+        except Exception as e:
+            results[page_number] = _failed(pdf_path, page_number, e)
+            continue
+        tracing.record("ocr.page", results[page_number]["seconds"])
+    return results
+
+
+@tracing.traced("ocr.pdf")
+def ocr_pdf(pdf_path, pages=None, max_pages=MAX_PAGES, time_budget=TIME_BUDGET, workers=None):
+    """OCR ``pages`` (1-based, default all) of a PDF through the shared process pool.
+
+    At most ``workers`` of this call's pages are in flight at once, so memory
+    holds at most that many rendered images. Pages beyond ``max_pages`` or
+    not finished within ``time_budget`` seconds are skipped; each page's
+    tesseract runs are limited to the budget left when it was queued.
+    Returns one result dict per page that finished, in page order; pages
+    that failed carry an ``error`` message and empty text. ``workers``
+    defaults to WORKERS; 0 runs the pages one by one in this process.
+    """
+    if pages is None:
+        pages = range(1, page_count(pdf_path) + 1)
+    pages = list(pages)[:max_pages]
+    if not pages:
+        return []
+
+    deadline = time.monotonic() + time_budget
+    workers = WORKERS if workers is None else workers
+    if workers <= 0:
+        results = _ocr_in_process(pdf_path, pages, deadline)
+        return [results[p] for p in pages if p in results]
+    workers = max(1, min(workers, len(pages)))
+    queue = iter(pages)
+    pending = {}
+    results = {}
+
+    pool = get_pool()
+    try:
+        while True:
+            while len(pending) < workers and time.monotonic() < deadline:
+                page_number = next(queue, None)
+                if page_number is None:
+                    break
+                future = pool.submit(ocr_page, pdf_path, page_number, time_limit=deadline - time.monotonic())
+                pending[future] = page_number
+            if not pending:
+                break
+
+            done, _ = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+            if not done:
+                break  # time budget spent
+            for future in done:
+                page_number = pending.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    results[page_number] = _failed(pdf_path, page_number, e)
+                    continue
+                results[page_number] = result
+                # Pages run in worker processes, so their timings are recorded here.
+                tracing.record("ocr.page", result["seconds"])
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory); the next call starts a fresh pool.
+        logger.exception("OCR pool broke while reading %s", pdf_path)
+        _discard_pool(pool)
+    finally:
+        # Queued pages are dropped; running ones stop at their own time limit.
+        for future in pending:
+            future.cancel()
+        if pending:
+            logger.info("OCR time budget spent on %s; skipped pages %s", pdf_path, sorted(pending.values()))
+
+    return [results[p] for p in pages if p in results]
+
+
+def ocr_pdf_text(pdf_path, **kwargs):
+    return "\n".join(r["text"] for r in ocr_pdf(pdf_path, **kwargs) if r["text"])
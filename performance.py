@@ -0,0 +1,60 @@
+import pandas as pd
+import streamlit as st
+
+import activity
+import auth
+import data_cache
+import model_provider
+import tracing
+
+# --- Constants ---
+TIME_COLUMNS = ["p50", "p95", "p99", "max", "mean"]
+
+
+def span_table():
+    rows = tracing.snapshot()
+    if not rows:
+        return pd.DataFrame(columns=["span", "count"] + [f"{c} (ms)" for c in TIME_COLUMNS] + ["total (s)"])
+    df = pd.DataFrame(rows)
+    for col in TIME_COLUMNS:
+        df[f"{col} (ms)"] = (df[col] * 1000).round(2)
+    df["total (s)"] = df["total"].round(3)
+    return df[["span", "count"] + [f"{c} (ms)" for c in TIME_COLUMNS] + ["total (s)"]]
+
+
+def show_performance(username):
+    if not auth.is_admin(username):
+        st.warning("This page is only available to admins.")
+        return
+
+    st.subheader("⏱️ Performance")
+    st.caption("Span timings for this server process. Percentiles are estimated from histogram buckets.")
+
+    enabled = st.toggle("Tracing enabled", value=tracing.is_enabled(),
+                        help="Applies to every session served by this process.")
+    if enabled != tracing.is_enabled():
+        tracing.enable(enabled)
+
+    df = span_table()
+    if df.empty:
+        st.info("No spans recorded yet." if enabled else "Turn tracing on to start recording spans.")
+    else:
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        st.bar_chart(df.set_index("span")[["p50 (ms)", "p95 (ms)", "p99 (ms)"]])
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("💾 Write Prometheus file"):
+            st.success(f"Wrote {tracing.write_prometheus()}")
+    with col2:
+        st.download_button("📥 Download metrics", data=tracing.to_prometheus(),
+                           file_name="prepvault_metrics.prom", mime="text/plain")
+    with col3:
+        if st.button("🧹 Reset histograms"):
+            tracing.reset()
+            st.rerun()
+
+    with st.expander("Process stats"):
+        st.write("**Parse cache**", data_cache.cache_stats())
+        st.write("**Embedding model**", model_provider.get_model_stats())
+        st.write("**Activity log**", activity.get_stats())
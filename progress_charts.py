@@ -0,0 +1,115 @@
+"""Progress charts served from the score rollups in ``aggregates``.
+
+Each chart reads the day, week or month rollup, whichever keeps the visible
+range under ``MAX_POINTS`` buckets, and plots at most ``MAX_ROLES`` series,
+so the figure sent to the browser has a fixed upper size however long the
+history is. Built figures are cached per user, range and data version;
+callers get their own copy, since the cache is shared by every session.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+import aggregates
+
+MAX_POINTS = 120
+MAX_ROLES = 6
+FIGURE_CACHE_SIZE = 256
+
+RANGES = {"Last 30 days": 30, "Last 90 days": 90, "Last year": 365, "All time": None}
+METRICS = {
+    "resume": {"label": "Match Score (%)", "version_field": "resume_count"},
+    "interview": {"label": "Rating (out of 5)", "version_field": "interview_attempts"},
+}
+
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+
+
+def choose_grain(start, end):
+    """Finest grain that keeps ``start``..``end`` (dates) within MAX_POINTS buckets."""
+    days = (end - start).days + 1
+    if days <= MAX_POINTS:
+        return "day"
+    if days <= MAX_POINTS * 7:
+        return "week"
+    return "month"
+
+
+def visible_range(username, metric, range_name, today=None):
+    today = today or date.today()
+    days = RANGES[range_name]
+    if days is not None:
+        return today - timedelta(days=days - 1), today
+    first = aggregates.first_bucket(username, metric)
+    start = datetime.strptime(first, "%Y-%m").date() if first else today
+    return start, today
+
+
+def rollup_frame(username, metric, grain, start, end):
+    """Mean, min, max and count per bucket and role, with at most MAX_ROLES roles."""
+    rows = aggregates.get_rollups(username, metric, grain,
+                                  aggregates.bucket_of(start.isoformat(), grain),
+                                  aggregates.bucket_of(end.isoformat(), grain))
+    df = pd.DataFrame(rows, columns=aggregates.ROLLUP_COLUMNS)
+    if df.empty:
+        return df.assign(mean=pd.Series(dtype=float))
+
+    df["role"] = df["role"].replace("", "Unspecified")
+    # Keep the busiest roles; fold the rest into one series.
+    counts = df.groupby("role")["count"].sum().sort_values(ascending=False)
+    if len(counts) > MAX_ROLES:
+        keep = set(counts.index[:MAX_ROLES - 1])
+        df["role"] = df["role"].where(df["role"].isin(keep), "Other roles")
+        df = df.groupby(["bucket", "role"], as_index=False).agg(
+            count=("count", "sum"), total=("total", "sum"),
+            min_value=("min_value", "min"), max_value=("max_value", "max"))
+    df["mean"] = df["total"] / df["count"]
+    return df.sort_values(["bucket", "role"]).reset_index(drop=True)
+
+
+def data_version(username):
+    summary = aggregates.get_user_aggregates(username) or {}
+    return tuple(summary.get(spec["version_field"]) for spec in METRICS.values())
+
+
+def _build_figure(username, metric, grain, start, end, title):
+    df = rollup_frame(username, metric, grain, start, end)
+    if df.empty:
+        return None
+    label = METRICS[metric]["label"]
+    fig = px.line(df, x="bucket", y="mean", color="role", markers=True, title=title,
+                  hover_data={"count": True, "min_value": ":.1f", "max_value": ":.1f"},
+                  labels={"bucket": grain.title(), "mean": label, "role": "Role",
+                          "count": "Attempts", "min_value": "Lowest", "max_value": "Highest"})
+    fig.update_xaxes(type="category")
+    return fig
+
+
+def _copy(fig):
+    return None if fig is None else go.Figure(fig)
+
+
+def progress_figure(username, metric, range_name="All time", title=None, today=None):
+    """Plotly figure of ``metric`` over ``range_name``, or None without data.
+
+    Each call returns a fresh copy of the cached figure, so callers may change it.
+    """
+    start, end = visible_range(username, metric, range_name, today)
+    grain = choose_grain(start, end)
+    key = (username, metric, grain, start, end, title, data_version(username))
+    with _figures_lock:
+        if key in _figures:
+            _figures.move_to_end(key)
+            return _copy(_figures[key])
+
+    fig = _build_figure(username, metric, grain, start, end, title)
+    with _figures_lock:
+        _figures[key] = fig
+        while len(_figures) > FIGURE_CACHE_SIZE:
+            _figures.popitem(last=False)
+    return _copy(fig)
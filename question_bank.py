@@ -0,0 +1,145 @@
+import json
+import os
+import random
+import threading
+
+# --- Settings ---
+QUESTION_FILE = os.environ.get("PREPVAULT_QUESTION_BANK", os.path.join("data", "questions.json"))
+DIFFICULTIES = ["easy", "medium", "hard"]
+# Share of draws taken from the user's weak tags when they have any.
+WEAK_TAG_SHARE = 0.6
+# Candidates drawn per missing question in each sampling round.
+OVERSAMPLE = 3
+SAMPLE_ROUNDS = 4
+# Pools up to this size are filtered exactly instead of sampled by rejection.
+EXACT_POOL_LIMIT = 256
+
+
+class QuestionBank:
+    """Interview questions indexed by id, text, role, (role, difficulty) and (role, tag).
+
+    Records carry ``id``, ``role``, ``question``, ``difficulty`` and ``tags``.
+    Sampling draws random candidates from the relevant index and rejects
+    ones the user has answered, so its cost depends on ``k`` rather than on
+    the size of the bank or of the user's history.
+    """
+
+    def __init__(self, records):
+        self.records = {}
+        self.by_text = {}
+        self._by_role = {}
+        self._by_role_difficulty = {}
+        self._by_role_tag = {}
+        for record in records:
+            qid = record["id"]
+            if qid in self.records:
+                raise ValueError(f"Duplicate question id: {qid}")
+            record = dict(record, tags=list(record.get("tags", [])))
+            self.records[qid] = record
+            self.by_text[record["question"]] = qid
+            role = record["role"]
+            self._by_role.setdefault(role, []).append(qid)
+            self._by_role_difficulty.setdefault((role, record.get("difficulty")), []).append(qid)
+            for tag in record["tags"]:
+                self._by_role_tag.setdefault((role, tag), []).append(qid)
+
+    @classmethod
+    def load(cls, path=QUESTION_FILE):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.records)
+
+    def roles(self):
+        return list(self._by_role)
+
+    def get(self, qid):
+        return self.records.get(qid)
+
+    def find(self, question):
+        """Record for a question's text, or None."""
+        qid = self.by_text.get(question)
+        return None if qid is None else self.records[qid]
+
+    def questions(self, role, difficulty=None, tag=None):
+        """Ids of ``role``'s questions, optionally narrowed by difficulty or tag."""
+        if tag is not None:
+            ids = self._by_role_tag.get((role, tag), [])
+            if difficulty is not None:
+                ids = [q for q in ids if self.records[q].get("difficulty") == difficulty]
+            return ids
+        if difficulty is not None:
+            return self._by_role_difficulty.get((role, difficulty), [])
+        return self._by_role.get(role, [])
+
+    def sample(self, role, k=3, difficulty=None, answered=None, weak_tags=None, rng=None):
+        """Pick up to ``k`` distinct question ids for ``role``.
+
+        ``answered(ids)`` returns the subset of ``ids`` the user has already
+        answered; those are only used once nothing else is left.
+        ``weak_tags`` maps tag -> weight; draws lean toward those tags.
+        """
+        rng = rng or random
+        pool = self.questions(role, difficulty)
+        if not pool:
+            return []
+        k = min(k, len(pool))
+
+        if len(pool) <= EXACT_POOL_LIMIT:
+            return self._sample_exact(pool, k, answered, weak_tags or {}, rng)
+
+        weak = [(tag, w) for tag, w in (weak_tags or {}).items()
+                if w > 0 and self.questions(role, difficulty, tag)]
+        tags, weights = [t for t, _ in weak], [w for _, w in weak]
+
+        chosen, seen, repeats = [], set(), []
+        for _ in range(SAMPLE_ROUNDS):
+            need = k - len(chosen)
+            if need <= 0:
+                break
+            candidates = []
+            for _ in range(need * OVERSAMPLE):
+                ids = pool
+                if tags and rng.random() < WEAK_TAG_SHARE:
+                    ids = self.questions(role, difficulty, rng.choices(tags, weights)[0])
+                qid = ids[rng.randrange(len(ids))]
+                if qid not in seen:
+                    seen.add(qid)
+                    candidates.append(qid)
+            done = answered(candidates) if answered and candidates else set()
+            chosen += [q for q in candidates if q not in done][:need]
+            repeats += [q for q in candidates if q in done]
+
+        if len(chosen) < k:
+            # Mostly answered already: top up with repeats, then anything unseen.
+            chosen += repeats[:k - len(chosen)]
+        if len(chosen) < k:
+            rest = [q for q in pool if q not in seen]
+            chosen += rng.sample(rest, min(k - len(chosen), len(rest)))
+        return chosen
+
+    def _sample_exact(self, pool, k, answered, weak_tags, rng):
+        done = answered(pool) if answered else set()
+
+        # Weighted sampling without replacement: each id gets key u ** (1 / weight).
+        def key(qid):
+            weight = 1 + sum(weak_tags.get(tag, 0) for tag in self.records[qid]["tags"])
+            return rng.random() ** (1 / weight)
+
+        fresh = sorted((q for q in pool if q not in done), key=key, reverse=True)
+        repeats = rng.sample([q for q in pool if q in done], len(done)) if len(fresh) < k else []
+        return (fresh + repeats)[:k]
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_bank():
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = QuestionBank.load()
+    return _bank
@@ -1,133 +1,109 @@
 import streamlit as st
 import os
+from datetime import datetime
 import pandas as pd
-import pytesseract
-import matplotlib.pyplot as plt
-import plotly.express as px
-
-from PyPDF2 import PdfReader
-from sentence_transformers import SentenceTransformer, util
-from pdf2image import convert_from_path
-from docx import Document
-from PIL import Image
-
-docx_imported = False
-try:
-    import docx2txt
-    docx_imported = True
-except ImportError:
-    st.warning("Install `docx2txt` to support DOCX file uploads: `pip install docx2txt`")
-
-# Load transformer model
-model = SentenceTransformer('all-MiniLM-L6-v2')
+
+from text_extraction import extract_pdf_pages, pages_to_text
+from text_extraction import extract_text_from_docx as docx_to_text
+import activity
+import aggregates
+import progress_charts
+import storage
+from resume_cache import content_hash, resume_cache
+from role_matching import (
+    get_catalog, job_descriptions, keyword_coverage, encode_resume, score_role, ai_match_resume_to_roles,
+)
 
 # --- Constants ---
 UPLOAD_FOLDER = "resumes"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-# Job role descriptions
-JOB_DESCRIPTIONS = {
-    "Data Analyst": "Responsible for analyzing data, building dashboards, writing SQL queries, and delivering insights using tools like Python, Power BI, and Excel.",
-    "Customer Support": "Handles customer issues via email or phone, uses CRM tools, ensures customer satisfaction, and communicates empathetically.",
-    "HR": "Involved in recruitment, employee onboarding, payroll, enforcing HR policies, and managing employee relations.",
-    "Python Developer": "Develops backend systems using Python, builds APIs, works with Flask or Django, and writes clean, efficient code.",
-    "Power BI Analyst": "Creates dashboards and reports using Power BI, performs data modeling, DAX calculations, and collaborates with business teams.",
-    "Admin": "Supports office tasks such as scheduling, data entry, communication, and administrative coordination."
-}
-
-# Expected keywords
-ROLE_KEYWORDS = {
-    "Data Analyst": ["sql", "excel", "python", "power bi", "data visualization", "statistics", "dashboard", "data cleaning"],
-    "Customer Support": ["crm", "customer service", "ticketing", "communication", "email", "phone support", "problem resolution"],
-    "HR": ["recruitment", "onboarding", "payroll", "employee relations", "compliance", "hr policies"],
-    "Python Developer": ["python", "flask", "django", "rest api", "oop", "unit testing", "git", "debugging"],
-    "Power BI Analyst": ["power bi", "dax", "data modeling", "dashboard", "kpi", "visualization", "m query"],
-    "Admin": ["scheduling", "data entry", "ms office", "reporting", "documentation", "clerical"]
-}
-
-def extract_text_from_pdf(uploaded_file):
-    try:
-        reader = PdfReader(uploaded_file)
-        raw_text = " ".join([page.extract_text() or "" for page in reader.pages])
-        if raw_text.strip():
-            return raw_text.strip().lower()
-    except Exception:
-        pass
+TOP_K_ROLES = 3
+PAST_ATTEMPTS_SHOWN = 100
+
+# Run once per process by screens.run_init before the screen first renders.
+def init():
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+def extract_text_from_pdf(file_path, page_stats=None):
     try:
-        st.info("🔍 Trying OCR for image-based resume...")
-        images = convert_from_path(uploaded_file.name, dpi=300)
-        ocr_text = ""
-        for img in images:
-            ocr_text += pytesseract.image_to_string(img)
-        return ocr_text.strip().lower()
+        pages_out = extract_pdf_pages(file_path)
     except Exception as e:
-        st.error(f"❌ OCR Failed: {e}")
+        st.error(f"❌ Failed to read PDF file: {e}")
         return ""
 
-def extract_text_from_docx(uploaded_file):
+    ocr_count = sum(1 for p in pages_out if p["method"] == "ocr")
+    if ocr_count:
+        st.info(f"🔍 Used OCR for {ocr_count} image-based page(s).")
+    if page_stats is not None:
+        page_stats.extend({k: v for k, v in p.items() if k != "text"} for p in pages_out)
+    return pages_to_text(pages_out)
+
+def extract_text_from_docx(file_path):
     try:
-        doc = Document(uploaded_file)
-        full_text = " ".join([para.text for para in doc.paragraphs])
-        return full_text.strip().lower()
+        return docx_to_text(file_path)
     except Exception as e:
         st.error(f"❌ Failed to read DOCX file: {e}")
         return ""
 
-def identify_missing_keywords(resume_text, job_role):
-    required = ROLE_KEYWORDS.get(job_role, [])
-    return [kw for kw in required if kw not in resume_text.lower()]
-
-def ai_match_resume_to_roles(resume_text):
-    resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-    scores = {}
-    for role, desc in JOB_DESCRIPTIONS.items():
-        desc_embedding = model.encode(desc, convert_to_tensor=True)
-        similarity = util.cos_sim(resume_embedding, desc_embedding).item()
-        scores[role] = round(similarity * 100, 2)
-    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
-
 def display_past_attempts(username):
-    df_path = os.path.join(UPLOAD_FOLDER, "resume_scores.csv")
-    if os.path.exists(df_path):
-        df = pd.read_csv(df_path)
-        user_df = df[df["username"] == username]
-        if not user_df.empty:
-            st.markdown("### 📂 Past Attempts")
-            st.dataframe(user_df.sort_values(by="match_score", ascending=False), use_container_width=True)
-
-            st.markdown("### 📈 Match Score Trend")
-            fig = px.bar(user_df, x="role", y="match_score", color="match_score", title="Match Scores by Role",
-                         labels={"match_score": "Score (%)", "role": "Role"})
+    user_df = storage.user_rows("resume_scores", username)
+    if not user_df.empty:
+        st.markdown("### 📂 Past Attempts")
+        # Latest attempts only, so the table stays small for heavy users.
+        recent = user_df.tail(PAST_ATTEMPTS_SHOWN)
+        st.dataframe(recent.sort_values(by="match_score", ascending=False), use_container_width=True)
+
+        st.markdown("### 📈 Match Score Trend")
+        fig = progress_charts.progress_figure(username, "resume", title="Match Scores by Role")
+        if fig is not None:
             st.plotly_chart(fig, use_container_width=True)
 
 def analyze_resume(username, job_role):
     uploaded_file = st.file_uploader("📄 Upload your Resume (PDF or DOCX)", type=["pdf", "docx"], key="resume")
     if uploaded_file:
+        file_bytes = uploaded_file.getvalue()
+        digest = content_hash(file_bytes)
         file_path = os.path.join(UPLOAD_FOLDER, f"{username}_{uploaded_file.name}")
+        # Saved on every upload, cached or not, so the user's copy is always on disk.
         with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        st.success("✅ Resume uploaded successfully!")
+            f.write(file_bytes)
+
+        # Reruns and repeat uploads of the same bytes skip extraction and encoding.
+        entry = resume_cache.get(digest)
+        if entry is None:
+            page_stats = []
+            if uploaded_file.name.endswith(".pdf"):
+                resume_text = extract_text_from_pdf(file_path, page_stats=page_stats)
+            else:
+                resume_text = extract_text_from_docx(file_path)
+
+            entry = {"text": resume_text, "embedding": None, "top_roles": [],
+                     "catalog_version": get_catalog().version, "pages": page_stats}
+            if resume_text:
+                entry["embedding"] = encode_resume(resume_text)
+                entry["top_roles"] = ai_match_resume_to_roles(resume_text, entry["embedding"], k=TOP_K_ROLES)
+            resume_cache.put(digest, entry)
+        elif entry["text"] and entry.get("catalog_version") != get_catalog().version:
+            # Role catalog changed since this entry was cached; re-rank from the stored embedding.
+            entry["top_roles"] = ai_match_resume_to_roles(resume_text=None, resume_embedding=entry["embedding"],
+                                                          k=TOP_K_ROLES)
+            entry["catalog_version"] = get_catalog().version
 
-        if uploaded_file.name.endswith(".pdf"):
-            resume_text = extract_text_from_pdf(uploaded_file)
-        else:
-            resume_text = extract_text_from_docx(uploaded_file)
+        st.success("✅ Resume uploaded successfully!")
 
+        resume_text = entry["text"]
         if not resume_text:
             st.error("❌ No readable text found. Try uploading a better-formatted file.")
             return
 
         st.markdown("### 🔎 Extracted Resume Preview")
         st.code(resume_text[:1000])
+        if entry.get("pages"):
+            with st.expander("⏱️ Extraction details"):
+                st.dataframe(pd.DataFrame(entry["pages"]), use_container_width=True)
 
-        role_desc = JOB_DESCRIPTIONS.get(job_role, "")
-        selected_score = util.cos_sim(
-            model.encode(resume_text, convert_to_tensor=True),
-            model.encode(role_desc, convert_to_tensor=True)
-        ).item() * 100
+        selected_score = score_role(entry["embedding"], job_role) or 0.0
 
-        ranked_roles = ai_match_resume_to_roles(resume_text)
+        ranked_roles = entry["top_roles"]
         best_match, best_score = ranked_roles[0]
 
         st.markdown("### 🧠 AI Evaluation")
@@ -148,7 +124,10 @@ def analyze_resume(username, job_role):
         for role, score in ranked_roles[:3]:
             st.write(f"- **{role}**: {score}%")
 
-        missing = identify_missing_keywords(resume_text, job_role)
+        coverage = keyword_coverage(resume_text)
+        role_coverage = coverage.get(job_role, {"missing": [], "ratio": 0.0})
+        missing = role_coverage["missing"]
+        st.write(f"**Keyword Coverage:** `{round(role_coverage['ratio'] * 100)}%`")
         if missing:
             st.markdown("### 🧩 Improvement Tips (Missing Keywords)")
             st.write("Consider adding the following keywords to better match the target role:")
@@ -164,20 +143,22 @@ def analyze_resume(username, job_role):
             "match_score": round(selected_score, 2),
             "suggested_role": best_match,
             "suggested_score": round(best_score, 2),
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
 
-        df_path = os.path.join(UPLOAD_FOLDER, "resume_scores.csv")
-        if os.path.exists(df_path):
-            old = pd.read_csv(df_path)
-            df = pd.concat([old, pd.DataFrame([result])], ignore_index=True)
-        else:
-            df = pd.DataFrame([result])
-        df.to_csv(df_path, index=False)
+        # Record each (file, role) analysis once per session, not on every rerun.
+        recorded = st.session_state.setdefault("recorded_resume_results", set())
+        if (digest, job_role) not in recorded:
+            with aggregates.recording():
+                storage.append("resume_scores", result)
+                aggregates.record_resume(username, job_role, result["match_score"], result["timestamp"])
+            activity.log_event(username, activity.RESUME_ANALYZED)
+            recorded.add((digest, job_role))
 
         display_past_attempts(username)
 
 def show_resume_review(username):
     st.subheader("📊 AI Resume Analyzer")
     st.markdown("Upload your resume and let AI assess your fit for your target job role. Supports multiple uploads.")
-    job_role = st.selectbox("🎯 Select Target Role", list(JOB_DESCRIPTIONS.keys()))
+    job_role = st.selectbox("🎯 Select Target Role", list(job_descriptions().keys()))
     analyze_resume(username, job_role)
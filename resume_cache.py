@@ -0,0 +1,78 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+# --- Settings ---
+MAX_ENTRIES = int(os.environ.get("PREPVAULT_RESUME_CACHE_SIZE", "64"))
+# Set to a directory (e.g. "resumes/.cache") to keep entries across restarts.
+DISK_DIR = os.environ.get("PREPVAULT_RESUME_CACHE_DIR", "")
+
+
+def content_hash(file_bytes):
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+class ResumeCache:
+    """LRU cache of analysed resumes keyed by a hash of the uploaded bytes.
+
+    Each entry is a dict holding the extracted ``text``, the normalized
+    ``embedding``, the ``top_roles`` ranked from it with the role catalog's
+    ``catalog_version``, and per-page extraction stats (``pages``). Entries
+    evicted from memory are still served from ``disk_dir`` when one is
+    configured.
+    Entries without text are never stored, so a failed extraction is retried.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, disk_dir=None):
+        self.max_entries = max(1, max_entries)
+        self.disk_dir = disk_dir or None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        if not entry.get("text"):
+            return
+        self._remember(key, entry)
+        if self.disk_dir:
+            # Created on first write, so importing the module touches no files.
+            os.makedirs(self.disk_dir, exist_ok=True)
+            tmp_path = self._disk_path(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._disk_path(key))
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Module-level instance shared by every Streamlit session in the process.
+resume_cache = ResumeCache(disk_dir=DISK_DIR)
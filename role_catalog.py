@@ -0,0 +1,200 @@
+import csv
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+import model_provider
+
+# --- Settings ---
+CATALOG_FILE = os.environ.get("PREPVAULT_ROLE_CATALOG", os.path.join("data", "roles.json"))
+INDEX_DIR = os.environ.get("PREPVAULT_ROLE_INDEX_DIR", os.path.join("data", "role_index"))
+# Catalogs up to this size are searched exactly; larger ones use the partitioned index.
+EXACT_SEARCH_LIMIT = int(os.environ.get("PREPVAULT_EXACT_SEARCH_LIMIT", "5000"))
+# Partitions probed per query in the partitioned index.
+N_PROBE = int(os.environ.get("PREPVAULT_ROLE_INDEX_NPROBE", "8"))
+ENCODE_BATCH_SIZE = 256
+
+
+def read_catalog_file(path=CATALOG_FILE):
+    """Load roles from JSON (a list of objects) or CSV.
+
+    Each role has ``role``, ``description`` and ``keywords`` (a list in JSON,
+    a ``;``-separated string in CSV). Role names must be unique.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            records = [
+                {"role": row["role"], "description": row.get("description", ""),
+                 "keywords": [k.strip() for k in (row.get("keywords") or "").split(";") if k.strip()]}
+                for row in csv.DictReader(f)
+            ]
+    else:
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+
+    seen = set()
+    for record in records:
+        if record["role"] in seen:
+            raise ValueError(f"Duplicate role in catalog: {record['role']}")
+        seen.add(record["role"])
+    return records
+
+
+# --- Partitioned index ---
+def _spherical_kmeans(vectors, n_clusters, iterations=10, seed=0):
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), n_clusters * 64)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(n_clusters):
+            members = sample[assignments == c]
+            if len(members):
+                total = members.sum(axis=0)
+                centroids[c] = total / (np.linalg.norm(total) or 1.0)
+    return centroids
+
+
+def _assign(vectors, centroids, chunk=8192):
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk):
+        block = np.asarray(vectors[start:start + chunk])
+        assignments[start:start + chunk] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+class RoleCatalog:
+    """Roles with persisted, memory-mapped description embeddings and top-k search."""
+
+    def __init__(self, records, index_dir=INDEX_DIR):
+        self.records = records
+        self.names = [r["role"] for r in records]
+        self.descriptions = {r["role"]: r.get("description", "") for r in records}
+        self.keywords = {r["role"]: list(r.get("keywords", [])) for r in records}
+        self.index_dir = index_dir
+        self._positions = {name: i for i, name in enumerate(self.names)}
+        self._lock = threading.Lock()
+        self._embeddings = None
+        self._centroids = None
+        self._order = None
+        self._offsets = None
+
+        digest = hashlib.sha256(model_provider.MODEL_NAME.encode("utf-8"))
+        for r in records:
+            digest.update(f"{r['role']}\x1f{r.get('description', '')}\x1e".encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+
+    @classmethod
+    def load(cls, path=CATALOG_FILE, index_dir=INDEX_DIR):
+        return cls(read_catalog_file(path), index_dir=index_dir)
+
+    def __len__(self):
+        return len(self.names)
+
+    # --- Index lifecycle ---
+    def _path(self, name):
+        return os.path.join(self.index_dir, name)
+
+    def _index_is_current(self):
+        try:
+            with open(self._path("meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return meta.get("version") == self.version and meta.get("partitioned") == self._partitioned()
+
+    def _partitioned(self):
+        return len(self.names) > EXACT_SEARCH_LIMIT
+
+    def _save(self, name, array):
+        # Replace rather than overwrite: other processes may have the old file mapped.
+        tmp_path = self._path(f".{name[:-4]}-{os.getpid()}.npy")
+        np.save(tmp_path, array)
+        os.replace(tmp_path, self._path(name))
+
+    def build_index(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        texts = [self.descriptions[name] for name in self.names]
+        embeddings = np.asarray(model_provider.encode(
+            texts, batch_size=ENCODE_BATCH_SIZE, normalize_embeddings=True), dtype=np.float32)
+        self._save("embeddings.npy", embeddings)
+
+        if self._partitioned():
+            centroids = _spherical_kmeans(embeddings, int(np.sqrt(len(embeddings))))
+            assignments = _assign(embeddings, centroids)
+            order = np.argsort(assignments, kind="stable").astype(np.int64)
+            offsets = np.searchsorted(assignments[order], np.arange(len(centroids) + 1))
+            self._save("centroids.npy", centroids)
+            self._save("order.npy", order)
+            self._save("offsets.npy", offsets)
+
+        # Written last, so a half-built index is rebuilt on the next load.
+        with open(self._path("meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "count": len(self.names),
+                       "partitioned": self._partitioned()}, f)
+
+    def _ensure_index(self):
+        if self._embeddings is not None:
+            return
+        with self._lock:
+            if self._embeddings is not None:
+                return
+            if not self._index_is_current():
+                self.build_index()
+            if self._partitioned():
+                self._centroids = np.load(self._path("centroids.npy"))
+                self._order = np.load(self._path("order.npy"), mmap_mode="r")
+                self._offsets = np.load(self._path("offsets.npy"))
+            self._embeddings = np.load(self._path("embeddings.npy"), mmap_mode="r")
+
+    def embeddings(self):
+        self._ensure_index()
+        return self._embeddings
+
+    # --- Search ---
+    def score(self, query_embedding, role):
+        """Match score (percent) of one role; None for unknown roles."""
+        position = self._positions.get(role)
+        if position is None:
+            return None
+        embeddings = self.embeddings()
+        return float(np.dot(embeddings[position], np.asarray(query_embedding, dtype=embeddings.dtype))) * 100
+
+    def top_k(self, query_embedding, k=3):
+        """Best ``k`` roles as ``[(role, score_percent), ...]``, highest first."""
+        embeddings = self.embeddings()
+        query = np.asarray(query_embedding, dtype=embeddings.dtype)
+
+        if self._centroids is None:
+            candidates = None
+            scores = embeddings @ query
+        else:
+            n_probe = min(N_PROBE, len(self._centroids))
+            probed = np.argpartition(self._centroids @ query, -n_probe)[-n_probe:]
+            # Sorted positions keep the gather from the memory map sequential.
+            candidates = np.sort(np.concatenate(
+                [self._order[self._offsets[c]:self._offsets[c + 1]] for c in probed]))
+            scores = embeddings[candidates] @ query
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        best = np.argpartition(scores, -k)[-k:]
+        best = best[np.argsort(scores[best])[::-1]]
+        positions = best if candidates is None else candidates[best]
+        return [(self.names[p], round(float(scores[i]) * 100, 2)) for p, i in zip(positions, best)]
+
+
+if __name__ == "__main__":
+    # Precompute the persisted index: python role_catalog.py [catalog file]
+    import sys
+    import time
+
+    start = time.perf_counter()
+    catalog = RoleCatalog.load(sys.argv[1] if len(sys.argv) > 1 else CATALOG_FILE)
+    catalog.build_index()
+    print(f"Indexed {len(catalog)} roles in {time.perf_counter() - start:.1f}s -> {catalog.index_dir}")
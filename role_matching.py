@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+
+import model_provider
+from keyword_matcher import KeywordMatcher
+from role_catalog import RoleCatalog
+
+# Roles, descriptions and keywords come from the catalog file (data/roles.json),
+# read on first use rather than at import.
+_catalog = None
+_keyword_matcher = None
+_lock = threading.Lock()
+
+def get_catalog():
+    global _catalog
+    if _catalog is None:
+        with _lock:
+            if _catalog is None:
+                _catalog = RoleCatalog.load()
+    return _catalog
+
+# Job role descriptions
+def job_descriptions():
+    return get_catalog().descriptions
+
+# Expected keywords
+def role_keywords():
+    return get_catalog().keywords
+
+def role_names():
+    return get_catalog().names
+
+# Description embeddings are persisted as one normalized (n_roles x dim) matrix
+# and memory-mapped on first use; see role_catalog.
+def get_role_embeddings():
+    return get_catalog().embeddings()
+
+# Built once; one pass over a resume covers the keywords of every role.
+def get_keyword_matcher():
+    global _keyword_matcher
+    if _keyword_matcher is None:
+        with _lock:
+            if _keyword_matcher is None:
+                _keyword_matcher = KeywordMatcher(role_keywords())
+    return _keyword_matcher
+
+def keyword_coverage(resume_text):
+    return get_keyword_matcher().coverage(resume_text)
+
+def identify_missing_keywords(resume_text, job_role):
+    found = get_keyword_matcher().find(resume_text)
+    return [kw for kw in role_keywords().get(job_role, []) if kw not in found]
+
+def encode_resume(resume_text):
+    return model_provider.encode(resume_text, normalize_embeddings=True)
+
+def score_role(resume_embedding, role):
+    return get_catalog().score(resume_embedding, role)
+
+def ai_match_resume_to_roles(resume_text, resume_embedding=None, k=None):
+    if resume_embedding is None:
+        resume_embedding = encode_resume(resume_text)
+    catalog = get_catalog()
+    return catalog.top_k(resume_embedding, k=len(catalog) if k is None else k)
+
+
+def encode_resumes(resume_texts, batch_size=64):
+    return model_provider.encode(list(resume_texts), batch_size=batch_size, normalize_embeddings=True)
+
+
+def score_matrix(resume_embeddings):
+    # (n_resumes x dim) @ (dim x n_roles) -> percentage scores for every pair at once.
+    role_embeddings = get_role_embeddings()
+    resume_embeddings = np.asarray(resume_embeddings, dtype=role_embeddings.dtype)
+    return (resume_embeddings @ role_embeddings.T) * 100
@@ -0,0 +1,62 @@
+"""Navigation screens, imported only when first routed to.
+
+Each screen names the module and function that render it. Importing a
+screen module must not do I/O; modules that need directories or files set
+them up in an ``init()`` function, which runs once per process the first
+time the screen (or a screen listing the module in ``init_modules``) loads.
+"""
+import importlib
+import threading
+from collections import namedtuple
+
+Screen = namedtuple("Screen", ["module", "function", "needs_login", "login_warning", "init_modules",
+                               "admin_only"])
+
+SCREENS = {}
+
+_initialized = set()
+_init_lock = threading.Lock()
+
+
+def register(name, module, function, needs_login=True, login_warning=None, init_modules=(), admin_only=False):
+    SCREENS[name] = Screen(module, function, needs_login, login_warning, tuple(init_modules), admin_only)
+
+
+register("Login", "login_screen", "show_login", needs_login=False)
+register("Dashboard", "dashboard", "show_dashboard",
+         login_warning="Please log in to view your dashboard.",
+         init_modules=("my_profile", "resume_analyzer"))
+register("Resume Analyzer", "resume_analyzer", "show_resume_review",
+         login_warning="Please log in to analyze your resume.")
+register("Mock Interview", "mock_interview", "show_mock_interview",
+         login_warning="Please log in to access mock interviews.")
+register("My Profile", "my_profile", "show_profile",
+         login_warning="Please log in to access your profile.")
+register("Performance", "performance", "show_performance",
+         login_warning="Please log in as an admin to view performance.", admin_only=True)
+
+
+def names(is_admin=False):
+    """Screen names for the navigation menu; admin-only screens need ``is_admin``."""
+    return [name for name, screen in SCREENS.items() if is_admin or not screen.admin_only]
+
+
+def run_init(module_name):
+    """Import ``module_name`` and run its ``init()`` hook once per process."""
+    module = importlib.import_module(module_name)
+    if module_name not in _initialized:
+        with _init_lock:
+            if module_name not in _initialized:
+                hook = getattr(module, "init", None)
+                if hook is not None:
+                    hook()
+                _initialized.add(module_name)
+    return module
+
+
+def load(name):
+    """The render function of screen ``name``, importing its module on first use."""
+    screen = SCREENS[name]
+    for module_name in screen.init_modules:
+        run_init(module_name)
+    return getattr(run_init(screen.module), screen.function)
@@ -0,0 +1,374 @@
+"""Record storage shared by every screen.
+
+Tables live either in the CSV files the app has always used (the default) or
+in one SQLite database in WAL mode, indexed on username and timestamp, so
+per-user queries don't depend on the size of the table:
+
+    PREPVAULT_STORAGE=sqlite streamlit run app.py
+    python storage.py import          # one-shot copy of the CSVs into SQLite
+"""
+import argparse
+import csv
+import io
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+import data_cache
+import tracing
+from csv_store import append_rows, file_lock, read_header, rewrite_frame
+
+BACKEND = os.environ.get("PREPVAULT_STORAGE", "csv")
+DB_PATH = os.environ.get("PREPVAULT_DB", os.path.join("data", "prepvault.db"))
+
+# name -> CSV location, columns (with SQLite types), the username column, the
+# timestamp column and whether each user has at most one row.
+TABLES = {
+    "users": {
+        "csv": "users.csv",
+        "columns": {"username": "TEXT", "password": "TEXT", "email": "TEXT", "role": "TEXT", "created_at": "TEXT"},
+        "user_col": "username", "time_col": "created_at", "unique": True,
+    },
+    "user_info": {
+        "csv": "user_info.csv",
+        "columns": {"username": "TEXT", "email": "TEXT", "location": "TEXT", "bio": "TEXT"},
+        "user_col": "username", "time_col": None, "unique": True,
+    },
+    "resume_scores": {
+        "csv": os.path.join("resumes", "resume_scores.csv"),
+        "columns": {"username": "TEXT", "file": "TEXT", "role": "TEXT", "match_score": "REAL",
+                    "suggested_role": "TEXT", "suggested_score": "REAL", "timestamp": "TEXT"},
+        "user_col": "username", "time_col": "timestamp", "unique": False,
+    },
+    "interview_scores": {
+        "csv": os.path.join("data", "interview_scores.csv"),
+        "columns": {"Username": "TEXT", "Role": "TEXT", "Question": "TEXT", "Response": "TEXT",
+                    "Feedback": "TEXT", "Rating": "REAL", "Timestamp": "TEXT"},
+        "user_col": "Username", "time_col": "Timestamp", "unique": False,
+    },
+    "user_activity": {
+        "csv": "user_activity.csv",
+        "columns": {"username": "TEXT", "timestamp": "TEXT", "action": "TEXT"},
+        "user_col": "username", "time_col": "timestamp", "unique": False,
+    },
+}
+
+
+def columns(table):
+    return list(TABLES[table]["columns"])
+
+
+def _empty(table):
+    return pd.DataFrame(columns=columns(table))
+
+
+# --- CSV backend ---
+class CsvBackend:
+    name = "csv"
+
+    # Reads go through data_cache: each file is parsed once per version and
+    # per-user lookups use its username index.
+    def all_rows(self, table):
+        df = data_cache.load_frame(TABLES[table]["csv"])
+        return _empty(table) if df is None else df.copy()
+
+    def user_rows(self, table, username):
+        df = data_cache.user_frame(TABLES[table]["csv"], TABLES[table]["user_col"], username)
+        return _empty(table) if df is None else df.copy()
+
+    def iter_user_rows(self, table, username, chunk_size):
+        # Slices of the cached frame; nothing beyond the parse cache is held.
+        df = data_cache.user_frame(TABLES[table]["csv"], TABLES[table]["user_col"], username)
+        if df is None:
+            return
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size].reindex(columns=columns(table))
+
+    def append(self, table, rows):
+        append_rows(TABLES[table]["csv"], rows, columns(table))
+
+    def insert_unique(self, table, row):
+        spec = TABLES[table]
+        with file_lock(spec["csv"]):
+            if not self.user_rows(table, row[spec["user_col"]]).empty:
+                return False
+            append_rows(spec["csv"], [row], columns(table))
+        return True
+
+    def upsert(self, table, rows):
+        spec = TABLES[table]
+        user_col = spec["user_col"]
+        with file_lock(spec["csv"]):
+            df = self.all_rows(table)
+            df = df[~df[user_col].isin([row[user_col] for row in rows])]
+            df = pd.concat([df, pd.DataFrame(rows)], ignore_index=True)
+            rewrite_frame(spec["csv"], df)
+
+    def version(self, table):
+        return data_cache.file_signature(TABLES[table]["csv"])
+
+    def read_since(self, table, cursor):
+        # The cursor is (inode, byte offset). Rewrites replace the file via
+        # rename, so a new inode means the offset no longer applies.
+        path = TABLES[table]["csv"]
+        with tracing.span("csv.read_since"), file_lock(path):
+            header = read_header(path)
+            if header is None:
+                return _empty(table), None
+            with open(path, "rb") as f:
+                inode = os.fstat(f.fileno()).st_ino
+                size = f.seek(0, os.SEEK_END)
+                if not cursor or cursor[0] != inode or cursor[1] > size:
+                    f.seek(0)
+                    f.readline()
+                    offset = f.tell()
+                else:
+                    offset = cursor[1]
+                f.seek(offset)
+                data = f.read()
+        rows = list(csv.reader(io.StringIO(data.decode("utf-8"), newline="")))
+        df = pd.DataFrame([row for row in rows if row], columns=header).reindex(columns=columns(table))
+        return df, [inode, offset + len(data)]
+
+
+# --- SQLite backend ---
+class SqliteBackend:
+    name = "sqlite"
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._schema_ready = False
+
+    def connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        if not self._schema_ready:
+            self.create_schema(conn)
+            self._schema_ready = True
+        return conn
+
+    @staticmethod
+    def create_schema(conn):
+        with conn:
+            # Bumped in the same transaction as every write to a table; see version().
+            conn.execute("CREATE TABLE IF NOT EXISTS table_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+            for table, spec in TABLES.items():
+                cols = ", ".join(f'"{c}" {t}' for c, t in spec["columns"].items())
+                conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (id INTEGER PRIMARY KEY, {cols})')
+                user_col, time_col = spec["user_col"], spec["time_col"]
+                unique = "UNIQUE " if spec["unique"] else ""
+                conn.execute(f'CREATE {unique}INDEX IF NOT EXISTS "ix_{table}_user" ON "{table}" ("{user_col}")')
+                if time_col:
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{table}_user_time" '
+                                 f'ON "{table}" ("{user_col}", "{time_col}")')
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{table}_time" ON "{table}" ("{time_col}")')
+
+    def _select(self, table, where="", params=()):
+        cols = ", ".join(f'"{c}"' for c in columns(table))
+        query = f'SELECT {cols} FROM "{table}" {where} ORDER BY id'
+        return pd.read_sql_query(query, self.connect(), params=params)
+
+    def all_rows(self, table):
+        return self._select(table)
+
+    def user_rows(self, table, username):
+        return self._select(table, f'WHERE "{TABLES[table]["user_col"]}" = ?', (username,))
+
+    def iter_user_rows(self, table, username, chunk_size):
+        cols = columns(table)
+        names = ", ".join(f'"{c}"' for c in cols)
+        cursor = self.connect().execute(
+            f'SELECT {names} FROM "{table}" WHERE "{TABLES[table]["user_col"]}" = ? ORDER BY id', (username,))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield pd.DataFrame(rows, columns=cols)
+
+    @staticmethod
+    def _bump(conn, table):
+        conn.execute("INSERT INTO table_versions (name, version) VALUES (?, 1) "
+                     "ON CONFLICT(name) DO UPDATE SET version = version + 1", (table,))
+
+    def _insert_sql(self, table, verb="INSERT"):
+        cols = columns(table)
+        names = ", ".join(f'"{c}"' for c in cols)
+        marks = ", ".join("?" for _ in cols)
+        return f'{verb} INTO "{table}" ({names}) VALUES ({marks})', cols
+
+    def append(self, table, rows):
+        sql, cols = self._insert_sql(table)
+        conn = self.connect()
+        with conn:
+            conn.executemany(sql, [[row.get(c) for c in cols] for row in rows])
+            self._bump(conn, table)
+
+    def insert_unique(self, table, row):
+        sql, cols = self._insert_sql(table)
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute(sql, [row.get(c) for c in cols])
+                self._bump(conn, table)
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def upsert(self, table, rows):
+        sql, cols = self._insert_sql(table)
+        conn = self.connect()
+        user_col = TABLES[table]["user_col"]
+        with conn:
+            conn.executemany(f'DELETE FROM "{table}" WHERE "{user_col}" = ?', [(row[user_col],) for row in rows])
+            conn.executemany(sql, [[row.get(c) for c in cols] for row in rows])
+            self._bump(conn, table)
+
+    def read_since(self, table, cursor):
+        cols = ", ".join(f'"{c}"' for c in columns(table))
+        df = pd.read_sql_query(f'SELECT id, {cols} FROM "{table}" WHERE id > ? ORDER BY id',
+                               self.connect(), params=(cursor or 0,))
+        last = int(df["id"].iloc[-1]) if not df.empty else cursor
+        return df.drop(columns="id"), last
+
+    def version(self, table):
+        # Not max(id): an upsert of the newest row deletes and re-inserts it under the same rowid.
+        row = self.connect().execute("SELECT version FROM table_versions WHERE name = ?", (table,)).fetchone()
+        return row[0] if row else 0
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = SqliteBackend() if BACKEND == "sqlite" else CsvBackend()
+    return _backend
+
+
+# --- Public API ---
+def all_rows(table):
+    return get_backend().all_rows(table)
+
+
+def user_rows(table, username):
+    return get_backend().user_rows(table, username)
+
+
+def iter_user_rows(table, username, chunk_size=5000):
+    """``user_rows`` as a sequence of DataFrames of at most ``chunk_size`` rows."""
+    return get_backend().iter_user_rows(table, username, chunk_size)
+
+
+def get_user(table, username):
+    rows = user_rows(table, username)
+    if rows.empty:
+        return None
+    return {k: ("" if pd.isna(v) else v) for k, v in rows.iloc[0].to_dict().items()}
+
+
+def append(table, row):
+    get_backend().append(table, [row])
+
+
+def append_many(table, rows):
+    rows = list(rows)
+    if rows:
+        get_backend().append(table, rows)
+
+
+def insert_unique(table, row):
+    """Insert ``row`` unless its user already has one; returns False if so."""
+    return get_backend().insert_unique(table, row)
+
+
+def upsert(table, row):
+    """Replace the single row for ``row``'s user (tables with one row per user)."""
+    get_backend().upsert(table, [row])
+
+
+def upsert_many(table, rows):
+    """``upsert`` for many users in one write (one file rewrite on CSV)."""
+    rows = list(rows)
+    if rows:
+        get_backend().upsert(table, rows)
+
+
+def table_version(table):
+    """Opaque value that changes whenever ``table`` changes; cheap to compute."""
+    return get_backend().version(table)
+
+
+def read_since(table, cursor=None):
+    """Rows added to ``table`` after ``cursor``, and the cursor to pass next time.
+
+    Start with ``cursor=None``. Cursors are JSON-serializable and specific to
+    the backend; a stale one (e.g. after a CSV rewrite) restarts from the top.
+    """
+    return get_backend().read_since(table, cursor)
+
+
+# --- CSV import ---
+def import_csvs(db_path=DB_PATH, replace=False, batch_size=5000):
+    """Copy every table's CSV into SQLite. Tables that already hold rows are
+    skipped unless ``replace`` is set. Returns {table: rows imported}."""
+    backend = SqliteBackend(db_path)
+    conn = backend.connect()
+    imported = {}
+    for table, spec in TABLES.items():
+        if not os.path.exists(spec["csv"]) or os.path.getsize(spec["csv"]) == 0:
+            continue
+        existing = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        if existing and not replace:
+            print(f"{table}: {existing} rows already present, skipped (use --replace)")
+            continue
+
+        verb = "INSERT OR REPLACE" if spec["unique"] else "INSERT"
+        sql, cols = backend._insert_sql(table, verb=verb)
+        count = 0
+        with conn:
+            if replace:
+                conn.execute(f'DELETE FROM "{table}"')
+            with open(spec["csv"], newline="", encoding="utf-8") as f:
+                batch = []
+                for row in csv.DictReader(f):
+                    batch.append([row.get(c) or None for c in cols])
+                    if len(batch) >= batch_size:
+                        conn.executemany(sql, batch)
+                        count += len(batch)
+                        batch = []
+                conn.executemany(sql, batch)
+                count += len(batch)
+            backend._bump(conn, table)
+        imported[table] = count
+        print(f"{table}: imported {count} rows from {spec['csv']}")
+    return imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PrepVault storage utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="Import the CSV files into the SQLite database")
+    imp.add_argument("--db", default=DB_PATH)
+    imp.add_argument("--replace", action="store_true", help="Replace tables that already hold rows")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        import_csvs(args.db, replace=args.replace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_cache  # noqa: E402
+import storage  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Run every test in an empty directory; the app's data paths are relative."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage, "_backend", None)
+    data_cache.invalidate()
+    return tmp_path
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def backend(request, tmp_path, monkeypatch):
+    """Each storage backend in turn, installed as the process-wide backend."""
+    if request.param == "csv":
+        store = storage.CsvBackend()
+    else:
+        store = storage.SqliteBackend(str(tmp_path / "test.db"))
+    monkeypatch.setattr(storage, "BACKEND", request.param)
+    monkeypatch.setattr(storage, "_backend", store)
+    return store
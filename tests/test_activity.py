@@ -0,0 +1,77 @@
+import queue
+import threading
+
+import pytest
+
+import activity
+import storage
+
+
+@pytest.fixture(autouse=True)
+def writer(monkeypatch, backend):
+    monkeypatch.setattr(activity, "_queue", queue.SimpleQueue())
+    monkeypatch.setattr(activity, "_thread", None)
+    yield
+    activity.shutdown()
+
+
+def _actions(username):
+    return list(storage.user_rows("user_activity", username)["action"])
+
+
+def test_flush_persists_logged_events():
+    activity.log_event("alice", activity.LOGIN)
+    activity.log_event("alice", activity.RESUME_ANALYZED)
+    activity.log_event("", activity.LOGIN)
+    assert activity.flush()
+    assert _actions("alice") == [activity.LOGIN, activity.RESUME_ANALYZED]
+    assert activity.flush()
+
+
+def test_shutdown_drains_the_queue(monkeypatch):
+    # No batch is due on its own before shutdown.
+    monkeypatch.setattr(activity, "BATCH_SIZE", 1000)
+    monkeypatch.setattr(activity, "FLUSH_INTERVAL", 60)
+    for n in range(50):
+        activity.log_event("alice", f"step{n}")
+    activity.shutdown()
+    assert _actions("alice") == [f"step{n}" for n in range(50)]
+    assert activity.get_stats()["queued"] == 0
+
+
+def test_concurrent_log_calls_keep_each_callers_order(monkeypatch):
+    monkeypatch.setattr(activity, "BATCH_SIZE", 7)
+    start = threading.Barrier(4)
+
+    def log(username):
+        start.wait()
+        for n in range(100):
+            activity.log_event(username, f"step{n:03d}")
+
+    threads = [threading.Thread(target=log, args=(f"user{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert activity.flush()
+
+    assert len(storage.all_rows("user_activity")) == 400
+    for i in range(4):
+        assert _actions(f"user{i}") == [f"step{n:03d}" for n in range(100)]
+
+
+def test_failed_write_is_retried(monkeypatch):
+    append_many = storage.append_many
+    failures = [RuntimeError("store down")]
+
+    def flaky(table, rows):
+        if failures:
+            raise failures.pop()
+        append_many(table, rows)
+
+    monkeypatch.setattr(storage, "append_many", flaky)
+    activity.log_event("alice", activity.LOGIN)
+    assert activity.flush()
+    assert _actions("alice") == []
+    assert activity.flush()
+    assert _actions("alice") == [activity.LOGIN]
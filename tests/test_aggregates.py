@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+import aggregates
+import question_bank
+import storage
+
+QUESTIONS = [
+    {"id": "da-1", "role": "Data Analyst", "question": "Why SQL?", "difficulty": "easy", "tags": ["sql"]},
+    {"id": "da-2", "role": "Data Analyst", "question": "Why pandas?", "difficulty": "easy", "tags": ["python"]},
+]
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DB_PATH", str(tmp_path / "aggregates.db"))
+    monkeypatch.setattr(storage, "BACKEND", "csv")
+    monkeypatch.setattr(aggregates, "_local", threading.local())
+    monkeypatch.setattr(aggregates, "_ready", False)
+    monkeypatch.setattr(question_bank, "_bank", question_bank.QuestionBank(QUESTIONS))
+
+
+def _interview(username, question, rating, timestamp):
+    row = {"Username": username, "Role": "Data Analyst", "Question": question, "Response": "r",
+           "Feedback": "f", "Rating": rating, "Timestamp": timestamp}
+    with aggregates.recording():
+        storage.append("interview_scores", row)
+        aggregates.record_interview(username, "Data Analyst", rating, timestamp, question=question)
+
+
+def test_recorded_results_match_the_logs():
+    _interview("alice", "Why SQL?", 2, "2024-01-01 10:00:00")
+    _interview("alice", "Why pandas?", 4, "2024-01-09 10:00:00")
+    with aggregates.recording():
+        storage.append("resume_scores", {"username": "alice", "file": "a.pdf", "role": "Data Analyst",
+                                         "match_score": 70.0, "suggested_role": "Data Analyst",
+                                         "suggested_score": 70.0, "timestamp": "2024-01-10 10:00:00"})
+        aggregates.record_resume("alice", "Data Analyst", 70.0, "2024-01-10 10:00:00")
+
+    summary = aggregates.get_user_aggregates("alice")
+    assert summary["interview_attempts"] == 2
+    assert summary["mean_rating"] == 3
+    assert summary["best_resume_score"] == 70.0
+    assert aggregates.answered_questions("alice", ["da-1", "da-3"]) == {"da-1"}
+    assert aggregates.weak_tags("alice") == {"sql": 0.6, "python": 0.2}
+    assert [r["count"] for r in aggregates.get_rollups("alice", "interview", "week")] == [1, 1]
+    assert aggregates.check() == []
+
+
+def test_seed_counts_an_existing_row_once():
+    storage.append("interview_scores", {"Username": "alice", "Role": "Data Analyst", "Question": "Why SQL?",
+                                        "Response": "r", "Feedback": "f", "Rating": 3,
+                                        "Timestamp": "2024-01-01 10:00:00"})
+    # Recorded without recording(): this call seeds the store, which already counts the row.
+    aggregates.record_interview("alice", "Data Analyst", 3, "2024-01-01 10:00:00", question="Why SQL?")
+
+    assert aggregates.get_user_aggregates("alice")["interview_attempts"] == 1
+    assert aggregates.check() == []
+
+
+def test_writers_wait_for_the_seed(monkeypatch):
+    _interview("alice", "Why SQL?", 2, "2024-01-01 10:00:00")
+    monkeypatch.setattr(aggregates, "_ready", False)
+    monkeypatch.setattr(aggregates, "SCHEMA_VERSION", "test")
+    compute = aggregates.compute_from_logs
+    seeding = threading.Event()
+
+    def slow_compute():
+        result = compute()
+        seeding.set()
+        time.sleep(0.2)
+        return result
+
+    monkeypatch.setattr(aggregates, "compute_from_logs", slow_compute)
+    seeder = threading.Thread(target=aggregates.get_user_aggregates, args=("alice",))
+    seeder.start()
+    seeding.wait(5)
+    _interview("alice", "Why pandas?", 4, "2024-01-02 10:00:00")
+    seeder.join()
+
+    assert aggregates.get_user_aggregates("alice")["interview_attempts"] == 2
+    assert aggregates.check() == []
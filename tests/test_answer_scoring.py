@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import answer_scoring
+import model_provider
+
+
+def fake_encode(texts, **kwargs):
+    vectors = np.zeros((len(texts), 4), dtype=np.float32)
+    vectors[:, 0] = 1.0
+    return vectors
+
+
+@pytest.fixture(autouse=True)
+def no_model(monkeypatch):
+    monkeypatch.setattr(model_provider, "encode", fake_encode)
+
+
+def test_empty_bank_builds_an_empty_index(tmp_path):
+    bank = answer_scoring.ReferenceBank([], index_dir=str(tmp_path))
+    assert bank.build_index() == 0
+    assert bank.embeddings().shape[0] == 0
+
+
+def test_duplicate_question_is_rejected(tmp_path):
+    records = [{"question": "Why SQL?", "answers": ["a"]}, {"question": "Why SQL?", "answers": ["b"]}]
+    with pytest.raises(ValueError, match="Duplicate question"):
+        answer_scoring.ReferenceBank(records, index_dir=str(tmp_path))
+
+
+def test_rebuild_only_encodes_new_answers(tmp_path):
+    records = [{"question": "Why SQL?", "answers": ["joins", "indexes"]}]
+    assert answer_scoring.ReferenceBank(records, index_dir=str(tmp_path)).build_index() == 2
+    records.append({"question": "Why Python?", "answers": ["pandas"]})
+    bank = answer_scoring.ReferenceBank(records, index_dir=str(tmp_path))
+    assert bank.build_index() == 1
+    assert bank.embeddings().shape == (3, 4)
+    assert bank.references("Why Python?") == ["pandas"]
+
+
+def test_question_without_answers_falls_back(tmp_path, monkeypatch):
+    records = [{"question": "Why SQL?", "answers": [], "keywords": ["joins"]},
+               {"question": "Why Python?", "answers": ["pandas"]}]
+    bank = answer_scoring.ReferenceBank(records, index_dir=str(tmp_path))
+    monkeypatch.setattr(answer_scoring, "_bank", bank)
+
+    assert "Why SQL?" not in bank
+    scored = answer_scoring.score_answer("Why SQL?", "I use joins to combine tables every day.")
+    assert scored["rating"] == answer_scoring.word_count_rating("I use joins to combine tables every day.")
+    assert answer_scoring.ideal_answer("Why SQL?") is None
+    assert answer_scoring.ideal_answer("Why Python?") == "pandas"
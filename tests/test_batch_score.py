@@ -0,0 +1,81 @@
+import csv
+
+import pytest
+
+import batch_score
+
+
+def _resumes(tmp_path, names):
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_bytes(b"resume")
+        paths.append(str(path))
+    return paths
+
+
+def _rows(paths):
+    return [{"username": "alice", "file": p, "role": "Data Analyst", "match_score": 50.0,
+             "suggested_role": "Data Analyst", "suggested_score": 50.0} for p in paths]
+
+
+def test_resume_drops_rows_of_unfinished_batch(tmp_path):
+    output = str(tmp_path / "scores.csv")
+    first, second = _resumes(tmp_path, ["a.pdf", "b.pdf"]), _resumes(tmp_path, ["c.pdf"])
+    batch_score.mark_done(output, [])
+    batch_score.write_rows(output, _rows(first), "csv")
+    batch_score.mark_done(output, first)
+    # Interrupted after writing the second batch's rows, before its checkpoint.
+    batch_score.write_rows(output, _rows(second), "csv")
+
+    done = batch_score.load_checkpoint(output)
+
+    assert done == {batch_score._checkpoint_key(p) for p in first}
+    with open(output, newline="", encoding="utf-8") as f:
+        assert [row["file"] for row in csv.DictReader(f)] == first
+
+
+def test_torn_checkpoint_line_is_ignored(tmp_path):
+    output = str(tmp_path / "scores.jsonl")
+    paths = _resumes(tmp_path, ["a.pdf"])
+    batch_score.mark_done(output, [])
+    batch_score.write_rows(output, _rows(paths), "jsonl")
+    with open(batch_score._checkpoint_path(output), "a", encoding="utf-8") as f:
+        f.write(batch_score._checkpoint_key(paths[0]) + "\n#si")
+
+    assert batch_score.load_checkpoint(output) == set()
+    assert (tmp_path / "scores.jsonl").read_text() == ""
+
+
+def test_default_output_is_not_the_app_history():
+    assert batch_score.DEFAULT_OUTPUT != batch_score.os.path.join("resumes", "resume_scores.csv")
+
+
+def test_unreadable_files_get_an_error_row(tmp_path, monkeypatch, caplog):
+    docx = pytest.importorskip("docx")
+    import numpy as np
+
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    (resumes / "bob_broken.pdf").write_bytes(b"not a pdf")
+    document = docx.Document()
+    document.add_paragraph("SQL and Excel dashboards")
+    document.save(str(resumes / "alice_cv.docx"))
+    monkeypatch.setattr(batch_score, "role_names", lambda: ["Data Analyst", "Designer"])
+    monkeypatch.setattr(batch_score, "encode_resumes", lambda texts, batch_size: np.ones((len(texts), 2)))
+    monkeypatch.setattr(batch_score, "score_matrix", lambda embeddings: np.array([[80.0, 20.0]] * len(embeddings)))
+
+    output = str(tmp_path / "scores.csv")
+    summary = batch_score.score_directory(str(resumes), output, workers=1, top_k=1)
+
+    assert (summary["scored"], summary["failed"]) == (1, 1)
+    with open(output, newline="", encoding="utf-8") as f:
+        rows = {row["username"]: row for row in csv.DictReader(f)}
+    assert rows["alice"]["role"] == "Data Analyst" and rows["alice"]["error"] == ""
+    assert rows["bob"]["match_score"] == "" and rows["bob"]["error"]
+
+
+def test_workers_run_ocr_in_process(monkeypatch):
+    monkeypatch.setattr(batch_score.ocr, "WORKERS", 4)
+    batch_score._init_worker()
+    assert batch_score.ocr.WORKERS == 0
@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+import csv_store
+
+
+def _append_many(path, worker, count):
+    for i in range(count):
+        csv_store.append_row(path, {"worker": worker, "n": i}, columns=["worker", "n"])
+
+
+def test_append_writes_header_once(tmp_path):
+    path = str(tmp_path / "log.csv")
+    csv_store.append_row(path, {"a": 1, "b": 2})
+    csv_store.append_rows(path, [{"a": 3, "b": 4}, {"b": 6, "a": 5}])
+    assert csv_store.read_rows(path) == [{"a": "1", "b": "2"}, {"a": "3", "b": "4"}, {"a": "5", "b": "6"}]
+
+
+def test_new_column_widens_the_header(tmp_path):
+    path = str(tmp_path / "log.csv")
+    csv_store.append_row(path, {"a": 1})
+    csv_store.append_row(path, {"a": 2, "c": 3})
+    assert csv_store.read_header(path) == ["a", "c"]
+    assert csv_store.read_rows(path) == [{"a": "1", "c": ""}, {"a": "2", "c": "3"}]
+
+
+def test_append_after_missing_trailing_newline(tmp_path):
+    path = tmp_path / "log.csv"
+    path.write_text("a,b\n1,2", encoding="utf-8")
+    csv_store.append_row(str(path), {"a": 3, "b": 4})
+    assert csv_store.read_rows(str(path)) == [{"a": "1", "b": "2"}, {"a": "3", "b": "4"}]
+
+
+def test_concurrent_appends_from_threads_and_processes(tmp_path):
+    path = str(tmp_path / "log.csv")
+    threads = [threading.Thread(target=_append_many, args=(path, f"t{i}", 50)) for i in range(4)]
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_append_many, args=(path, f"p{i}", 50)) for i in range(2)]
+    for worker in threads + processes:
+        worker.start()
+    for worker in threads + processes:
+        worker.join()
+
+    rows = csv_store.read_rows(path)
+    assert len(rows) == 300
+    assert all(set(row) == {"worker", "n"} and row["n"].isdigit() for row in rows)
+    for worker in ["t0", "t3", "p0", "p1"]:
+        assert [int(r["n"]) for r in rows if r["worker"] == worker] == list(range(50))
+
+
+def test_file_lock_is_reentrant(tmp_path):
+    path = str(tmp_path / "log.csv")
+    with csv_store.file_lock(path):
+        with csv_store.file_lock(path):
+            csv_store.append_row(path, {"a": 1})
+    assert csv_store.read_rows(path) == [{"a": "1"}]
+
+
+def test_failed_rewrite_keeps_the_old_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "log.csv")
+    csv_store.append_rows(path, [{"a": 1}, {"a": 2}])
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(csv_store.os, "replace", fail)
+    with pytest.raises(OSError):
+        csv_store.rewrite_rows(path, [{"a": 9}], ["a"])
+
+    assert csv_store.read_rows(path) == [{"a": "1"}, {"a": "2"}]
+    assert sorted(os.listdir(tmp_path)) == ["log.csv", "log.csv.lock"]
+
+
+def test_buffered_writer_flushes_on_size(tmp_path):
+    path = str(tmp_path / "log.csv")
+    writer = csv_store.BufferedWriter(path, columns=["a"], max_rows=3, max_delay=60)
+    writer.append({"a": 1})
+    writer.append({"a": 2})
+    assert csv_store.read_rows(path) == []
+    writer.append({"a": 3})
+    assert len(csv_store.read_rows(path)) == 3
+    writer.append({"a": 4})
+    writer.flush()
+    assert len(csv_store.read_rows(path)) == 4
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import aggregates  # noqa: E402
+import dashboard  # noqa: E402
+
+
+def _summary_app():
+    import dashboard
+
+    dashboard.show_interview_summary("alice")
+
+
+def test_details_are_read_only_when_asked_for(monkeypatch):
+    calls = []
+
+    def read_history(table, username=None, columns=None, **kwargs):
+        calls.append((table, username))
+        return pd.DataFrame([{"Role": "Data Analyst", "Question": "q", "Response": "r", "Feedback": "f",
+                              "Rating": 4}])
+
+    # The app runs in this process, so it sees the patched modules.
+    monkeypatch.setattr(dashboard, "read_history", read_history)
+    monkeypatch.setattr(aggregates, "get_user_aggregates",
+                        lambda username: {"interview_attempts": 1, "mean_rating": 4.0})
+
+    at = AppTest.from_function(_summary_app).run()
+    assert not at.exception
+    assert calls == [] and not at.dataframe
+
+    at.toggle(key="interview_summary_details").set_value(True).run()
+    assert calls == [("interview_scores", "alice")]
+    assert len(at.dataframe) == 1
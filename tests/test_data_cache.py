@@ -0,0 +1,67 @@
+import os
+import threading
+
+import data_cache
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+
+
+def _parses():
+    return data_cache.cache_stats()["parses"]
+
+
+def test_parses_once_per_file_version(tmp_path):
+    path = tmp_path / "log.csv"
+    _write(path, "username,n\nalice,1\nbob,2\n")
+    before = _parses()
+    assert len(data_cache.load_frame(str(path))) == 2
+    assert len(data_cache.load_frame(str(path))) == 2
+    assert _parses() == before + 1
+
+    _write(path, "username,n\nalice,1\nbob,2\nalice,3\n")
+    assert len(data_cache.load_frame(str(path))) == 3
+    assert _parses() == before + 2
+
+
+def test_same_size_rewrite_is_noticed(tmp_path):
+    path = tmp_path / "log.csv"
+    _write(path, "username,n\nalice,1\n")
+    data_cache.load_frame(str(path))
+    _write(path, "username,n\nalice,2\n")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert list(data_cache.load_frame(str(path))["n"]) == [2]
+
+
+def test_user_frame(tmp_path):
+    path = str(tmp_path / "log.csv")
+    _write(tmp_path / "log.csv", "username,n\nalice,1\nbob,2\nalice,3\n")
+    assert list(data_cache.user_frame(path, "username", "alice")["n"]) == [1, 3]
+    assert data_cache.user_frame(path, "username", "carol").empty
+    assert data_cache.user_frame(path, "missing_column", "alice") is None
+
+
+def test_missing_or_empty_file(tmp_path):
+    assert data_cache.load_frame(str(tmp_path / "missing.csv")) is None
+    _write(tmp_path / "empty.csv", "")
+    assert data_cache.user_frame(str(tmp_path / "empty.csv"), "username", "alice") is None
+
+
+def test_concurrent_misses_parse_once(tmp_path):
+    path = tmp_path / "log.csv"
+    _write(path, "username,n\n" + "".join(f"user{i},{i}\n" for i in range(20000)))
+    before = _parses()
+    start = threading.Barrier(8)
+
+    def load():
+        start.wait()
+        data_cache.load_frame(str(path))
+
+    threads = [threading.Thread(target=load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert _parses() == before + 1
@@ -0,0 +1,80 @@
+import io
+import json
+import os
+import time
+import zipfile
+
+import pytest
+
+import export
+import storage
+
+CSV = "CSV (interview results)"
+JSONL = "JSON Lines (everything)"
+ZIP = "Zip bundle (everything)"
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "exports"
+    monkeypatch.setattr(export, "EXPORT_DIR", str(directory))
+    return directory
+
+
+def _seed():
+    storage.insert_unique("users", {"username": "alice", "password": "hash", "email": "a@example.com",
+                                    "role": "user", "created_at": "2024-01-01 09:00:00"})
+    storage.append_many("interview_scores", [
+        {"Username": user, "Role": "Data Analyst", "Question": f"q{i}", "Response": "r, with comma",
+         "Feedback": "f", "Rating": 4, "Timestamp": f"2024-01-0{i + 1} 10:00:00"}
+        for i, user in enumerate(["alice", "bob", "alice"])])
+
+
+def _export(fmt, username="alice"):
+    buffer = io.BytesIO()
+    export.write_export(username, fmt, buffer)
+    return buffer.getvalue()
+
+
+def test_csv_holds_only_the_users_rows(backend):
+    _seed()
+    lines = _export(CSV).decode("utf-8").splitlines()
+    assert lines[0].split(",") == storage.columns("interview_scores")
+    assert [line.split(",")[2] for line in lines[1:]] == ["q0", "q2"]
+
+
+def test_jsonl_leaves_out_the_password(backend):
+    _seed()
+    records = [json.loads(line) for line in _export(JSONL).decode("utf-8").splitlines()]
+    users = [r for r in records if r["table"] == "users"]
+    assert users == [{"table": "users", "username": "alice", "email": "a@example.com",
+                      "role": "user", "created_at": "2024-01-01 09:00:00"}]
+    assert sum(r["table"] == "interview_scores" for r in records) == 2
+
+
+def test_zip_has_a_member_per_table(backend):
+    _seed()
+    with zipfile.ZipFile(io.BytesIO(_export(ZIP))) as archive:
+        assert sorted(archive.namelist()) == sorted(
+            f"{t}.csv" for t in export.HISTORY_TABLES + export.PROFILE_TABLES)
+        assert "password" not in archive.read("users.csv").decode("utf-8")
+
+
+def test_export_file_name_is_sanitized(export_dir):
+    path = export.export_to_file("../evil name", CSV)
+    try:
+        assert os.path.dirname(path) == str(export_dir)
+        assert os.path.basename(path).startswith("prepvault-.._evil_name-")
+    finally:
+        export.remove_export(path)
+    assert os.listdir(export_dir) == []
+
+
+def test_stale_exports_are_swept(export_dir):
+    old, new = export.export_to_file("alice", CSV), export.export_to_file("bob", CSV)
+    past = time.time() - export.EXPORT_TTL - 60
+    os.utime(old, (past, past))
+
+    assert export.sweep_exports() == 1
+    assert os.listdir(export_dir) == [os.path.basename(new)]
+    export.remove_export(new)
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+
+import history_archive
+import storage
+
+pytest.importorskip("pyarrow")
+
+NOW = datetime(2024, 6, 30)
+
+
+@pytest.fixture(autouse=True)
+def csv_backend(monkeypatch):
+    # Compaction applies to the CSV backend only.
+    monkeypatch.setattr(storage, "BACKEND", "csv")
+
+
+def _seed():
+    rows = [{"Username": "alice", "Role": "Data Analyst", "Question": f"q{i}", "Response": "r",
+             "Feedback": "f", "Rating": 3, "Timestamp": f"2024-0{m}-15 10:00:00"}
+            for i, m in enumerate([1, 2, 3, 6, 6])]
+    storage.append_many("interview_scores", rows)
+
+
+def _history():
+    return history_archive.read_history("interview_scores", "alice")
+
+
+def test_compact_moves_old_rows_once():
+    _seed()
+    assert history_archive.compact("interview_scores", keep_days=31, now=NOW) == 3
+    assert history_archive.compact("interview_scores", keep_days=31, now=NOW) == 0
+    assert len(storage.user_rows("interview_scores", "alice")) == 2
+    assert sorted(_history()["Question"]) == ["q0", "q1", "q2", "q3", "q4"]
+
+
+@pytest.mark.parametrize("step", ["rewrite_frame", "_publish"])
+def test_compact_rerun_after_crash_keeps_rows_once(monkeypatch, step):
+    _seed()
+
+    def crash(*args, **kwargs):
+        raise OSError("disk went away")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(history_archive, step, crash)
+        with pytest.raises(OSError):
+            history_archive.compact("interview_scores", keep_days=31, now=NOW)
+
+    history_archive.compact("interview_scores", keep_days=31, now=NOW)
+    assert sorted(_history()["Question"]) == ["q0", "q1", "q2", "q3", "q4"]
+    assert len(storage.user_rows("interview_scores", "alice")) == 2
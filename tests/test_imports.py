@@ -0,0 +1,15 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_screens_touches_no_files(tmp_path):
+    # A fresh interpreter, so no module is already imported (and initialized).
+    modules = ["role_matching", "resume_cache", "resume_analyzer", "mock_interview", "dashboard",
+               "my_profile", "login_screen", "performance", "export", "screens"]
+    code = f"import sys; sys.path.insert(0, {ROOT!r})\n" + "".join(f"import {m}\n" for m in modules)
+    env = dict(os.environ, PREPVAULT_RESUME_CACHE_DIR="resume_cache")
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,56 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+import inbox
+import storage
+
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DB_PATH", str(tmp_path / "inbox.db"))
+    monkeypatch.setattr(inbox, "_local", threading.local())
+    monkeypatch.setattr(inbox, "_ready", False)
+
+
+def test_unread_count_follows_adds_and_reads():
+    assert inbox.add_many([("alice", "one"), ("alice", "two"), ("bob", "three")]) == 3
+    inbox.add("alice", "four")
+    assert inbox.unread_count("alice") == 3
+    assert inbox.unread_count("carol") == 0
+
+    first = inbox.page("alice")[0][-1]["id"]
+    assert inbox.mark_read("alice", [first, first]) == 1
+    assert inbox.unread_count("alice") == 2
+    assert inbox.mark_read("alice") == 2
+    assert inbox.mark_read("alice") == 0
+    assert inbox.unread_count("alice") == 0
+    assert inbox.unread_count("bob") == 1
+
+
+def test_pages_are_newest_first():
+    inbox.add_many([("alice", f"note {i}") for i in range(5)])
+    items, cursor = inbox.page("alice", limit=2)
+    assert [n["message"] for n in items] == ["note 4", "note 3"]
+    items, cursor = inbox.page("alice", before=cursor, limit=2)
+    assert [n["message"] for n in items] == ["note 2", "note 1"]
+    items, cursor = inbox.page("alice", before=cursor, limit=2)
+    assert [n["message"] for n in items] == ["note 0"]
+    assert cursor is None
+
+
+def test_unread_only_page():
+    inbox.add_many([("alice", "old"), ("alice", "new")])
+    inbox.mark_read("alice", [inbox.page("alice")[0][-1]["id"]])
+    assert [n["message"] for n in inbox.page("alice", unread_only=True)[0]] == ["new"]
+
+
+def test_prune_removes_old_notes_and_their_unread_counts():
+    inbox.add_many([("alice", "old", "2024-01-01 09:00:00"), ("alice", "older", "2023-12-01 09:00:00"),
+                    ("alice", "recent", "2024-06-01 09:00:00")])
+    inbox.mark_read("alice", [inbox.page("alice")[0][-1]["id"]])
+
+    assert inbox.prune(days=90, now=datetime(2024, 6, 30)) == 2
+    assert [n["message"] for n in inbox.page("alice")[0]] == ["recent"]
+    assert inbox.unread_count("alice") == 1
@@ -0,0 +1,35 @@
+from keyword_matcher import KeywordMatcher, tokenize
+
+ROLES = {
+    "Data Analyst": ["SQL", "Excel", "data visualization", "dashboards"],
+    "Software Engineer": ["C++", "C#", "Java", "unit testing"],
+    "Designer": ["Figma"],
+}
+
+
+def test_tokenize_keeps_symbols_and_folds_plurals():
+    assert tokenize("C++ and C# dashboards, Class APIs") == ["c++", "and", "c#", "dashboard", "class", "api"]
+
+
+def test_matches_whole_words_only():
+    found = KeywordMatcher(ROLES).find("JavaScript developer who writes SQLite queries")
+    assert found == set()
+
+
+def test_matches_phrases_symbols_and_plurals():
+    text = "Built dashboard tooling in C++; data visualization and unit-testing with Excel."
+    assert KeywordMatcher(ROLES).find(text) == {"dashboards", "C++", "data visualization", "unit testing", "Excel"}
+
+
+def test_coverage_per_role():
+    coverage = KeywordMatcher(ROLES).coverage("SQL and Excel reports in Java")
+    assert coverage["Data Analyst"]["hits"] == ["SQL", "Excel"]
+    assert coverage["Data Analyst"]["ratio"] == 0.5
+    assert coverage["Software Engineer"]["missing"] == ["C++", "C#", "unit testing"]
+    assert coverage["Designer"]["ratio"] == 0.0
+
+
+def test_keyword_shared_by_roles_and_empty_keywords():
+    matcher = KeywordMatcher({"A": ["Python", "!!"], "B": ["python"]})
+    assert matcher.find("python") == {"Python", "python"}
+    assert matcher.coverage("python")["A"]["missing"] == ["!!"]
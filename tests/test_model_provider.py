@@ -0,0 +1,23 @@
+import threading
+
+import model_provider
+
+
+def test_start_warmup_does_not_wait_for_a_load(monkeypatch):
+    monkeypatch.setattr(model_provider, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(model_provider, "_model", None)
+    monkeypatch.setattr(model_provider, "_warmup_thread", None)
+    release = threading.Event()
+    started = []
+    monkeypatch.setattr(model_provider, "_warm_up", lambda: (started.append(1), release.wait(5)))
+
+    # A load in flight holds the model lock.
+    with model_provider._lock:
+        done = threading.Event()
+        caller = threading.Thread(target=lambda: (model_provider.start_warmup(),
+                                                  model_provider.start_warmup(), done.set()))
+        caller.start()
+        assert done.wait(2)
+    release.set()
+    model_provider._warmup_thread.join(5)
+    assert started == [1]
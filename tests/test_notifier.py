@@ -0,0 +1,73 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+import inbox
+import notifier
+import storage
+
+NOW = datetime(2024, 6, 30, 12, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch, backend):
+    monkeypatch.setattr(storage, "DB_PATH", str(tmp_path / "notifier.db"))
+    monkeypatch.setattr(inbox, "_local", threading.local())
+    monkeypatch.setattr(inbox, "_ready", False)
+
+
+def _seen(username, timestamp):
+    storage.append("user_activity", {"username": username, "timestamp": timestamp, "action": "login"})
+
+
+def test_notifies_idle_users_once_per_idle_spell():
+    _seen("alice", "2024-06-20 09:00:00")
+    _seen("bob", "2024-06-29 09:00:00")
+
+    rows, notified = notifier.tick(NOW)
+    assert (rows, notified) == (2, ["alice"])
+    assert inbox.unread_count("alice") == 1 and inbox.unread_count("bob") == 0
+    assert "alice" in inbox.page("alice")[0][0]["message"]
+
+    # Nothing new: no rows re-read and no second notification.
+    assert notifier.tick(NOW) == (0, [])
+
+    # Back after the notice, then idle again: notified again.
+    _seen("alice", "2024-07-01 09:00:00")
+    assert notifier.tick(datetime(2024, 7, 2)) == (1, [])
+    rows, notified = notifier.tick(datetime(2024, 7, 10))
+    assert (rows, sorted(notified)) == (0, ["alice", "bob"])
+    assert inbox.unread_count("alice") == 2
+
+
+def test_activity_older_than_last_notice_does_not_renotify():
+    _seen("alice", "2024-06-20 09:00:00")
+    notifier.tick(NOW)
+    _seen("alice", "2024-06-19 09:00:00")
+    assert notifier.tick(NOW) == (1, [])
+
+
+def test_unparseable_timestamps_are_ignored():
+    _seen("alice", "not a time")
+    _seen("", "2024-06-20 09:00:00")
+    assert notifier.tick(NOW) == (2, [])
+
+
+def test_failed_tick_neither_notifies_nor_clears_pending(monkeypatch):
+    _seen("alice", "2024-06-20 09:00:00")
+    add_many = inbox.add_many
+
+    def add_then_crash(notes, conn=None):
+        add_many(notes, conn=conn)
+        raise RuntimeError("killed")
+
+    monkeypatch.setattr(inbox, "add_many", add_then_crash)
+    with pytest.raises(RuntimeError):
+        notifier.tick(NOW)
+    assert inbox.unread_count("alice") == 0
+
+    monkeypatch.setattr(inbox, "add_many", add_many)
+    assert notifier.tick(NOW) == (0, ["alice"])
+    assert notifier.tick(NOW) == (0, [])
+    assert inbox.unread_count("alice") == 1
@@ -0,0 +1,72 @@
+import logging
+
+import pytest
+
+import ocr
+
+
+def test_failed_pages_are_logged_and_reported(tmp_path, caplog):
+    missing = str(tmp_path / "missing.pdf")
+    with caplog.at_level(logging.WARNING, logger="prepvault.ocr"):
+        results = ocr.ocr_pdf(missing, pages=[1, 2], workers=2)
+
+    assert [r["page"] for r in results] == [1, 2]
+    assert all(r["error"] and r["text"] == "" for r in results)
+    assert len([r for r in caplog.records if "OCR failed" in r.getMessage()]) == 2
+
+
+def test_calls_share_one_pool(tmp_path):
+    ocr.ocr_pdf(str(tmp_path / "a.pdf"), pages=[1])
+    pool = ocr.get_pool()
+    ocr.ocr_pdf(str(tmp_path / "b.pdf"), pages=[1])
+    assert ocr.get_pool() is pool
+
+
+def test_spent_budget_skips_pages(tmp_path):
+    assert ocr.ocr_pdf(str(tmp_path / "a.pdf"), pages=[1, 2], time_budget=0) == []
+
+
+def test_page_keeps_first_pass_when_high_dpi_runs_out_of_time(monkeypatch):
+    monkeypatch.setattr(ocr, "_render_page", lambda path, page, dpi: dpi)
+
+    def recognize(dpi, timeout=0):
+        assert timeout > 0
+        if dpi == ocr.HIGH_DPI:
+            raise RuntimeError("Tesseract process timeout")
+        return "low text", 40.0
+
+    monkeypatch.setattr(ocr, "_recognize", recognize)
+    result = ocr.ocr_page("resume.pdf", 1, time_limit=5)
+    assert (result["text"], result["dpi"]) == ("low text", ocr.LOW_DPI)
+
+
+def test_page_without_time_left_fails(monkeypatch):
+    monkeypatch.setattr(ocr, "_render_page", lambda path, page, dpi: dpi)
+    with pytest.raises(TimeoutError):
+        ocr.ocr_page("resume.pdf", 1, time_limit=0)
+
+
+def test_extraction_marks_failed_ocr_pages(tmp_path):
+    pytest.importorskip("fitz")
+    canvas = pytest.importorskip("reportlab.pdfgen.canvas")
+    import text_extraction
+
+    path = str(tmp_path / "scan.pdf")
+    pdf = canvas.Canvas(path)
+    pdf.drawString(72, 720, "A text page with more than enough characters on it.")
+    pdf.showPage()
+    pdf.showPage()  # blank, as an image-only page looks to the text layer
+    pdf.save()
+
+    pages = text_extraction.extract_pdf_pages(path)
+    assert [p["method"] for p in pages] in (["text", "failed"], ["text", "ocr"])
+    if pages[1]["method"] == "failed":
+        assert pages[1]["error"]
+
+
+def test_zero_workers_run_in_process(monkeypatch):
+    monkeypatch.setattr(ocr, "get_pool", lambda: pytest.fail("no pool expected"))
+    monkeypatch.setattr(ocr, "_render_page", lambda path, page, dpi: dpi)
+    monkeypatch.setattr(ocr, "_recognize", lambda image, timeout=0: (f"page text {image}", 90.0))
+    results = ocr.ocr_pdf("resume.pdf", pages=[1, 2], workers=0)
+    assert [(r["page"], r["text"]) for r in results] == [(1, f"page text {ocr.LOW_DPI}"), (2, f"page text {ocr.LOW_DPI}")]
@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import pytest
+
+import aggregates
+import progress_charts
+import question_bank
+import storage
+
+TODAY = date(2024, 6, 30)
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DB_PATH", str(tmp_path / "charts.db"))
+    monkeypatch.setattr(storage, "BACKEND", "csv")
+    monkeypatch.setattr(aggregates, "_local", threading.local())
+    monkeypatch.setattr(aggregates, "_ready", False)
+    monkeypatch.setattr(question_bank, "_bank", question_bank.QuestionBank([]))
+    monkeypatch.setattr(progress_charts, "_figures", OrderedDict())
+
+
+def _score(role, score, timestamp):
+    row = {"username": "alice", "file": "cv.pdf", "role": role, "match_score": score,
+           "suggested_role": role, "suggested_score": score, "timestamp": timestamp}
+    with aggregates.recording():
+        storage.append("resume_scores", row)
+        aggregates.record_resume("alice", role, score, timestamp)
+
+
+def _figure():
+    return progress_charts.progress_figure("alice", "resume", "Last 30 days", today=TODAY)
+
+
+def test_callers_get_their_own_copy():
+    _score("Data Analyst", 60.0, "2024-06-10 10:00:00")
+    first = _figure()
+    first.update_layout(title="changed")
+    first.data[0].name = "changed"
+
+    second = _figure()
+    assert second is not first
+    assert second.layout.title.text != "changed"
+    assert second.data[0].name == "Data Analyst"
+
+
+def test_no_figure_without_scores():
+    assert _figure() is None
+
+
+def test_figure_is_built_from_the_rollups():
+    _score("Data Analyst", 60.0, "2024-06-10 10:00:00")
+    _score("Data Analyst", 80.0, "2024-06-10 18:00:00")
+    _score("Designer", 40.0, "2024-06-12 10:00:00")
+
+    fig = _figure()
+    series = {trace.name: (list(trace.x), list(trace.y)) for trace in fig.data}
+    assert series == {"Data Analyst": (["2024-06-10"], [70.0]), "Designer": (["2024-06-12"], [40.0])}
+    assert fig.layout.xaxis.title.text == "Day"
+
+
+def test_grain_follows_the_range():
+    _score("Data Analyst", 60.0, "2023-01-10 10:00:00")
+    _score("Data Analyst", 80.0, "2024-06-10 10:00:00")
+    fig = progress_charts.progress_figure("alice", "resume", "All time", today=TODAY)
+    assert list(fig.data[0].x) == ["2023-01-09", "2024-06-10"]
+    assert fig.layout.xaxis.title.text == "Week"
+    assert progress_charts.choose_grain(date(2024, 1, 1), date(2024, 3, 1)) == "day"
+    assert progress_charts.choose_grain(date(2023, 1, 1), date(2024, 1, 1)) == "week"
+
+
+def test_extra_roles_are_folded_into_one_series(monkeypatch):
+    monkeypatch.setattr(progress_charts, "MAX_ROLES", 2)
+    for n, role in enumerate(["A", "A", "B", "C"]):
+        _score(role, 50.0 + n, "2024-06-10 10:00:00")
+    names = sorted(trace.name for trace in _figure().data)
+    assert names == ["A", "Other roles"]
+
+
+def test_new_score_invalidates_the_cached_figure():
+    _score("Data Analyst", 60.0, "2024-06-10 10:00:00")
+    before = _figure()
+    assert len(progress_charts._figures) == 1
+
+    _score("Data Analyst", 90.0, "2024-06-11 10:00:00")
+    after = _figure()
+    assert list(before.data[0].y) == [60.0]
+    assert list(after.data[0].y) == [60.0, 90.0]
+    assert len(progress_charts._figures) == 2
@@ -0,0 +1,68 @@
+import random
+from collections import Counter
+
+import pytest
+
+import question_bank
+from question_bank import QuestionBank
+
+
+def _records(count, role="Data Analyst"):
+    return [{"id": f"q{i}", "role": role, "question": f"Question {i}?",
+             "difficulty": question_bank.DIFFICULTIES[i % 3], "tags": ["sql" if i % 4 == 0 else "python"]}
+            for i in range(count)]
+
+
+def _answered(done):
+    return lambda ids: {q for q in ids if q in done}
+
+
+@pytest.fixture(params=[12, question_bank.EXACT_POOL_LIMIT * 4], ids=["exact", "rejection"])
+def bank(request):
+    return QuestionBank(_records(request.param))
+
+
+def test_duplicate_ids_are_rejected():
+    with pytest.raises(ValueError, match="Duplicate question id"):
+        QuestionBank(_records(2) + _records(1))
+
+
+def test_lookups():
+    bank = QuestionBank(_records(8))
+    assert bank.find("Question 3?")["id"] == "q3"
+    assert bank.find("Unknown?") is None
+    assert bank.questions("Data Analyst", difficulty="easy") == ["q0", "q3", "q6"]
+    assert bank.questions("Data Analyst", difficulty="easy", tag="sql") == ["q0"]
+    assert bank.questions("Designer") == []
+
+
+def test_sample_is_distinct_and_skips_answered(bank):
+    pool = bank.questions("Data Analyst")
+    done = set(pool[::2])
+    ids = bank.sample("Data Analyst", 3, answered=_answered(done), rng=random.Random(1))
+    assert len(set(ids)) == 3
+    assert not set(ids) & done
+
+
+def test_sample_tops_up_with_answered_questions(bank):
+    pool = bank.questions("Data Analyst")
+    ids = bank.sample("Data Analyst", 3, answered=_answered(set(pool)), rng=random.Random(2))
+    assert len(set(ids)) == 3 and set(ids) <= set(pool)
+
+
+def test_sample_respects_difficulty_and_pool_size(bank):
+    ids = bank.sample("Data Analyst", 5, difficulty="hard", rng=random.Random(3))
+    assert all(bank.get(q)["difficulty"] == "hard" for q in ids)
+    assert bank.sample("Designer", 3) == []
+    small = QuestionBank(_records(2))
+    assert sorted(small.sample("Data Analyst", 5, rng=random.Random(4))) == ["q0", "q1"]
+
+
+def test_weak_tags_lean_the_draw(bank):
+    rng = random.Random(5)
+    tags = Counter()
+    for _ in range(300):
+        for qid in bank.sample("Data Analyst", 2, weak_tags={"sql": 1.0}, rng=rng):
+            tags.update(bank.get(qid)["tags"])
+    # A quarter of the questions are tagged sql; the weak tag should be drawn far more often.
+    assert tags["sql"] / sum(tags.values()) > 0.32
@@ -0,0 +1,23 @@
+from resume_cache import ResumeCache, content_hash
+
+
+def _entry(text):
+    return {"text": text, "embedding": None, "top_roles": []}
+
+
+def test_lru_eviction_falls_back_to_disk(tmp_path):
+    cache = ResumeCache(max_entries=1, disk_dir=str(tmp_path / "cache"))
+    cache.put("a", _entry("first"))
+    cache.put("b", _entry("second"))
+    assert list(cache._entries) == ["b"]
+    assert cache.get("a")["text"] == "first"
+
+
+def test_entries_without_text_are_not_cached(tmp_path):
+    disk_dir = tmp_path / "cache"
+    cache = ResumeCache(disk_dir=str(disk_dir))
+    key = content_hash(b"scanned resume")
+    cache.put(key, _entry(""))
+    assert cache.get(key) is None
+    assert not disk_dir.exists()
+
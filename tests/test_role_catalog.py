@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+
+import model_provider
+from role_catalog import RoleCatalog
+
+ROLES = [{"role": f"Role {i}", "description": f"description {i}", "keywords": []} for i in range(4)]
+
+
+def fake_encode(offset):
+    def encode(texts, **kwargs):
+        vectors = np.zeros((len(texts), 4), dtype=np.float32)
+        for i in range(len(texts)):
+            vectors[i, (i + offset) % 4] = 1.0
+        return vectors
+    return encode
+
+
+def test_rebuild_leaves_mapped_index_intact(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_provider, "encode", fake_encode(0))
+    catalog = RoleCatalog(ROLES, index_dir=str(tmp_path))
+    mapped = catalog.embeddings()
+    before = np.array(mapped)
+
+    monkeypatch.setattr(model_provider, "encode", fake_encode(1))
+    RoleCatalog(ROLES, index_dir=str(tmp_path)).build_index()
+
+    assert np.array_equal(mapped, before)
+    assert not np.array_equal(np.load(tmp_path / "embeddings.npy"), before)
+    assert sorted(os.listdir(tmp_path)) == ["embeddings.npy", "meta.json"]
+
+
+def test_top_k_uses_saved_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_provider, "encode", fake_encode(0))
+    catalog = RoleCatalog(ROLES, index_dir=str(tmp_path))
+    assert catalog.top_k(np.eye(4, dtype=np.float32)[2], k=1) == [("Role 2", 100.0)]
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import model_provider
+import role_matching
+from role_catalog import RoleCatalog
+
+ROLES = [
+    {"role": "Data Analyst", "description": "analyst", "keywords": ["SQL", "Excel"]},
+    {"role": "Designer", "description": "designer", "keywords": ["Figma"]},
+    {"role": "Engineer", "description": "engineer", "keywords": ["Python", "unit testing"]},
+]
+VECTORS = {"analyst": [1, 0, 0], "designer": [0, 1, 0], "engineer": [0, 0, 1]}
+
+
+def fake_encode(texts, **kwargs):
+    if isinstance(texts, str):
+        return np.asarray(VECTORS.get(texts, [0.8, 0, 0.6]), dtype=np.float32)
+    return np.asarray([VECTORS.get(t, [0.8, 0, 0.6]) for t in texts], dtype=np.float32)
+
+
+@pytest.fixture(autouse=True)
+def catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_provider, "encode", fake_encode)
+    monkeypatch.setattr(role_matching, "_catalog", RoleCatalog(ROLES, index_dir=str(tmp_path / "index")))
+    monkeypatch.setattr(role_matching, "_keyword_matcher", None)
+
+
+def test_top_roles_for_a_resume():
+    assert role_matching.ai_match_resume_to_roles("resume") == [
+        ("Data Analyst", 80.0), ("Engineer", 60.0), ("Designer", 0.0)]
+    assert role_matching.ai_match_resume_to_roles("resume", k=1) == [("Data Analyst", 80.0)]
+    assert role_matching.score_role(fake_encode("resume"), "Engineer") == pytest.approx(60.0)
+    assert role_matching.score_role(fake_encode("resume"), "Astronaut") is None
+
+
+def test_score_matrix_matches_per_role_scores():
+    embeddings = role_matching.encode_resumes(["analyst", "resume"])
+    matrix = role_matching.score_matrix(embeddings)
+    assert matrix.shape == (2, 3)
+    assert matrix[1] == pytest.approx([80.0, 0.0, 60.0])
+    assert role_matching.role_names() == ["Data Analyst", "Designer", "Engineer"]
+
+
+def test_keyword_helpers():
+    text = "Built Excel reports and Python tools"
+    assert role_matching.identify_missing_keywords(text, "Data Analyst") == ["SQL"]
+    assert role_matching.keyword_coverage(text)["Engineer"]["missing"] == ["unit testing"]
@@ -0,0 +1,74 @@
+import storage
+
+
+def _activity(username, n):
+    return {"username": username, "timestamp": f"2024-01-01 10:00:{n:02d}", "action": "login"}
+
+
+def _user(username, email):
+    return {"username": username, "password": "hash", "email": email, "role": "user",
+            "created_at": "2024-01-01 09:00:00"}
+
+
+def test_append_and_read_per_user(backend):
+    storage.append("user_activity", _activity("alice", 0))
+    storage.append_many("user_activity", [_activity("bob", 1), _activity("alice", 2)])
+
+    assert len(storage.all_rows("user_activity")) == 3
+    alice = storage.user_rows("user_activity", "alice")
+    assert list(alice.columns) == storage.columns("user_activity")
+    assert list(alice["timestamp"]) == ["2024-01-01 10:00:00", "2024-01-01 10:00:02"]
+    assert storage.user_rows("user_activity", "carol").empty
+
+
+def test_iter_user_rows_in_chunks(backend):
+    storage.append_many("user_activity", [_activity("alice", n) for n in range(5)])
+    sizes = [len(chunk) for chunk in storage.iter_user_rows("user_activity", "alice", chunk_size=2)]
+    assert sizes == [2, 2, 1]
+
+
+def test_insert_unique_and_upsert(backend):
+    assert storage.insert_unique("users", _user("alice", "a@example.com"))
+    assert not storage.insert_unique("users", _user("alice", "other@example.com"))
+    storage.upsert("users", _user("alice", "new@example.com"))
+    storage.upsert_many("users", [_user("bob", "b@example.com")])
+
+    assert storage.get_user("users", "alice")["email"] == "new@example.com"
+    assert len(storage.all_rows("users")) == 2
+    assert storage.get_user("users", "carol") is None
+
+
+def test_table_version_changes_on_every_write(backend):
+    versions = [storage.table_version("users")]
+    storage.insert_unique("users", _user("alice", "a@example.com"))
+    versions.append(storage.table_version("users"))
+    storage.upsert("users", _user("alice", "new@example.com"))
+    versions.append(storage.table_version("users"))
+    assert len(set(map(str, versions))) == 3
+
+
+def test_read_since_returns_only_new_rows(backend):
+    storage.append_many("user_activity", [_activity("alice", 0), _activity("bob", 1)])
+    rows, cursor = storage.read_since("user_activity")
+    assert list(rows["username"]) == ["alice", "bob"]
+
+    rows, cursor = storage.read_since("user_activity", cursor)
+    assert rows.empty
+    storage.append("user_activity", _activity("carol", 2))
+    rows, cursor = storage.read_since("user_activity", cursor)
+    assert list(rows["username"]) == ["carol"]
+
+
+def test_import_csvs_copies_every_table(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "_backend", storage.CsvBackend())
+    storage.append_many("user_activity", [_activity("alice", n) for n in range(3)])
+    storage.insert_unique("users", _user("alice", "a@example.com"))
+
+    db_path = str(tmp_path / "imported.db")
+    imported = storage.import_csvs(db_path)
+    assert imported["user_activity"] == 3 and imported["users"] == 1
+
+    sqlite = storage.SqliteBackend(db_path)
+    assert len(sqlite.user_rows("user_activity", "alice")) == 3
+    # Tables that already hold rows are left alone.
+    assert storage.import_csvs(db_path) == {}
@@ -0,0 +1,59 @@
+import fitz
+import pytest
+
+import text_extraction
+
+BODY = "Experienced data analyst skilled in SQL, Python and dashboards."
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    """Two-page PDF: page 1 has a text layer, page 2 only a few characters."""
+    path = str(tmp_path / "resume.pdf")
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), BODY)
+    doc.new_page().insert_text((72, 72), "Page 2")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def ocr_calls(monkeypatch):
+    calls = []
+
+    def fake_ocr(pdf_path, pages):
+        calls.append(list(pages))
+        return [{"page": n, "text": "scanned projects", "seconds": 0.5,
+                 "dpi": 300, "confidence": 90.0} for n in pages]
+
+    monkeypatch.setattr(text_extraction, "ocr_pdf", fake_ocr)
+    return calls
+
+
+def test_text_pages_skip_ocr(tmp_path, ocr_calls):
+    path = str(tmp_path / "text.pdf")
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), BODY)
+    doc.save(path)
+    doc.close()
+
+    pages = text_extraction.extract_pdf_pages(path)
+    assert ocr_calls == []
+    assert [p["method"] for p in pages] == ["text"]
+    assert BODY in pages[0]["text"]
+
+
+def test_short_pages_go_to_ocr(pdf, ocr_calls):
+    pages = text_extraction.extract_pdf_pages(pdf)
+    assert ocr_calls == [[2]]
+    assert [p["method"] for p in pages] == ["text", "ocr"]
+    assert pages[1]["text"] == "scanned projects"
+    assert pages[1]["dpi"] == 300
+
+
+def test_failed_ocr_pages_are_marked(pdf, monkeypatch):
+    monkeypatch.setattr(text_extraction, "ocr_pdf", lambda path, pages: [
+        {"page": n, "text": "", "seconds": 0.0, "error": "boom"} for n in pages])
+    pages = text_extraction.extract_pdf_pages(pdf)
+    assert (pages[1]["method"], pages[1]["error"]) == ("failed", "boom")
@@ -0,0 +1,80 @@
+import pytest
+
+import tracing
+
+
+@pytest.fixture(autouse=True)
+def enabled():
+    tracing.reset()
+    tracing.enable(True)
+    yield
+    tracing.enable(False)
+    tracing.reset()
+
+
+def _row(name):
+    return next(row for row in tracing.snapshot() if row["span"] == name)
+
+
+def test_disabled_tracing_records_nothing():
+    tracing.enable(False)
+    with tracing.span("off"):
+        pass
+    tracing.traced("off.call")(lambda: None)()
+    tracing.record("off.record", 1.0)
+    assert tracing.snapshot() == []
+
+
+def test_span_and_traced_record_calls():
+    @tracing.traced()
+    def work(x):
+        return x * 2
+
+    assert work(2) == 4
+    with pytest.raises(ValueError):
+        with tracing.span("block"):
+            raise ValueError("still timed")
+
+    assert _row(f"{__name__}.test_span_and_traced_record_calls.<locals>.work")["count"] == 1
+    assert _row("block")["count"] == 1
+
+
+def test_percentiles_are_within_one_bucket():
+    for ms in range(1, 101):
+        tracing.record("latency", ms / 1000)
+    row = _row("latency")
+    assert row["count"] == 100 and row["max"] == pytest.approx(0.1)
+    assert row["mean"] == pytest.approx(0.0505)
+    # Buckets are 2 ** (1/4) wide, about 19%.
+    for q, expected in [(50, 0.050), (95, 0.095), (99, 0.099)]:
+        assert expected / 1.2 <= row[f"p{q}"] <= expected * 1.2
+    assert row["p50"] <= row["p95"] <= row["p99"] <= row["max"]
+
+
+def test_merge_adds_histograms():
+    tracing.record("shared", 0.001)
+    other = tracing.Histogram()
+    other.add(0.002)
+    other.add(0.004)
+    tracing.merge({"shared": other, "remote": other})
+    assert _row("shared")["count"] == 3
+    assert _row("shared")["max"] == pytest.approx(0.004)
+    assert _row("remote")["count"] == 2
+    # merge copies: later changes to the source don't leak in.
+    other.add(1.0)
+    assert _row("remote")["count"] == 2
+
+
+def test_prometheus_export(tmp_path):
+    tracing.record('csv "read"', 0.003)
+    tracing.record('csv "read"', 200.0)
+    text = tracing.to_prometheus()
+    label = 'span="csv \\"read\\""'
+    assert f'{tracing.METRIC_NAME}_bucket{{{label},le="+Inf"}} 2' in text
+    assert f"{tracing.METRIC_NAME}_count{{{label}}} 2" in text
+    buckets = [int(line.rsplit(" ", 1)[1]) for line in text.splitlines() if "_bucket{" in line]
+    assert buckets == sorted(buckets) and buckets[-2] == 1
+
+    path = tracing.write_prometheus(str(tmp_path / "metrics" / "prepvault.prom"))
+    assert open(path, encoding="utf-8").read() == text
+    assert sorted(p.name for p in (tmp_path / "metrics").iterdir()) == ["prepvault.prom"]
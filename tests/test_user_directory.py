@@ -0,0 +1,85 @@
+import concurrent.futures
+import threading
+
+import pytest
+
+import auth
+import storage
+import user_directory
+
+
+@pytest.fixture(autouse=True)
+def cheap_hashes(monkeypatch):
+    monkeypatch.setattr(user_directory, "HASH_ITERATIONS", 1000)
+
+
+def test_hash_round_trip():
+    stored = user_directory.hash_password("secret")
+    assert user_directory.check_password("secret", stored)
+    assert not user_directory.check_password("wrong", stored)
+    assert not user_directory.needs_rehash(stored)
+
+
+def test_table_version_moves_when_newest_row_is_upserted(backend):
+    storage.append_many("users", [{"username": "a", "password": "x"}, {"username": "b", "password": "x"}])
+    before = storage.table_version("users")
+    storage.upsert("users", {"username": "b", "password": "y"})
+    assert storage.table_version("users") != before
+
+
+def test_plaintext_password_is_rehashed_once(backend, monkeypatch):
+    storage.append_many("users", [{"username": "a", "password": "pw-a"}, {"username": "b", "password": "pw-b"}])
+    directory = user_directory.UserDirectory()
+    monkeypatch.setattr(user_directory, "directory", directory)
+
+    assert user_directory.verify("b", "pw-b")
+    assert user_directory.is_hashed(directory.get("b")["password"])
+
+    upserts = []
+    monkeypatch.setattr(storage, "upsert", lambda table, row: upserts.append(row))
+    assert user_directory.verify("b", "pw-b")
+    assert upserts == []
+
+
+def test_unknown_user_and_wrong_password_fail(backend, monkeypatch):
+    monkeypatch.setattr(user_directory, "directory", user_directory.UserDirectory())
+    storage.append("users", {"username": "a", "password": user_directory.hash_password("secret")})
+    assert not user_directory.verify("a", "nope")
+    assert not user_directory.verify("nobody", "secret")
+
+
+def test_login_reports_timeout_as_failure(monkeypatch):
+    def slow(username, password):
+        raise concurrent.futures.TimeoutError()
+
+    monkeypatch.setattr(auth, "verify", slow)
+    ok, message = auth.login("a", "secret")
+    assert not ok
+    assert "try again" in message
+
+
+def test_signup_hashes_on_the_verify_pool(backend, monkeypatch):
+    monkeypatch.setattr(user_directory, "directory", user_directory.UserDirectory())
+    monkeypatch.setattr(auth, "directory", user_directory.directory)
+    threads = []
+    real_hash = user_directory.hash_password
+
+    def tracked(password):
+        threads.append(threading.current_thread().name)
+        return real_hash(password)
+
+    monkeypatch.setattr(user_directory, "hash_password", tracked)
+    assert auth.signup("carol", "secret")[0]
+    assert threads and threads[0].startswith("verify")
+    assert user_directory.verify("carol", "secret")
+
+
+def test_signup_reports_timeout_as_failure(backend, monkeypatch):
+    def slow(password):
+        raise concurrent.futures.TimeoutError()
+
+    monkeypatch.setattr(auth, "hash_on_pool", slow)
+    ok, message = auth.signup("carol", "secret")
+    assert not ok
+    assert "try again" in message
+    assert len(storage.all_rows("users")) == 0
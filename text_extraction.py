@@ -0,0 +1,74 @@
+import logging
+import os
+import time
+
+import tracing
+from ocr import ocr_pdf
+
+# --- Settings ---
+# A page whose text layer has fewer characters than this is treated as an image.
+MIN_PAGE_CHARS = int(os.environ.get("PREPVAULT_MIN_PAGE_CHARS", "20"))
+
+logger = logging.getLogger("prepvault.extraction")
+
+
+@tracing.traced("extract.pdf")
+def extract_pdf_pages(pdf_path, min_chars=MIN_PAGE_CHARS):
+    """Extract a PDF page by page, sending only image-only pages to OCR.
+
+    Returns one dict per page, in page order, with ``page`` (1-based),
+    ``method`` ("text", "ocr", "failed" or "skipped"), ``text`` and
+    ``seconds``; failed pages also carry the ``error``.
+    """
+    import fitz  # PyMuPDF
+
+    pages = []
+    with fitz.open(pdf_path) as doc:
+        for number, page in enumerate(doc, start=1):
+            start = time.perf_counter()
+            text = page.get_text("text")
+            pages.append({"page": number, "method": "text", "text": text,
+                          "seconds": time.perf_counter() - start})
+
+    needs_ocr = [p["page"] for p in pages if len(p["text"].strip()) < min_chars]
+    for number in needs_ocr:
+        pages[number - 1]["method"] = "skipped"  # until OCR returns it
+    if needs_ocr:
+        for result in ocr_pdf(pdf_path, pages=needs_ocr):
+            page = pages[result["page"] - 1]
+            if result.get("error"):
+                page["method"] = "failed"
+                page["error"] = result["error"]
+                continue
+            page["method"] = "ocr"
+            page["text"] = result["text"]
+            page["seconds"] += result["seconds"]
+            page["dpi"] = result["dpi"]
+            page["confidence"] = result["confidence"]
+
+    for p in pages:
+        logger.debug("%s page %d: %s in %.3fs", pdf_path, p["page"], p["method"], p["seconds"])
+    return pages
+
+
+def pages_to_text(pages):
+    return " ".join(p["text"].strip() for p in pages if p["text"].strip()).lower()
+
+
+def extract_text_from_pdf(pdf_path):
+    return pages_to_text(extract_pdf_pages(pdf_path))
+
+
+@tracing.traced("extract.docx")
+def extract_text_from_docx(docx_path):
+    from docx import Document
+
+    doc = Document(docx_path)
+    full_text = " ".join([para.text for para in doc.paragraphs])
+    return full_text.strip().lower()
+
+
+def extract_text(file_path):
+    if file_path.lower().endswith(".pdf"):
+        return extract_text_from_pdf(file_path)
+    return extract_text_from_docx(file_path)
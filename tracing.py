@@ -0,0 +1,249 @@
+"""Span timings for the hot paths, kept in in-memory histograms.
+
+    with tracing.span("csv.read"):
+        frame = pd.read_csv(path)
+
+    @tracing.traced("extract.pdf")
+    def extract_pdf_pages(pdf_path): ...
+
+Tracing is off unless PREPVAULT_TRACING=1 (or ``enable()`` is called). While
+it is off, ``span`` returns a shared no-op context manager and ``traced``
+wrappers call straight through after one flag check. Each span name gets a
+fixed set of log-spaced buckets, so memory per span is constant and
+percentiles are estimates within one bucket (about 19% wide).
+
+Histograms are per process. ``write_prometheus`` dumps them in the
+Prometheus text format, e.g. for node_exporter's textfile collector.
+"""
+import bisect
+import functools
+import itertools
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+
+# --- Settings ---
+ENABLED = os.environ.get("PREPVAULT_TRACING", "0") == "1"
+METRICS_FILE = os.environ.get("PREPVAULT_METRICS_FILE", os.path.join("data", "metrics.prom"))
+# Seconds between Prometheus file exports while the app runs; 0 exports only on demand.
+EXPORT_INTERVAL = float(os.environ.get("PREPVAULT_METRICS_INTERVAL", "0"))
+
+# Bucket upper bounds from 1 µs to about 134 s, four per doubling.
+BUCKET_BOUNDS = [1e-6 * 2 ** (i / 4) for i in range(109)]
+# Prometheus gets one bound per doubling to keep the file small.
+EXPORT_STEP = 4
+PERCENTILES = (50, 95, 99)
+METRIC_NAME = "prepvault_span_seconds"
+
+_NOOP = nullcontext()
+_histograms = {}
+_lock = threading.Lock()
+_exporter_thread = None
+_exporter_lock = threading.Lock()
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        # One slot per bound plus an overflow slot.
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def copy(self):
+        other = Histogram()
+        other.counts = list(self.counts)
+        other.count, other.total, other.min, other.max = self.count, self.total, self.min, self.max
+        return other
+
+    def percentile(self, q):
+        """Estimated ``q``th percentile in seconds, interpolated within its bucket."""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKET_BOUNDS[i - 1] if i else 0.0
+                upper = BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / n
+                return min(max(estimate, self.min), self.max)
+            seen += n
+        return self.max
+
+
+# --- Switch ---
+def is_enabled():
+    return ENABLED
+
+
+def enable(on=True):
+    """Turn tracing on or off for the whole process."""
+    global ENABLED
+    ENABLED = bool(on)
+
+
+# --- Recording ---
+def record(name, seconds):
+    if not ENABLED:
+        return
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.add(seconds)
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def span(name):
+    """Context manager timing its block under ``name`` (a no-op while disabled)."""
+    return _Span(name) if ENABLED else _NOOP
+
+
+def traced(name=None):
+    """Decorator timing each call; the span defaults to ``module.qualname``."""
+    def decorate(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(span_name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+# --- Reading ---
+def _copies():
+    with _lock:
+        return [(name, hist.copy()) for name, hist in sorted(_histograms.items())]
+
+
+def histograms():
+    """Copies of the histograms by span name, e.g. to ship to another process."""
+    return dict(_copies())
+
+
+def merge(others):
+    """Add histograms (as returned by ``histograms()``) into this process's."""
+    with _lock:
+        for name, other in others.items():
+            hist = _histograms.get(name)
+            if hist is None:
+                _histograms[name] = other.copy()
+                continue
+            hist.counts = [a + b for a, b in zip(hist.counts, other.counts)]
+            hist.count += other.count
+            hist.total += other.total
+            hist.min = min(hist.min, other.min)
+            hist.max = max(hist.max, other.max)
+
+
+def snapshot():
+    """One dict per span (sorted by name) with count, total, mean, p50/p95/p99 and max in seconds."""
+    rows = []
+    for name, hist in _copies():
+        row = {"span": name, "count": hist.count, "total": hist.total,
+               "mean": hist.total / hist.count, "max": hist.max}
+        for q in PERCENTILES:
+            row[f"p{q}"] = hist.percentile(q)
+        rows.append(row)
+    return rows
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+# --- Prometheus export ---
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def to_prometheus():
+    lines = [f"# HELP {METRIC_NAME} Time spent in traced PrepVault spans.",
+             f"# TYPE {METRIC_NAME} histogram"]
+    for name, hist in _copies():
+        label = f'span="{_escape(name)}"'
+        cumulative = list(itertools.accumulate(hist.counts))
+        for i in range(0, len(BUCKET_BOUNDS), EXPORT_STEP):
+            lines.append(f'{METRIC_NAME}_bucket{{{label},le="{BUCKET_BOUNDS[i]:.6g}"}} {cumulative[i]}')
+        lines.append(f'{METRIC_NAME}_bucket{{{label},le="+Inf"}} {hist.count}')
+        lines.append(f"{METRIC_NAME}_sum{{{label}}} {hist.total!r}")
+        lines.append(f"{METRIC_NAME}_count{{{label}}} {hist.count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path=None):
+    """Atomically write the histograms to ``path`` (default METRICS_FILE); returns the path."""
+    path = path or METRICS_FILE
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".prom")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(to_prometheus())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def _export_forever(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_prometheus()
+        except Exception:
+            logging.getLogger(__name__).exception("Metrics export failed")
+
+
+def start_exporter(interval=None):
+    """Write the Prometheus file every ``interval`` seconds on a background thread (idempotent)."""
+    global _exporter_thread
+    interval = interval or EXPORT_INTERVAL
+    if not ENABLED or interval <= 0:
+        return
+    with _exporter_lock:
+        if _exporter_thread is None:
+            _exporter_thread = threading.Thread(target=_export_forever, args=(interval,),
+                                                name="metrics-export", daemon=True)
+            _exporter_thread.start()
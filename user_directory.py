@@ -0,0 +1,144 @@
+"""Username index and salted password hashing for auth.
+
+Users are held in an in-memory ``username -> record`` dict that is reloaded
+only when the users table changes, so lookups and duplicate checks are O(1).
+Passwords are stored as PBKDF2-SHA256 hashes; verification runs on a small
+thread pool (hashlib releases the GIL) so a burst of logins can't monopolize
+the server.
+
+    python user_directory.py migrate    # hash any remaining plaintext passwords
+"""
+import argparse
+import base64
+import functools
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import storage
+
+# --- Settings ---
+HASH_ITERATIONS = int(os.environ.get("PREPVAULT_PASSWORD_ITERATIONS", "240000"))
+VERIFY_WORKERS = int(os.environ.get("PREPVAULT_VERIFY_WORKERS", "4"))
+HASH_PREFIX = "pbkdf2_sha256"
+
+_verify_pool = ThreadPoolExecutor(max_workers=VERIFY_WORKERS, thread_name_prefix="verify")
+
+
+# --- Hashing ---
+def hash_password(password, iterations=None, salt=None):
+    iterations = iterations or HASH_ITERATIONS
+    salt = salt or secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return "$".join([HASH_PREFIX, str(iterations),
+                     base64.b64encode(salt).decode("ascii"), base64.b64encode(digest).decode("ascii")])
+
+
+def is_hashed(stored):
+    return isinstance(stored, str) and stored.startswith(HASH_PREFIX + "$")
+
+
+def check_password(password, stored):
+    """True if ``password`` matches ``stored`` (a hash or a legacy plaintext value)."""
+    if stored is None:
+        return False
+    stored = str(stored)
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    _, iterations, salt, expected = stored.split("$")
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), base64.b64decode(salt), int(iterations))
+    return hmac.compare_digest(digest, base64.b64decode(expected))
+
+
+def needs_rehash(stored):
+    return not is_hashed(stored) or int(str(stored).split("$")[1]) != HASH_ITERATIONS
+
+
+# Compared against when the username is unknown, so both paths cost the same.
+# Built on first use: one full-cost hash would otherwise delay every import.
+@functools.lru_cache(maxsize=1)
+def _dummy_hash():
+    return hash_password(secrets.token_hex(8))
+
+
+# --- Index ---
+def _user_records():
+    df = storage.all_rows("users")
+    cols = list(df.columns)
+    values = zip(*(df[c].astype(object).where(df[c].notna(), "").tolist() for c in cols))
+    return [dict(zip(cols, row)) for row in values]
+
+
+class UserDirectory:
+    def __init__(self):
+        self._users = {}
+        self._version = object()
+        self._lock = threading.Lock()
+
+    def _index(self):
+        version = storage.table_version("users")
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._users = {str(r["username"]): r for r in _user_records()}
+                    self._version = version
+        return self._users
+
+    def get(self, username):
+        user = self._index().get(username)
+        return None if user is None else dict(user)
+
+    def exists(self, username):
+        return username in self._index()
+
+    def __len__(self):
+        return len(self._index())
+
+
+directory = UserDirectory()
+
+
+def _verify(username, password):
+    user = directory.get(username)
+    stored = user["password"] if user else _dummy_hash()
+    ok = check_password(password, stored) and user is not None
+    if ok and needs_rehash(stored):
+        # Upgrade legacy plaintext rows (or an old cost) on successful login.
+        storage.upsert("users", dict(user, password=hash_password(password)))
+    return ok
+
+
+def verify(username, password, timeout=30):
+    """Check credentials on the verification pool; True when they match."""
+    return _verify_pool.submit(_verify, username, password).result(timeout=timeout)
+
+
+def hash_on_pool(password, timeout=30):
+    """Hash a new password on the verification pool, like ``verify`` does for logins."""
+    return _verify_pool.submit(hash_password, password).result(timeout=timeout)
+
+
+# --- Migration ---
+def migrate_plaintext():
+    """Hash every plaintext password in one store write; returns the count."""
+    pending = [r for r in _user_records() if not is_hashed(r["password"])]
+    hashed = list(_verify_pool.map(lambda r: dict(r, password=hash_password(str(r["password"]))), pending))
+    storage.upsert_many("users", hashed)
+    return len(hashed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PrepVault user directory utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="Replace plaintext passwords with salted hashes")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        print(f"Hashed {migrate_plaintext()} plaintext password(s)")
+
+
+if __name__ == "__main__":
+    main()